@@ -17,6 +17,39 @@ club_alias = {
     "Celta": ["Celta Vigo", "Celta De Vigo"],
 }
 
+# URL-slugs pr. provider (navn -> slug)
+provider_slugs = {
+    "Olka Express": {
+        #English
+        "Bournemouth": "bournemouth",
+        "Aston Villa": "aston-villa",
+        "Leeds": "leeds-united",
+        "Brentford": "brentford",
+        "Burnley": "burnley",
+        "Brighton": "brighton",
+        "Chelsea": "chelsea-fc",
+        "Crystal Palace": "crystal-palace",
+        "Everton": "everton",
+        "Fulham": "fulham-fc",
+        "Liverpool FC": "liverpool-fc",
+        "Liverpool": "liverpool-fc",
+        "Manchester United": "manchester-united",
+        "Newcastle": "newcastle-united",
+        "Nottingham Forest": "nottingham-forest",
+        "Sunderland": "sunderland",
+        "West Ham": "west-ham",
+        "Wolverhampton": "wolves",
+        "Tottenham": "tottenham",
+        # Spanish
+        "FC Barcelona": "fc-barcelona",
+        "Atlético Madrid": "atltico-madrid",
+        "Real Madrid": "real-madrid",
+        # Other
+        "FC Kairat": "kairat-almaty",
+        "Qarabag FK": "qarabag",
+    },
+}
+
 suffix_pattern = re.compile(
         r"\b(?:fc|FC|Fc|as|bk|rcd|ac|bc|ss|us|ogc|losc|afc|krc|sc|rb|cf|ik)\b\.?",
         re.IGNORECASE,
@@ -0,0 +1,158 @@
+import os
+import time
+import threading
+from contextlib import contextmanager
+
+# --- KONFIGURATION ---
+# Fælles loft for antal levende browsere (Engine's Chromium + BrowserWorker-processer)
+# på tværs af alle moduler. Streamlit kører alle brugere i samme proces, så et
+# modul-niveau objekt deles automatisk mellem samtidige søgninger.
+MB_PER_BROWSER = 450      # Ca. RSS for én headless Chrome med en åben side
+RESERVE_MB = 768          # Hukommelse vi altid lader være til Streamlit/pandas
+BROWSERS_PER_CPU = 2
+MIN_BROWSERS = 1
+MAX_BROWSERS = 16
+REFRESH_SECONDS = 30      # Hvor ofte loftet genberegnes ud fra fri hukommelse
+
+
+def free_memory_mb():
+    """Returns available memory in MB (MemAvailable on Linux, sysconf fallback)."""
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) // 1024
+    except OSError:
+        pass
+    try:
+        pages = os.sysconf("SC_AVPHYS_PAGES")
+        page_size = os.sysconf("SC_PAGE_SIZE")
+        return (pages * page_size) // (1024 * 1024)
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def compute_cap(active=0):
+    """
+    Picks the browser cap from free memory and CPU count.
+    Browsers we already hold count towards the memory we could use,
+    so the cap does not shrink just because our own browsers are running.
+    BROWSER_BUDGET in the environment overrides the calculation.
+    """
+    override = os.environ.get("BROWSER_BUDGET")
+    if override:
+        try:
+            return max(MIN_BROWSERS, int(override))
+        except ValueError:
+            pass
+
+    by_cpu = (os.cpu_count() or 1) * BROWSERS_PER_CPU
+
+    free_mb = free_memory_mb()
+    if free_mb is None:
+        by_memory = by_cpu
+    else:
+        usable = free_mb + active * MB_PER_BROWSER - RESERVE_MB
+        by_memory = usable // MB_PER_BROWSER
+
+    return max(MIN_BROWSERS, min(MAX_BROWSERS, by_cpu, by_memory))
+
+
+class BrowserBudget:
+    """
+    Admission controller for browser instances.
+    acquire() blocks (queues) while the cap is reached instead of failing.
+    """
+
+    def __init__(self, cap=None):
+        self._cond = threading.Condition()
+        self._fixed_cap = cap
+        self._cap = cap if cap is not None else compute_cap()
+        self._cap_time = time.monotonic()
+        self.active = 0
+        self.queued = 0
+        self.peak = 0
+        self.total_admitted = 0
+        self.total_wait_seconds = 0.0
+
+    @property
+    def cap(self):
+        return self._cap
+
+    def _refresh_cap(self):
+        if self._fixed_cap is not None:
+            return
+        if time.monotonic() - self._cap_time >= REFRESH_SECONDS:
+            self._cap = compute_cap(self.active)
+            self._cap_time = time.monotonic()
+
+    def acquire(self, timeout=None):
+        """Waits for a free slot. Returns False if timeout runs out first."""
+        start = time.monotonic()
+        with self._cond:
+            self._refresh_cap()
+            self.queued += 1
+            try:
+                while self.active >= self._cap:
+                    remaining = None
+                    if timeout is not None:
+                        remaining = timeout - (time.monotonic() - start)
+                        if remaining <= 0:
+                            return False
+                    # Vågn op med jævne mellemrum så et hævet loft opdages
+                    self._cond.wait(min(remaining, REFRESH_SECONDS) if remaining else REFRESH_SECONDS)
+                    self._refresh_cap()
+            finally:
+                self.queued -= 1
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            self.total_admitted += 1
+            self.total_wait_seconds += time.monotonic() - start
+            return True
+
+    def release(self):
+        with self._cond:
+            if self.active > 0:
+                self.active -= 1
+            self._cond.notify()
+
+    @contextmanager
+    def slot(self):
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def stats(self):
+        with self._cond:
+            return {
+                "cap": self._cap,
+                "active": self.active,
+                "queued": self.queued,
+                "peak": self.peak,
+                "admitted": self.total_admitted,
+                "avg_wait_s": round(self.total_wait_seconds / self.total_admitted, 2) if self.total_admitted else 0.0,
+                "free_mb": free_memory_mb(),
+            }
+
+
+# --- FÆLLES INSTANS ---
+_budget = BrowserBudget()
+
+
+def acquire(timeout=None):
+    return _budget.acquire(timeout)
+
+
+def release():
+    _budget.release()
+
+
+def slot():
+    return _budget.slot()
+
+
+def stats():
+    return _budget.stats()
+
@@ -0,0 +1,235 @@
+import os
+import sys
+import signal
+import multiprocessing
+import time
+
+import BrowserBudget
+import Engine
+import Settings
+import Timing
+
+# --- PROCESISOLEREDE BROWSERE ---
+# Med SCRAPER_BROWSER_PROCESSES=1 kører hver browser i sin egen overvågede
+# subprocess i stedet for i en tråd i Streamlit-processen. Supervisoren
+# (en tråd i hovedprocessen) modtager snapshots over en pipe og:
+#   - dræber hele proces-træet (Playwright-driver + Chromium + renderers), hvis RSS
+#     overstiger WORKER_RSS_MB eller der ikke er sket noget i STALL_SECONDS
+#   - starter en ny worker med de sider der mangler
+#   - lader aldrig en worker tage mere end MAX_PAGES sider, så lækager i
+#     Chrome ikke når at hobe sig op
+# Lukkes en worker, forsvinder al dens hukommelse med den.
+
+WORKER_RSS_MB = Settings.WORKER_RSS_MB
+MAX_PAGES = Settings.WORKER_MAX_PAGES
+STALL_SECONDS = Settings.WORKER_STALL_SECONDS
+POLL_SECONDS = 1.0
+
+_ctx = None
+
+
+def _context():
+    global _ctx
+    if _ctx is None:
+        try:
+            _ctx = multiprocessing.get_context("forkserver")
+        except ValueError:
+            _ctx = multiprocessing.get_context("spawn")
+    return _ctx
+
+
+def enabled():
+    return Settings.BROWSER_PROCESSES
+
+
+# --- PROCES-TRÆ ---
+
+def _children_map():
+    """{ppid: [pid, ...]} from /proc (Linux). Empty elsewhere."""
+    children = {}
+    try:
+        pids = [int(p) for p in os.listdir("/proc") if p.isdigit()]
+    except OSError:
+        return children
+    for pid in pids:
+        try:
+            with open(f"/proc/{pid}/stat") as f:
+                # Feltet efter "(navn)" er state, derefter ppid
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+        children.setdefault(ppid, []).append(pid)
+    return children
+
+
+def process_tree(pid):
+    """pid and all its descendants."""
+    children = _children_map()
+    tree, stack = [], [pid]
+    while stack:
+        current = stack.pop()
+        tree.append(current)
+        stack.extend(children.get(current, []))
+    return tree
+
+
+def _rss_mb(pid):
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError):
+        pass
+    return 0.0
+
+
+def tree_rss_mb(pid):
+    """Resident memory of a worker including its Chromium children."""
+    return sum(_rss_mb(p) for p in process_tree(pid))
+
+
+def kill_tree(process):
+    """SIGKILLs the worker and every descendant, so no Chrome is left behind."""
+    pids = process_tree(process.pid)
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except (AttributeError, OSError):
+        pass
+    for pid in reversed(pids):
+        try:
+            os.kill(pid, signal.SIGKILL)
+        except OSError:
+            pass
+    process.join(timeout=5)
+
+
+# --- WORKER (kører i subprocess) ---
+
+def _worker_main(fetch_fn, items, conn):
+    # Egen procesgruppe, så supervisoren kan dræbe Chrome-børnene samlet
+    try:
+        os.setsid()
+    except (AttributeError, OSError):
+        pass
+
+    # Pipe.send er synkron, så intet går tabt hvis processen dør lige efter
+    def emit(snapshot):
+        conn.send(("snapshot", snapshot))
+
+    mark = Timing.mark()
+    try:
+        fetch_fn(items, emit)
+    except Exception as e:
+        conn.send(("error", str(e)))
+    finally:
+        # Spans fra subprocessen sendes med hjem
+        conn.send(("spans", Timing.spans(since=mark)))
+        conn.send(("done", None))
+        conn.close()
+
+
+# --- SUPERVISOR (kører i hovedprocessen) ---
+
+def _supervise(fetch_fn, items, emit, seen_urls):
+    """
+    Runs one worker process for `items`. Returns "done", "killed", "crashed" or "cancelled".
+    Every snapshot URL is added to seen_urls, so the caller knows what is left.
+    """
+    ctx = _context()
+    receiver, sender = ctx.Pipe(duplex=False)
+    process = ctx.Process(target=_worker_main, args=(fetch_fn, items, sender), daemon=True)
+
+    # Slottet holdes her i hovedprocessen; workerens eget budget er privat
+    BrowserBudget.acquire()
+    try:
+        process.start()
+        sender.close()   # Kun workeren skriver; så giver recv EOF når den dør
+        last_activity = time.monotonic()
+        while True:
+            kind, payload = None, None
+            try:
+                if receiver.poll(POLL_SECONDS):
+                    kind, payload = receiver.recv()
+            except (EOFError, OSError):
+                process.join(timeout=POLL_SECONDS)
+
+            if kind == "snapshot":
+                last_activity = time.monotonic()
+                seen_urls.add(payload["url"])
+                emit(payload)
+                continue
+            if kind == "spans":
+                Timing.merge(payload)
+                continue
+            if kind == "error":
+                print(f"BrowserWorker fejl: {payload}")
+                continue
+            if kind == "done":
+                process.join(timeout=10)
+                if process.is_alive():
+                    kill_tree(process)
+                return "done"
+
+            if Engine.cancelled():
+                # Provider-budgettet er brugt: resten af batchen hentes ikke
+                kill_tree(process)
+                return "cancelled"
+            if not process.is_alive():
+                print(f"BrowserWorker døde (exit {process.exitcode})")
+                kill_tree(process)
+                return "crashed"
+
+            rss = tree_rss_mb(process.pid)
+            if rss > WORKER_RSS_MB:
+                print(f"BrowserWorker bruger {rss:.0f} MB (> {WORKER_RSS_MB}) - genstarter")
+                kill_tree(process)
+                return "killed"
+            if time.monotonic() - last_activity > STALL_SECONDS:
+                print(f"BrowserWorker har ikke svaret i {STALL_SECONDS}s - genstarter")
+                kill_tree(process)
+                return "killed"
+    finally:
+        BrowserBudget.release()
+        receiver.close()
+
+
+def run_chunk(fetch_fn, chunk, emit, item_url=None):
+    """
+    Process-isolated replacement for fetch_fn(chunk, emit).
+
+    The chunk is split into batches of MAX_PAGES, each in a fresh worker. A
+    killed or crashed worker is replaced with the items it did not finish
+    (needs item_url); an item that brings down two workers in a row is skipped.
+    """
+    pending = list(chunk)
+    seen_urls = set()
+    failures_without_progress = 0
+    provider = getattr(sys.modules.get(fetch_fn.__module__), "PROVIDER_NAME", fetch_fn.__module__)
+
+    while pending and not Engine.cancelled():
+        batch, rest = pending[:MAX_PAGES], pending[MAX_PAGES:]
+        before = len(seen_urls)
+        start = time.perf_counter()
+        outcome = _supervise(fetch_fn, batch, emit, seen_urls)
+        Timing.record("browser_worker", time.perf_counter() - start, provider=provider,
+                      outcome=outcome, pages=len(seen_urls) - before)
+
+        if outcome == "cancelled":
+            break
+        if outcome == "done" or item_url is None:
+            if outcome != "done":
+                print(f"BrowserWorker: {len(batch)} sider kan ikke genoptages uden item_url")
+            pending = rest
+            continue
+
+        remaining = [item for item in batch if item_url(item) not in seen_urls]
+        if len(seen_urls) > before:
+            failures_without_progress = 0
+        else:
+            failures_without_progress += 1
+            if failures_without_progress >= 2 and remaining:
+                print(f"BrowserWorker springer over: {item_url(remaining[0])}")
+                remaining = remaining[1:]
+                failures_without_progress = 0
+        pending = remaining + rest
@@ -0,0 +1,189 @@
+import os
+import gzip
+import time
+import pickle
+import atexit
+import threading
+
+import Settings
+
+# --- CASSETTE ---
+# Optager alle HTTP-kald (Http.py) og browser-snapshots (page_source efter
+# interaktioner) i én komprimeret fil, så en senere kørsel kan afspilles uden
+# netværk og uden browser. Tilstanden styres med SCRAPER_CASSETTE (se Settings)
+# eller set_mode().
+
+_mode = Settings.CASSETTE_MODE
+_path = Settings.CASSETTE_PATH
+_lock = threading.Lock()
+_writer = None
+_entries = None
+
+
+class CassetteMiss(Exception):
+    """Raised in replay mode when a request was never recorded."""
+
+
+def set_mode(mode, path=None):
+    """Switches mode at runtime ('', 'record', 'replay', 'replay-timed')."""
+    global _mode, _path, _entries
+    close()
+    _mode = (mode or "").lower()
+    if path:
+        _path = path
+    _entries = None
+
+
+def mode():
+    return _mode
+
+
+def recording():
+    return _mode == "record"
+
+
+def replaying():
+    return _mode in ("replay", "replay-timed")
+
+
+def timed():
+    return _mode == "replay-timed"
+
+
+# --- FIL-HÅNDTERING ---
+
+def _write(entry):
+    global _writer
+    with _lock:
+        if _writer is None:
+            folder = os.path.dirname(_path)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            # Append giver en multi-member gzip, som gzip.open læser fint
+            _writer = gzip.open(_path, "ab")
+        pickle.dump(entry, _writer, protocol=pickle.HIGHEST_PROTOCOL)
+        _writer.flush()
+
+
+def close():
+    global _writer
+    with _lock:
+        if _writer is not None:
+            _writer.close()
+            _writer = None
+
+
+atexit.register(close)
+
+
+def _load():
+    """Reads the cassette once. Later recordings of the same key win."""
+    global _entries
+    with _lock:
+        if _entries is not None:
+            return _entries
+        entries = {}
+        if os.path.exists(_path):
+            with gzip.open(_path, "rb") as f:
+                while True:
+                    try:
+                        entry = pickle.load(f)
+                    except EOFError:
+                        break
+                    entries.setdefault((entry["kind"], entry["key"]), []).append(entry)
+        _entries = entries
+        return _entries
+
+
+def _lookup(kind, key):
+    found = _load().get((kind, key))
+    return found[-1] if found else None
+
+
+def _entries_of_kind(kind, key_prefix):
+    result = []
+    for (k, key), found in _load().items():
+        if k == kind and key.startswith(key_prefix):
+            result.append(found[-1])
+    return sorted(result, key=lambda e: e["recorded_at"])
+
+
+# --- HTTP ---
+# Http.py kalder replay_http/record_http; selve netværkskaldet ligger dér.
+
+class RecordedResponse:
+    """The parts of an HTTP response the providers use."""
+
+    def __init__(self, entry):
+        self.url = entry["url"]
+        self.status_code = entry["status_code"]
+        self.headers = entry["headers"]
+        self.content = entry["content"]
+        self.encoding = entry["encoding"]
+        self.elapsed = entry["elapsed"]
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            import httpx
+            raise httpx.HTTPStatusError(f"{self.status_code} (replayed) for url: {self.url}",
+                                        request=httpx.Request("GET", self.url), response=self)
+
+
+def replay_http(url):
+    entry = _lookup("http", url)
+    if entry is None:
+        raise CassetteMiss(f"Ikke optaget: GET {url}")
+    return RecordedResponse(entry)
+
+
+def record_http(url, response, elapsed):
+    _write({
+        "kind": "http",
+        "key": url,
+        # Den endelige URL efter redirects - Olka's slug-tjek kigger på den
+        "url": str(response.url),
+        "status_code": response.status_code,
+        "headers": dict(response.headers),
+        "content": response.content,
+        "encoding": response.encoding,
+        "elapsed": elapsed,
+        "recorded_at": time.time(),
+    })
+
+
+# --- BROWSER SNAPSHOTS ---
+
+def snapshot_key(recipe, url):
+    """Snapshots depend on the interactions too, so the recipe is part of the key."""
+    return f"{recipe} {url}"
+
+
+def record_snapshot(recipe, snapshot, elapsed):
+    _write({
+        "kind": "snapshot",
+        "key": snapshot_key(recipe, snapshot["url"]),
+        "snapshot": snapshot,
+        "elapsed": elapsed,
+        "recorded_at": time.time(),
+    })
+
+
+def find_snapshot(recipe, url):
+    """Returns (snapshot, elapsed) or (None, 0)."""
+    entry = _lookup("snapshot", snapshot_key(recipe, url))
+    if entry is None:
+        return None, 0.0
+    return entry["snapshot"], entry["elapsed"]
+
+
+def all_snapshots(recipe):
+    """Every recorded snapshot for a recipe, in recording order: [(snapshot, elapsed)]."""
+    return [(e["snapshot"], e["elapsed"]) for e in _entries_of_kind("snapshot", recipe + " ")]
@@ -0,0 +1,169 @@
+import os
+import json
+import heapq
+
+import numpy as np
+
+import Settings
+
+# --- COST MODEL ---
+# Forudsiger hvor lang tid hver provider tager ud fra antal valgte klubber og
+# kampe:  sekunder = base + per_club * klubber + per_fixture * kampe.
+# Koefficienterne fittes fra tidligere kørsler ("provider_run"-spans i
+# Settings.SPAN_LOG) og trækkes mod en prior, så få kørsler ikke giver vilde
+# tal. Prioren for per-side-omkostningen tages fra de gemte side-spans
+# (club_page/event_page/product_page), når de findes.
+
+RUN_SPAN = "provider_run"
+RIDGE = 2.0          # Hvor hårdt fittet trækkes mod prioren
+MIN_SECONDS = 1.0
+# Loggen holdes lille: kun de spans modellen bruger, og kun de nyeste pr.
+# provider, så hverken filen eller fit() vokser med antallet af søgninger
+HISTORY_RUNS = 50    # provider_run-spans pr. provider
+HISTORY_PAGES = 200  # Side-spans pr. provider og span-navn
+
+# Startgæt i sekunder, før der findes historik
+PRIORS = {
+    "Footballtravel.dk": {"base": 3.0, "per_club": 0.1, "per_fixture": 0.0},
+    "Olka Express": {"base": 4.0, "per_club": 0.0, "per_fixture": 0.3},
+    "Fantravel.dk": {"base": 10.0, "per_club": 2.0, "per_fixture": 1.0},
+    "Fodboldrejseguiden.dk": {"base": 10.0, "per_club": 6.0, "per_fixture": 0.0},
+}
+DEFAULT_PRIOR = {"base": 10.0, "per_club": 3.0, "per_fixture": 1.0}
+
+# Hvilke side-spans der svarer til en klub/kamp, og hvor mange der kører samtidig
+# (Olka læser de fleste event-sider over HTTP; browserens event_page er undtagelsen)
+PAGE_SPANS = {
+    "Fantravel.dk": {"per_club": ("club_page", 1), "per_fixture": ("product_page", 4)},
+    "Fodboldrejseguiden.dk": {"per_club": ("club_page", 8)},
+}
+
+FEATURES = ["base", "per_club", "per_fixture"]
+
+
+def load_history(path=None):
+    """Reads the span log. Broken lines are skipped."""
+    path = path or Settings.SPAN_LOG
+    spans = []
+    if not os.path.exists(path):
+        return spans
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                spans.append(json.loads(line))
+            except ValueError:
+                continue
+    return spans
+
+
+def _used_by_model(s):
+    names = {span_name for span_name, _ in PAGE_SPANS.get(s.get("provider"), {}).values()}
+    return s.get("name") == RUN_SPAN or s.get("name") in names
+
+
+def save_history(spans, path=None):
+    """
+    Adds a search's spans to the span log, keeping only what fit() reads and
+    only the newest HISTORY_RUNS runs / HISTORY_PAGES page spans per provider.
+    """
+    path = path or Settings.SPAN_LOG
+    limits, kept = {}, []
+    # Baglæns, så de nyeste beholdes; rækkefølgen vendes tilbage bagefter
+    for s in reversed([s for s in load_history(path) + list(spans) if _used_by_model(s)]):
+        key = (s.get("provider"), s.get("name"))
+        limits[key] = limits.get(key, 0) + 1
+        if limits[key] <= (HISTORY_RUNS if s.get("name") == RUN_SPAN else HISTORY_PAGES):
+            kept.append(s)
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        for s in reversed(kept):
+            f.write(json.dumps(s, default=str, ensure_ascii=False) + "\n")
+    os.replace(tmp, path)
+
+
+def _page_prior(provider, spans):
+    prior = dict(PRIORS.get(provider, DEFAULT_PRIOR))
+    for feature, (span_name, parallel) in PAGE_SPANS.get(provider, {}).items():
+        durations = [s["duration_s"] for s in spans
+                     if s.get("provider") == provider and s.get("name") == span_name and not s.get("error")]
+        if durations:
+            prior[feature] = float(np.median(durations)) / parallel
+    return prior
+
+
+class CostModel:
+    """Per-provider linear duration models."""
+
+    def __init__(self, coefficients=None, samples=None):
+        self.coefficients = coefficients or {}
+        self.samples = samples or {}
+
+    @classmethod
+    def fit(cls, spans=None):
+        if spans is None:
+            spans = load_history()
+        runs = {}
+        for s in spans:
+            if s.get("name") != RUN_SPAN or s.get("error") or not s.get("provider"):
+                continue
+            runs.setdefault(s["provider"], []).append(s)
+
+        coefficients, samples = {}, {}
+        for provider in set(PRIORS) | set(runs):
+            prior = _page_prior(provider, spans)
+            w0 = np.array([prior[f] for f in FEATURES])
+            rows = runs.get(provider, [])
+            if rows:
+                X = np.array([[1.0, float(r.get("clubs", 0)), float(r.get("fixtures", 0))] for r in rows])
+                y = np.array([float(r["duration_s"]) for r in rows])
+                # Ridge mod prioren:  (X'X + λI) w = X'y + λ w0
+                A = X.T @ X + RIDGE * np.eye(len(FEATURES))
+                w = np.linalg.solve(A, X.T @ y + RIDGE * w0)
+                w = np.clip(w, 0.0, None)
+            else:
+                w = w0
+            coefficients[provider] = dict(zip(FEATURES, (round(float(v), 3) for v in w)))
+            samples[provider] = len(rows)
+        return cls(coefficients, samples)
+
+    def predict(self, provider, clubs, fixtures):
+        c = self.coefficients.get(provider, DEFAULT_PRIOR)
+        seconds = c["base"] + c["per_club"] * clubs + c["per_fixture"] * fixtures
+        return max(seconds, MIN_SECONDS)
+
+
+# --- SCHEDULING ---
+
+def lpt_order(durations):
+    """Longest processing time first: names sorted by predicted duration, descending."""
+    return sorted(durations, key=lambda name: durations[name], reverse=True)
+
+
+def makespan(durations, workers):
+    """Finish time when the jobs are handed out LPT-style to `workers` parallel slots."""
+    if not durations:
+        return 0.0
+    slots = [0.0] * max(1, workers)
+    for name in lpt_order(durations):
+        heapq.heapreplace(slots, slots[0] + durations[name])
+    return max(slots)
+
+
+def remaining(predicted, started, finished, now, workers):
+    """
+    ETA in seconds for a run in progress. Running jobs are assumed to need at least
+    a little more time, even when they have passed their prediction.
+    """
+    slots = []
+    for name, start in started.items():
+        if name in finished:
+            continue
+        slots.append(max(predicted[name] - (now - start), MIN_SECONDS))
+    slots += [0.0] * max(0, workers - len(slots))
+    heapq.heapify(slots)
+    for name in lpt_order({n: d for n, d in predicted.items() if n not in started}):
+        heapq.heapreplace(slots, slots[0] + predicted[name])
+    return max(slots) if slots else 0.0
@@ -1,64 +1,59 @@
 import pandas as pd
 import numpy as np
 
-def process_football_prices_raw(input_file, output_file):
-    # Indlæs data
-    df = pd.read_csv(input_file)
-
-    # Reference firma
-    ref_agency = 'Football Travel'
-    ref_nights_col = 'Football Travel nætter'
-
-    # Find alle andre konkurrenter
+# Reference firma
+REF_AGENCY = 'Football Travel'
+NIGHTS_SUFFIX = ' nætter'
+
+def to_numeric(df):
+    """Prices and nights as numbers (as if read from CSV: 'N/A' and '' become NaN)."""
+    df = df.copy()
+    for col in df.columns:
+        if col != 'Match':
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+    return df
+
+def compare_prices(df, ref_agency=REF_AGENCY, output_file=None):
+    """
+    Keeps a competitor's price only where its nights equal the reference's nights.
+    Works on the EN_scraper pivot (Match, <provider>, <provider> nætter, ...).
+    """
+    df = to_numeric(df)
+    ref_nights_col = ref_agency + NIGHTS_SUFFIX
+
+    # Find alle andre konkurrenter (kun dem med en nætter-kolonne kan sammenlignes)
     competitors = [
-        col for col in df.columns 
-        if col != 'Match' 
-        and col != ref_agency 
+        col for col in df.columns
+        if col != 'Match'
+        and col != ref_agency
         and 'nætter' not in col
+        and col + NIGHTS_SUFFIX in df.columns
     ]
 
-    output_rows = []
+    ref_nights = df[ref_nights_col] if ref_nights_col in df.columns else pd.Series(np.nan, index=df.index)
+    comp_nights = df[[c + NIGHTS_SUFFIX for c in competitors]].to_numpy(dtype=float)
 
-    for index, row in df.iterrows():
-        match_name = row['Match']
-        ref_nights = row.get(ref_nights_col)
-        ref_price = row.get(ref_agency)
+    # LOGIK: Hvis antallet af nætter er ens, behold PRISEN. Ellers tom.
+    # Masken regnes for alle konkurrenter på én gang (NaN == NaN er False)
+    same_nights = comp_nights == ref_nights.to_numpy(dtype=float)[:, None]
+    prices = df[competitors].where(same_nights)
 
-        # Start rækken med Match og Football Travel prisen
-        new_row = {
-            'Match': match_name,
-            'Football Travel': ref_price
-        }
+    # Rækkefølge: Match -> Football Travel -> Konkurrenter
+    result_df = pd.concat([
+        df[['Match']],
+        df[ref_agency].rename(ref_agency) if ref_agency in df.columns else pd.Series(np.nan, index=df.index, name=ref_agency),
+        prices,
+    ], axis=1)
 
-        # Tjek hver konkurrent
-        for comp in competitors:
-            comp_nights_col = f"{comp} nætter"
-            
-            if comp_nights_col in df.columns:
-                comp_nights = row.get(comp_nights_col)
-                comp_price = row.get(comp)
+    if output_file:
+        result_df.to_csv(output_file, index=False)
+        print(f"Filen er gemt som: {output_file}")
+    return result_df
 
-                # LOGIK: Hvis antallet af nætter er ens, indsæt PRISEN. Ellers tom.
-                if pd.notna(ref_nights) and pd.notna(comp_nights) and ref_nights == comp_nights:
-                    new_row[comp] = comp_price
-                else:
-                    new_row[comp] = None
-        
-        output_rows.append(new_row)
-
-    # Lav DataFrame
-    result_df = pd.DataFrame(output_rows)
-
-    # Sørg for rækkefølgen: Match -> Football Travel -> Konkurrenter
-    cols = ['Match', 'Football Travel'] + competitors
-    # Filtrer kolonner, hvis nogle af konkurrenterne ikke kom med
-    cols = [c for c in cols if c in result_df.columns]
-    
-    result_df = result_df[cols]
-    
-    # Gem filen
-    result_df.to_csv(output_file, index=False)
-    print(f"Filen er gemt som: {output_file}")
+def process_football_prices_raw(input_file, output_file):
+    """File version: reads the scraper CSV and writes the comparison."""
+    return compare_prices(pd.read_csv(input_file), output_file=output_file)
 
-# Kør funktionen
-process_football_prices_raw('EN_priser.csv', 'prissammenligning.csv')
\ No newline at end of file
+if __name__ == "__main__":
+    # Kør funktionen
+    process_football_prices_raw('EN_priser.csv', 'prissammenligning.csv')
@@ -1,40 +1,41 @@
 import pandas as pd
+import numpy as np
+
+REF_AGENCY = 'Football Travel'
+
+def find_overpriced(df, ref_agency=REF_AGENCY, output_file=None):
+    """Rows where Football Travel has a price but is not the cheapest."""
+    # Vælg kun kolonner der indeholder tal (float eller int)
+    pris = df.select_dtypes(include=['number']).to_numpy(dtype=float)
+
+    # Laveste pris pr. række; fmin springer NaN over (og giver NaN for tomme rækker)
+    min_pris = np.fmin.reduce(pris, axis=1) if pris.shape[1] else np.full(len(df), np.nan)
+
+    ref = df[ref_agency].to_numpy(dtype=float)
+    har_pris = ~np.isnan(ref)
+    er_billigst = har_pris & (ref == min_pris)
+
+    # Vi beholder rækkerne, hvor Football Travel har en pris men IKKE er billigst
+    df_filtreret = df[har_pris & ~er_billigst].copy()
+
+    if output_file:
+        df_filtreret.to_csv(output_file, index=False)
+        print(f"Resultatet er gemt i '{output_file}'")
+    print(f"Færdig! {len(df) - len(df_filtreret)} rækker blev fjernet.")
+    return df_filtreret
 
 def filtrer_priser(input_fil, output_fil):
+    """File version: reads prissammenligning.csv and writes the overpriced rows."""
     # Indlæs CSV-filen
     try:
         df = pd.read_csv(input_fil)
     except FileNotFoundError:
         print(f"Fejl: Kunne ikke finde filen '{input_fil}'")
         return
-
-    # Vælg kun kolonner der indeholder tal (float eller int)
-    pris_df = df.select_dtypes(include=['number'])
-    
-    # Beregn min_pris ud fra disse
-    df['min_pris'] = pris_df.min(axis=1)
-
-    # Lav en betingelse: Er 'Football Travel' lig med den laveste pris?
-    # Vi tjekker også .notna() for at sikre, at vi ikke sammenligner tomme felter
-    er_billigst = (df['Football Travel'] == df['min_pris']) & (df['Football Travel'].notna())
-    # Vi beholder rækkerne, hvor Football Travel IKKE (~) er billigst
-    df_filtreret = df[~er_billigst].copy()
-
-    # Fjern rækker hvor 'Football Travel' er tom
-    er_tom = df['Football Travel'].isna()
-    df_filtreret = df_filtreret[~er_tom].copy()
-
-    # Fjern hjælpe-kolonnen 'min_pris' igen, så den ikke kommer med i den nye fil
-    df_filtreret = df_filtreret.drop(columns=['min_pris'])
-
-    # Gem resultatet til en ny CSV-fil
-    df_filtreret.to_csv(output_fil, index=False)
-    
-    print(f"Færdig! {len(df) - len(df_filtreret)} rækker blev fjernet.")
-    print(f"Resultatet er gemt i '{output_fil}'")
+    return find_overpriced(df, output_file=output_fil)
 
 input_navn = 'prissammenligning.csv'
 output_navn = 'FT_overpris.csv'
 
 if __name__ == "__main__":
-    filtrer_priser(input_navn, output_navn)
\ No newline at end of file
+    filtrer_priser(input_navn, output_navn)
@@ -1,283 +1,202 @@
 import os
 import sys
-import time
-import re
-import unicodedata
-from urllib.parse import urljoin
 import pandas as pd
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from bs4 import BeautifulSoup
-import concurrent.futures
-from datetime import datetime
-import streamlit as st
+import argparse
 
 # --- Setup ---
 current_dir = os.path.dirname(os.path.abspath(__file__))
-parent_dir = os.path.dirname(current_dir)
+parent_dir = os.path.dirname(os.path.dirname(current_dir))  # Repo-roden (DK_read/Data -> ..)
 sys.path.append(parent_dir)
-from Alias import club_alias, suffix_pattern 
-
-URL = "https://www.fodboldrejseguiden.dk/fodboldrejser-england/"
-# Hent klubber
-df_clubs = pd.read_excel(os.path.join(parent_dir, "club_names.xlsx"), sheet_name="EN", usecols="A", header=None)
-excel_clubs = df_clubs[0].dropna().astype(str).str.strip().tolist()
-
-# Konfiguration
-MAX_WORKERS = 5  # Antal samtidige browsere.
-
-def get_driver():
-    chrome_options = Options()
-    chrome_options.add_argument("--headless=new") 
-    chrome_options.add_argument("--window-size=1920,1080")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--disable-notifications")
-    chrome_options.add_argument("--log-level=3") # Minimerer konsol-støj fra Chrome
-    return webdriver.Chrome(options=chrome_options)
-
-def clean(text):
-    if not isinstance(text, str): return ""
-    text = unicodedata.normalize('NFKD', text).encode('ASCII', 'ignore').decode('utf-8')
-    text = suffix_pattern.sub("", text)
-    return text.lower().strip()
-
-def scroll_slowly(driver):
-    last_height = driver.execute_script("return document.body.scrollHeight")
-    while True:
-        current_scroll = driver.execute_script("return window.pageYOffset")
-        while current_scroll < last_height:
-            current_scroll += 350 
-            driver.execute_script(f"window.scrollTo(0, {current_scroll});")
-            time.sleep(0.2)
-        time.sleep(1.5)
-        new_height = driver.execute_script("return document.body.scrollHeight")
-        if new_height == last_height: break
-        last_height = new_height
+import Pipeline
+import Fodboldrejseguiden
+import TeamRegistry
+import EN_compare
+import EN_output
+
+# Klubsiderne hentes med Fodboldrejseguiden's motor (faner: Fodboldrejseguiden.TABS),
+# og fly + hotel vælges fra samme udtræk. Har appen lige hentet en klub, genbruges
+# siden fra PageCache i stedet for at blive åbnet og foldet ud igen.
+PACKAGE_TYPES = ("flight+hotel",)
+
+# Batch-kørsel: hver klubs tilbud skrives til OFFERS_FILE (append-only) så snart
+# klubben er færdig, og klubben noteres i CHECKPOINT_FILE. Et genstart springer
+# de noterede klubber over; pivoten bygges til sidst ud fra de gemte dele.
+RUN_DIR = os.path.join(current_dir, "EN_run")
+OFFERS_FILE = "offers.csv"
+CHECKPOINT_FILE = "completed_clubs.txt"
+OUTPUT_FILE = "EN_priser.csv"
+OFFER_COLUMNS = ["Club", "Date", "Match", "Provider", "Price", "Nights"]
+
+def load_clubs():
+    return TeamRegistry.club_names("EN")
 
 # ==========================================
-# WORKER FUNCTION (Kører i hver sin tråd)
+# UDVÆLGELSE AF PAKKER
 # ==========================================
-def scrape_specific_club(club_info):
-    excel_name, club_url = club_info
-    local_data = [] 
-    
-    driver = get_driver()
-    
-    try:
-        driver.get(club_url)
-        
-        # --- FIX 1: AGGRESSIV COOKIE HÅNDTERING ---
-        # Vi prøver i op til 5 sekunder at finde og fjerne banneret
-        for _ in range(5):
-            try:
-                cookie_btn = driver.find_element(By.ID, 'onetrust-accept-btn-handler')
-                driver.execute_script("arguments[0].click();", cookie_btn)
-                print(f"   🍪 {excel_name}: Cookie banner fjernet.")
-                time.sleep(1)
-                break
-            except:
-                time.sleep(1)
-        # ------------------------------------------
-
-        try:
-            WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.CLASS_NAME, "match")))
-            
-            scroll_slowly(driver)
-            
-            # Hop til toppen og vent lidt længere på at layoutet sætter sig
-            driver.execute_script("window.scrollTo(0, 0);")
-            time.sleep(2) 
-
-            matches = driver.find_elements(By.CLASS_NAME, "match")
-            
-            for i, match in enumerate(matches):
-                try:
-                    if match.get_attribute("data-is-away") == "true": continue
-
-                    match_date = match.get_attribute("data-date")
-                    
-                    # Sikker titel-udtrækning
-                    try:
-                        title_elem = match.find_element(By.CLASS_NAME, "toggle_title")
-                        match_title = title_elem.text.split("fra kr")[0].strip()
-                    except:
-                        match_title = f"Ukendt Kamp {i}"
-
-                    # --- FIX 2: JUSTERET SCROLL LOGIK ---
-                    # Scroll elementet til toppen (true) og ryk det så 250px ned
-                    driver.execute_script("arguments[0].scrollIntoView(true);", match)
-                    driver.execute_script("window.scrollBy(0, -250);") 
-                    time.sleep(0.3)
-                    
-                    toggle_btn = match.find_element(By.CSS_SELECTOR, ".togglemodule .koebsknap.toggle")
-                    
-                    # --- FIX 3: KLIK & VALIDERING ---
-                    # Klik på knappen
-                    driver.execute_script("arguments[0].click();", toggle_btn)
-                    time.sleep(1) # Vent på animation
-                    
-                    # Tjek om vi faktisk kan se tabellerne. Hvis ikke, prøv et "Rescue Click"
-                    package_groups = match.find_elements(By.CSS_SELECTOR, ".packageholder .table-outer")
-                    if not package_groups:
-                        # Prøv at klikke igen (nogle gange lukker den første gang pga. dobbelt-klik)
-                        driver.execute_script("arguments[0].click();", toggle_btn)
-                        time.sleep(1)
-                        package_groups = match.find_elements(By.CSS_SELECTOR, ".packageholder .table-outer")
-                    
-                    if not package_groups:
-                        print(f"      ⚠️ {match_title}: Kunne ikke åbne priser (ingen tabeller fundet).")
-                        continue
-
-                    # SCRAPE DATA
-                    for group in package_groups:
-                        try:
-                            # Tjek header tekst (ignorer case sensitivity)
-                            header_elem = group.find_element(By.CSS_SELECTOR, "span.pack")
-                            header = header_elem.get_attribute("innerText").strip().lower() # Mere robust end .text
-                            
-                            if "fly" not in header or "hotel" not in header: continue
-
-                            rows = group.find_elements(By.CSS_SELECTOR, "tbody tr")
-                            for row in rows:
-                                try:
-                                    provider = row.find_element(By.TAG_NAME, "td").text.strip()
-                                    btn = row.find_element(By.CLASS_NAME, "koebsknap")
-                                    link = btn.get_attribute("href")
-                                    price_clean = re.sub(r"[^\d]", "", btn.text)
-                                    
-                                    try:
-                                        nights_clean = re.search(r"(\d+)", row.find_element(By.CLASS_NAME, "nightsamount").text).group(1)
-                                    except: nights_clean = "N/A"
-
-                                    if link and "bestil-tilbud" not in link:
-                                        local_data.append({
-                                            "Club": excel_name,
-                                            "Date": match_date,
-                                            "Match": match_title,
-                                            "Provider": provider,
-                                            "Price": price_clean,
-                                            "Nights": nights_clean
-                                        })
-                                except: continue
-                        except: continue
-                except Exception as e_match:
-                    # HER SER DU FEJLEN NU:
-                    print(f"      ❌ FEJL ved kamp '{excel_name}' index {i}: {e_match}")
-                    continue
-            
-            print(f"✅ Færdig: {excel_name} ({len(local_data)} tilbud fundet)")
-            
-        except Exception as e:
-            print(f"⚠️ Generel fejl ved {excel_name}: {e}")
-
-    finally:
-        driver.quit()
-        
-    return local_data
+def fly_hotel_rows(record):
+    """Fly + hotel rows (OFFER_COLUMNS) from a Fodboldrejseguiden.parse_club_packages record."""
+    for title in record["unopened"]:
+        print(f"      ⚠️ {title}: Kunne ikke åbne priser (ingen tabeller fundet).")
+    return [{
+        "Club": record["club"],
+        "Date": p["date"],
+        "Match": p["match"],
+        "Provider": p["provider"],
+        "Price": str(int(p["price"])),
+        "Nights": str(p["nights"]) if p["nights"] is not None else "N/A",
+    } for p in record["packages"] if p["type"] in PACKAGE_TYPES]
+
+def iter_clubs(tasks):
+    """(excel_name, rows) per club page as it is parsed. Pages that did not load are left out."""
+    for record in Pipeline.iter_pipeline([tasks], Fodboldrejseguiden.fetch_clubs_in_tabs,
+                                         Fodboldrejseguiden.parse_club_packages, item_url=lambda t: t[1],
+                                         page_kind="price"):
+        if not record["loaded"]:
+            print(f"⚠️ Generel fejl ved {record['club']}: siden kunne ikke indlæses ({record['url']})")
+            continue
+        local_data = fly_hotel_rows(record)
+        print(f"✅ Færdig: {record['club']} ({len(local_data)} tilbud fundet)")
+        yield record["club"], local_data
 
 # ==========================================
-# MAIN EXECUTION
+# KLUB-LINKS
 # ==========================================
-if __name__ == "__main__":
-    print("🚀 Starter Multi-Threaded Scraper...")
-    
-    # 1. Hent alle links først (Dette gøres én gang, hurtigt)
-    setup_driver = get_driver()
-    website_data_lower = {}
-    try:
-        setup_driver.get(URL)
-        try:
-            WebDriverWait(setup_driver, 3).until(EC.element_to_be_clickable((By.ID, 'onetrust-accept-btn-handler'))).click()
-        except: pass
-        
-        soup = BeautifulSoup(setup_driver.page_source, 'html.parser')
-        section = soup.find(id="klubber")
-        if section:
-            for link in section.find_all('a'):
-                clean_name = clean(link.get_text(strip=True))
-                website_data_lower[clean_name] = urljoin(URL, link.get('href', ''))
-    finally:
-        setup_driver.quit()
-
-    # 2. Forbered opgaveliste (Hvilke URL'er skal besøges?)
+def fetch_club_links():
+    """
+    Club links from the overview page. It is static, so it is read over cached
+    HTTP by Fodboldrejseguiden (PageCache "index") instead of in a browser.
+    """
+    return Fodboldrejseguiden.fetch_website_urls()
+
+def build_tasks(website_data_lower, clubs):
+    """[(excel_name, url)] for the clubs we can find a link for."""
     tasks = []
-    print(f"🔍 Forbereder {len(excel_clubs)} klubber...")
-    
-    for excel_name in excel_clubs:
-        clean_excel_name = clean(excel_name)
-        found_url = website_data_lower.get(clean_excel_name)
-        
-        if not found_url and excel_name in club_alias:
-            for alias in club_alias[excel_name]:
-                if clean(alias) in website_data_lower:
-                    found_url = website_data_lower[clean(alias)]
-                    break 
-        
+    for excel_name in clubs:
+        found_url = TeamRegistry.find(website_data_lower, excel_name)
         if found_url:
             tasks.append((excel_name, found_url))
         else:
             print(f"⚠️ {excel_name}: Intet link fundet.")
+    return tasks
 
-    # 3. Start Multi-Threading
-    all_scraped_data = []
-    print(f"\n⚡ Starter {MAX_WORKERS} samtidige browsere for at behandle {len(tasks)} klubber...")
-    
-    with concurrent.futures.ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-        # Send alle opgaver afsted og vent på resultater
-        results = executor.map(scrape_specific_club, tasks)
-        
-        for res in results:
-            all_scraped_data.extend(res)
+# ==========================================
+# CHECKPOINT / APPEND-ONLY LAGER
+# ==========================================
+def read_checkpoint(run_dir):
+    path = os.path.join(run_dir, CHECKPOINT_FILE)
+    if not os.path.exists(path):
+        return set()
+    with open(path, encoding="utf-8") as f:
+        return {line.strip() for line in f if line.strip()}
+
+def store_club(run_dir, club, offers):
+    """Appends the club's offers, then marks the club as done. Only called from the main thread."""
+    offers_path = os.path.join(run_dir, OFFERS_FILE)
+    if offers:
+        df = pd.DataFrame(offers, columns=OFFER_COLUMNS)
+        write_header = not os.path.exists(offers_path)
+        with open(offers_path, "a", encoding="utf-8", newline="") as f:
+            df.to_csv(f, header=write_header, index=False)
+            f.flush()
+            os.fsync(f.fileno())
+    # Checkpoint skrives først når tilbuddene ligger sikkert på disken
+    with open(os.path.join(run_dir, CHECKPOINT_FILE), "a", encoding="utf-8") as f:
+        f.write(club + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+def load_stored_offers(run_dir):
+    path = os.path.join(run_dir, OFFERS_FILE)
+    if not os.path.exists(path):
+        return pd.DataFrame(columns=OFFER_COLUMNS)
+    return pd.read_csv(path, dtype=str)
 
-    # ==========================================
-    # DATABEHANDLING
-    # ==========================================
-    if all_scraped_data:
-        print(f"\n💾 Genererer endelig fil med {len(all_scraped_data)} rækker...")
-        df_raw = pd.DataFrame(all_scraped_data)
-        df_raw = df_raw.drop_duplicates(subset=['Match', 'Provider'])
-        df_raw['Date'] = pd.to_datetime(df_raw['Date'])
-        df_raw['Club'] = pd.Categorical(df_raw['Club'], categories=excel_clubs, ordered=True)
-        df_raw = df_raw.sort_values(by=['Club', 'Date'])
-        
-        sorted_matches = df_raw['Match'].unique()
-        df_pivot = df_raw.pivot(index='Match', columns='Provider', values=['Price', 'Nights'])
-        df_pivot = df_pivot.reindex(sorted_matches)
+# ==========================================
+# DATABEHANDLING
+# ==========================================
+def build_pivot(df_raw, club_order):
+    """One row per match, a price and a nights column per provider."""
+    # En klub der blev skrevet to gange (nedbrud før checkpoint) giver helt ens rækker
+    df_raw = df_raw.drop_duplicates(subset=OFFER_COLUMNS).copy()
+    # Pivoten har én celle pr. kamp og udbyder: den billigste pakke (med dens nætter)
+    df_raw['_price'] = pd.to_numeric(df_raw['Price'], errors='coerce')
+    df_raw = df_raw.sort_values('_price', kind='stable').drop_duplicates(subset=['Match', 'Provider'])
+    df_raw = df_raw.drop(columns='_price')
+    df_raw['Date'] = pd.to_datetime(df_raw['Date'])
+    df_raw['Club'] = pd.Categorical(df_raw['Club'], categories=club_order, ordered=True)
+    df_raw = df_raw.sort_values(by=['Club', 'Date'])
+    
+    sorted_matches = df_raw['Match'].unique()
+    df_pivot = df_raw.pivot(index='Match', columns='Provider', values=['Price', 'Nights'])
+    df_pivot = df_pivot.reindex(sorted_matches)
 
-        final_df = pd.DataFrame(index=df_pivot.index)
-        unique_providers = sorted(df_raw['Provider'].unique())
+    final_df = pd.DataFrame(index=df_pivot.index)
+    unique_providers = sorted(df_raw['Provider'].unique())
 
-        for provider in unique_providers:
-            if provider in df_pivot['Price']: final_df[provider] = df_pivot['Price'][provider]
-            else: final_df[provider] = ""
-            
-            col_name_nights = f"{provider} nætter"
-            if provider in df_pivot['Nights']: final_df[col_name_nights] = df_pivot['Nights'][provider]
-            else: final_df[col_name_nights] = ""
+    for provider in unique_providers:
+        if provider in df_pivot['Price']: final_df[provider] = df_pivot['Price'][provider]
+        else: final_df[provider] = ""
+        
+        col_name_nights = f"{provider} nætter"
+        if provider in df_pivot['Nights']: final_df[col_name_nights] = df_pivot['Nights'][provider]
+        else: final_df[col_name_nights] = ""
 
-        # ... (Koden der bygger final_df er herover) ...
+    # Match som kolonne - EN_compare læser den
+    return final_df.reset_index()
 
-        # ==========================================
-        # GEM FIL (DATA/DATO/FILNAVN)
-        # ==========================================
-        
-        if not final_df.empty:
-            # Konverter DataFrame til CSV-format i hukommelsen (uden at gemme på disken først)
-            csv_data = final_df.to_csv(index=False).encode('utf-8-sig')
+# ==========================================
+# MAIN EXECUTION
+# ==========================================
+def run_batch(run_dir=RUN_DIR, clubs=None, fresh=False, analyse=False):
+    os.makedirs(run_dir, exist_ok=True)
+    if fresh:
+        for name in (OFFERS_FILE, CHECKPOINT_FILE):
+            path = os.path.join(run_dir, name)
+            if os.path.exists(path): os.remove(path)
+
+    all_clubs = load_clubs()
+    clubs = clubs or all_clubs
+    completed = read_checkpoint(run_dir)
+    todo = [c for c in clubs if c not in completed]
+    print(f"🔍 {len(clubs)} klubber, {len(clubs) - len(todo)} allerede færdige (checkpoint), {len(todo)} tilbage.")
+
+    if todo:
+        # 1. Hent alle links først (Dette gøres én gang, hurtigt)
+        tasks = build_tasks(fetch_club_links(), todo)
+
+        # 2. Hver klub gemmes så snart den er parset. En klub hvis side ikke
+        #    kunne indlæses checkpointes ikke og prøves igen ved næste kørsel.
+        print(f"\n⚡ Åbner {Fodboldrejseguiden.TABS} faner ad gangen for at behandle {len(tasks)} klubber...")
+        for club, offers in iter_clubs(tasks):
+            store_club(run_dir, club, offers)
+            print(f"💾 {club}: {len(offers)} tilbud gemt")
+
+    # 3. Pivot ud fra de gemte dele
+    df_raw = load_stored_offers(run_dir)
+    df_raw = df_raw[df_raw['Club'].isin(clubs)]
+    if df_raw.empty:
+        print("❌ Ingen data fundet.")
+        return None
+
+    print(f"\n💾 Genererer endelig fil med {len(df_raw)} rækker...")
+    final_df = build_pivot(df_raw, all_clubs)
+    output_path = os.path.join(run_dir, OUTPUT_FILE)
+    final_df.to_csv(output_path, index=False, encoding='utf-8-sig')
+    print(f"✅ Gemt: {output_path}")
+
+    # 4. Sammenligning direkte på pivoten i hukommelsen (ingen CSV-rundtur)
+    if analyse:
+        comparison = EN_compare.compare_prices(final_df, output_file=os.path.join(run_dir, "prissammenligning.csv"))
+        EN_output.find_overpriced(comparison, output_file=os.path.join(run_dir, "FT_overpris.csv"))
+    return output_path
 
-            # Vis en knap i Streamlit, som brugeren kan klikke på
-            st.download_button(
-                label="📥 Download EN_priser.csv",
-                data=csv_data,
-                file_name="EN_priser.csv",
-                mime="text/csv"
-            )
-            
-            st.success("Data er klar til download!")
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrape fly+hotel prices for every club, resumable.")
+    parser.add_argument("--run-dir", default=RUN_DIR, help="Folder for offers, checkpoint and the final CSV")
+    parser.add_argument("--clubs", nargs="+", help="Only these clubs (default: all in club_names.xlsx)")
+    parser.add_argument("--fresh", action="store_true", help="Ignore the checkpoint and start over")
+    parser.add_argument("--analyse", action="store_true", help="Also write prissammenligning.csv and FT_overpris.csv")
+    args = parser.parse_args()
 
-        else:
-            st.error("❌ Ingen data fundet.")
\ No newline at end of file
+    print("🚀 Starter Multi-Threaded Scraper...")
+    run_batch(args.run_dir, args.clubs, args.fresh, args.analyse)
@@ -1,26 +1,16 @@
 import streamlit as st
-import pandas as pd
-import io
 import os
 import time
-import subprocess
-import sys
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
-# Tjekker for Playwright og installerer browser
-try:
-    from playwright.sync_api import sync_playwright
-except ImportError:
-    subprocess.check_call([sys.executable, "-m", "pip", "install", "playwright"])
-    from playwright.sync_api import sync_playwright
-
-# TVING installation af Chromium browseren (denne linje løser din fejl)
-# Playwright tjekker selv, om den allerede er der, så det tager ikke tid hver gang.
-subprocess.run([sys.executable, "-m", "playwright", "install", "chromium"])
+# Find/installer Chromium én gang; stien caches i Provision-manifestet,
+# så Playwright-install ikke kører ved hver opstart.
+import Provision
+Provision.provision()
 
-from datetime import datetime, timedelta
-# Tilføjet 'Alignment' til imports for at kunne rotere tekst
-from openpyxl.styles import Border, Side, PatternFill, Font, Alignment
-from openpyxl.utils import get_column_letter
+from datetime import datetime
 
 # --- IMPORTER VORES MODULER ---
 # Sørg for at filerne (Footballtravel.py, Olka.py, osv.) ligger i samme mappe
@@ -28,6 +18,20 @@ import Footballtravel
 import Olka 
 import Fantravel 
 import Fodboldrejseguiden  
+import BrowserBudget
+import PageCache
+import Matrix
+import Timing
+import Settings
+import CostModel
+import TeamRegistry
+import Engine
+
+# Provider-tråde skal kende Streamlit-konteksten (st.cache_resource m.m.)
+try:
+    from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+except ImportError:
+    add_script_run_ctx = get_script_run_ctx = None
 
 st.set_page_config(page_title="Football Scraper Pro", layout="wide")
 
@@ -43,17 +47,58 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 def get_club_names():
-    if not os.path.exists("club_names.xlsx"):
+    # Holdregistret læser kun xlsx'en igen når filen er ændret
+    if not os.path.exists(TeamRegistry.XLSX_PATH):
         st.error("❌ Mangler 'club_names.xlsx'")
         return []
     try:
-        return pd.read_excel("club_names.xlsx", sheet_name="EN", usecols="A", header=None)[0].dropna().astype(str).str.strip().tolist()
+        return TeamRegistry.club_names("EN")
     except: return []
 
+# Navn, modul og ikon pr. provider
+PROVIDER_JOBS = [
+    ("Footballtravel", Footballtravel, "🤓"),
+    ("Olka", Olka, "🌐"),
+    ("Fantravel", Fantravel, "🤡"),
+    ("Fodboldrejseguiden", Fodboldrejseguiden, "👽"),
+]
+
+def count_fixtures(selected):
+    """Number of fixtures for the selected clubs in the Footballtravel feed (input to the ETA model)."""
+    try:
+        with Timing.span("fixture_count", provider="CostModel"):
+            return len(Olka.links_from_feed(Olka.fetch_feed(), selected))
+    except Exception as e:
+        print(f"Kunne ikke tælle kampe: {e}")
+        return 0
+
+# Hvor ofte preview-matrixen tegnes om, mens tilbuddene strømmer ind
+REDRAW_SECONDS = 3
+
+def is_direct(module):
+    """Providers whose prices Fodboldrejseguiden also lists (and can stand in for)."""
+    return module.PROVIDER_NAME in Fodboldrejseguiden.AGGREGATED.values()
+
+def format_seconds(seconds):
+    mins, secs = divmod(int(round(seconds)), 60)
+    return f"{mins}m {secs}s" if mins else f"{secs}s"
+
 def main():
     st.title("⚽ Prissammenligning: Billet + Hotel")
     
     excel_clubs = get_club_names()
+
+    # Fælles browser-loft (til tuning af BROWSER_BUDGET)
+    budget = BrowserBudget.stats()
+    st.sidebar.caption(f"🖥️ Browsere: {budget['active']}/{budget['cap']} aktive, {budget['queued']} i kø")
+    with st.sidebar.expander("Browser-loft detaljer"):
+        st.json(budget)
+
+    # Disk-cache af sider og feeds (PageCache)
+    cache = PageCache.stats()
+    st.sidebar.caption(f"🗄️ Side-cache: {cache['hits']} hits, {cache['misses'] + cache['expired']} misses, {cache['mb']} MB")
+    with st.sidebar.expander("Side-cache detaljer"):
+        st.json(cache)
     if "selected_clubs" not in st.session_state: st.session_state.selected_clubs = set()
 
     # Vælg klubber
@@ -72,64 +117,120 @@ def main():
             
             # --- START TIMER ---
             start_time = time.time()
-            
-            # Vægtning af tid (til progress bar)
-            P_FT = 60
-            P_OLKA = 450
-            P_Fantravel = 130
-            P_FRG = 300
-            total_points = P_FT + P_OLKA + P_FRG + P_Fantravel
-            current_points = 0
-            
+            span_mark = Timing.mark()
+
+            # Direkte providere der springes over - deres priser tages fra Fodboldrejseguiden
+            skipped = [(name, module) for name, module, _ in PROVIDER_JOBS
+                       if Settings.FRG_FALLBACK and is_direct(module) and name.lower() in Settings.FALLBACK_ONLY]
+            budget = Settings.PROVIDER_BUDGET_SECONDS
+
+            # Forudsig varighed pr. provider ud fra tidligere kørsler
+            n_fixtures = count_fixtures(selected)
+            model = CostModel.CostModel.fit()
+            predicted = {name: model.predict(module.PROVIDER_NAME, len(selected), n_fixtures)
+                         for name, module, _ in PROVIDER_JOBS if (name, module) not in skipped}
+            workers = Settings.PROVIDER_WORKERS
+            eta_total = CostModel.makespan(predicted, workers)
+
             # Progress Bar
-            progress_bar = st.progress(0, text="Starter søgning...")
+            progress_bar = st.progress(0, text=f"Starter søgning... (forventet ca. {format_seconds(eta_total)})")
             status = st.status("Arbejder...", expanded=True)
-            
-            # --- 1. FootballTravel ---
-            status.write("🤓 Data fra Footballtravel")
-            time.sleep(1)  # Simpel pause for bedre UX
-            try:
-                df1 = Footballtravel.get_prices(selected)
-                if not df1.empty: df1['Provider'] = "Footballtravel.dk"
-                st.toast(f"Footballtravel: {len(df1)} tilbud fundet", icon="✅")
-            except Exception as e:
-                st.error(f"Fejl i Footballtravel: {e}")
-                df1 = pd.DataFrame()
-            current_points += P_FT
-            progress_bar.progress(current_points / total_points, text="Footballtravel færdig...")
-            
-            # --- 2. Olka ---
-            status.write("🌐 Data fra Olka")
-            try:
-                df2 = Olka.get_prices(selected)
-                st.toast(f"Olka: {len(df2)} tilbud fundet", icon="✅" if not df2.empty else "⚠️")
-            except Exception as e:
-                st.error(f"Fejl i OLKA: {e}")
-                df2 = pd.DataFrame()
-            current_points += P_OLKA
-            progress_bar.progress(current_points / total_points, text="Olka færdig...")
-
-            # --- 3. Fantravel ---
-            status.write("🤡 Data fra Fantravel")
-            try:
-                df3 = Fantravel.get_prices(selected)
-                st.toast(f"Fantravel: {len(df3)} tilbud fundet", icon="✅" if not df3.empty else "⚠️")
-            except Exception as e:
-                st.error(f"Fejl i Fantravel: {e}")
-                df3 = pd.DataFrame()
-            current_points += P_Fantravel
-            progress_bar.progress(current_points / total_points, text="Fantravel færdig...")
-
-            # --- 4. Fodboldrejseguiden ---
-            status.write("👽 Data fra resterende")
+
+            # Længste job startes først (LPT), så den samlede tid bliver kortest
+            jobs = {name: (module, icon) for name, module, icon in PROVIDER_JOBS if name in predicted}
+            started, finished = {}, {}
+            ctx = get_script_run_ctx() if get_script_run_ctx else None
+
+            # Tilbuddene strømmer ind fra provider-trådene og samles i én matrix
+            incoming = queue.Queue()
+            live = Matrix.LiveMatrix()
+            live.fallback_for.update(module.PROVIDER_NAME for _, module in skipped)
+            # Én afbrydelse pr. job: sættes når en direkte provider sprænger budgettet
+            cancels = {name: threading.Event() for name in jobs}
+            st.write("Preview af data:")
+            preview_slot = st.empty()
+            last_draw = 0.0
+
+            def run_job(name):
+                if ctx and add_script_run_ctx:
+                    add_script_run_ctx(threading.current_thread(), ctx)
+                started[name] = time.time()
+                module = jobs[name][0]
+                count = 0
+                # Pipeline og Engine stopper mellem sider når cancels[name] sættes
+                with Timing.span(CostModel.RUN_SPAN, provider=module.PROVIDER_NAME,
+                                 clubs=len(selected), fixtures=n_fixtures) as run_tags, \
+                        Engine.cancel_scope(cancels[name]):
+                    offers = module.iter_offers(selected)
+                    try:
+                        for offer in offers:
+                            if cancels[name].is_set():
+                                break
+                            incoming.put(offer)
+                            count += 1
+                    finally:
+                        offers.close()
+                    if cancels[name].is_set():
+                        # En afbrudt kørsel må ikke trække CostModel's fit ned
+                        run_tags["error"] = "OverBudget"
+                return count
+
+            # Ingen with-blok: en afbrudt provider skal ikke holde siden tilbage, mens
+            # dens tråd afslutter den side den er i gang med
+            pool = ThreadPoolExecutor(max_workers=workers)
             try:
-                df5 = Fodboldrejseguiden.get_prices(selected)
-                st.toast(f"Fodboldrejseguiden: {len(df5)} tilbud fundet", icon="✅")
-            except Exception as e:
-                st.error(f"Fejl ved resterende: {e}")
-                df5 = pd.DataFrame()
-            current_points += P_FRG
-            progress_bar.progress(1.0, text="Færdig!")
+                futures = {}
+                for name, _ in skipped:
+                    status.write(f"⏭️ {name} springes over (priser fra Fodboldrejseguiden)")
+                for name in CostModel.lpt_order(predicted):
+                    status.write(f"{jobs[name][1]} Data fra {name} (ca. {format_seconds(predicted[name])})")
+                    futures[pool.submit(run_job, name)] = name
+
+                pending = set(futures)
+                while pending:
+                    done, pending = wait(pending, timeout=1, return_when=FIRST_COMPLETED)
+                    now = time.time()
+                    while True:
+                        try:
+                            live.add(incoming.get_nowait())
+                        except queue.Empty:
+                            break
+                    for future in done:
+                        name = futures[future]
+                        finished[name] = now
+                        try:
+                            count = future.result()
+                            st.toast(f"{name}: {count} tilbud fundet", icon="✅" if count else "⚠️")
+                        except Exception as e:
+                            st.error(f"Fejl i {name}: {e}")
+                            live.fallback_for.add(jobs[name][0].PROVIDER_NAME)
+
+                    # For langsomme direkte providere afbrydes og fyldes ud med Fodboldrejseguiden's priser
+                    for future in list(pending):
+                        name = futures[future]
+                        module = jobs[name][0]
+                        if budget and is_direct(module) and name in started and now - started[name] > budget:
+                            cancels[name].set()
+                            pending.discard(future)
+                            finished[name] = now
+                            live.fallback_for.add(module.PROVIDER_NAME)
+                            st.toast(f"{name}: over budget ({format_seconds(budget)}) – bruger Fodboldrejseguiden", icon="⏱️")
+
+                    # Tegn matrixen om med jævne mellemrum, så de første priser ses med det samme
+                    if live.pending and pending and now - last_draw >= REDRAW_SECONDS:
+                        with Timing.span("live_preview", provider="Matrix"):
+                            preview = live.preview()
+                        if preview is not None:
+                            preview_slot.dataframe(preview, use_container_width=True)
+                        last_draw = now
+
+                    eta = CostModel.remaining(predicted, dict(started), finished, now, workers)
+                    elapsed_s = now - start_time
+                    fraction = min(elapsed_s / (elapsed_s + eta), 0.99) if pending else 1.0
+                    text = f"{len(finished)}/{len(jobs)} færdige – ca. {format_seconds(eta)} tilbage" if pending else "Færdig!"
+                    progress_bar.progress(fraction, text=text)
+            finally:
+                pool.shutdown(wait=False)
 
             # --- STOP TIMER ---
             end_time = time.time()
@@ -139,274 +240,47 @@ def main():
             st.success(f"✅ Søgning gennemført på {mins} minutter og {secs} sekunder.")
 
             # --- SAML DATA ---
-            frames = [df1, df2, df3, df5]
-            if all(df.empty for df in frames):
+            if live.count == 0:
                 st.warning("Ingen priser fundet.")
                 st.stop()
             
-            full_df = pd.concat(frames, ignore_index=True)
-
-            # Rensning
-            full_df['Provider'] = full_df['Provider'].fillna("Ukendt").astype(str)
-            full_df = full_df[full_df['Provider'].str.strip() != ""]
-            full_df['SortDate'] = pd.to_datetime(full_df['SortDate'], errors='coerce')
-            full_df = full_df.dropna(subset=['SortDate'])
-
-            # Filter: > 24 timer
-            cutoff = datetime.now() + timedelta(hours=24)
-            full_df = full_df[full_df['SortDate'] > cutoff]
+            with Timing.span("dataframe", provider="Matrix"):
+                full_df = Matrix.prepare_offers([live.frame()], fallback_for=live.fallback_for)
             if full_df.empty:
                 st.warning("Ingen relevante kampe fundet.")
                 st.stop()
 
-            # Sortering og ID-generering
-            full_df = full_df.sort_values(by=['Club', 'SortDate'])
-            full_df['club_change'] = full_df['Club'] != full_df['Club'].shift()
-            full_df['date_diff'] = full_df['SortDate'].diff().dt.days.abs()
-            full_df['big_gap'] = full_df['date_diff'] > 2 
-            full_df['Match_Group_ID'] = (full_df['club_change'] | full_df['big_gap']).cumsum()
-
-
             # --- FORBERED DATA TIL EXCEL (TRANSFORMERING) ---
-            
-            # 1. Find alle unikke udbydere og sorter dem
-            all_providers = sorted(full_df['Provider'].unique())
-            if "Footballtravel.dk" in all_providers:
-                all_providers.remove("Footballtravel.dk")
-                all_providers.insert(0, "Footballtravel.dk")
-
-            # 2. Gruppér data per kamp
-            matches_grouped = full_df.groupby('Match_Group_ID').agg({
-                'Club': 'first',
-                'Match': lambda x: max(x, key=len),
-                'SortDate': 'first'
-            }).reset_index()
-
-            match_data_list = []
-            
-            for _, match_row in matches_grouped.iterrows():
-                group_id = match_row['Match_Group_ID']
-                match_name = match_row['Match']
-                date_str = match_row['SortDate'].strftime('%d/%m')
-                display_name = f"{match_name} ({date_str})"
-                
-                prices_in_group = full_df[full_df['Match_Group_ID'] == group_id]
-                
-                provider_data = {}
-                
-                for _, p_row in prices_in_group.iterrows():
-                    prov = p_row['Provider']
-                    price_val = p_row['Price']
-                    nights_val = p_row['Nights']
-                    
-                    # LOGIK ÆNDRING 1:
-                    # Vi gemmer kun prisen, hvis vi ikke har set udbyderen før, 
-                    # ELLER hvis den nye pris er lavere end den vi allerede har.
-                    if prov not in provider_data or price_val < provider_data[prov]['price']:
-                        provider_data[prov] = {
-                            'price': price_val,
-                            'nights': nights_val
-                        }
-                
-                # LOGIK ÆNDRING 2:
-                # Vi beregner min/max baseret på de priser, der FAKTISK bliver vist
-                final_prices = [d['price'] for d in provider_data.values() if d['price'] > 0]
-                
-                min_price = min(final_prices) if final_prices else None
-                max_price = max(final_prices) if final_prices else None
-
-                match_data_list.append({
-                    'display': display_name,
-                    'data': provider_data,
-                    'min_price': min_price, 
-                    'max_price': max_price,
-                    'club': match_row['Club']
-                })
+            with Timing.span("grouping", provider="Matrix"):
+                all_providers, match_data_list = Matrix.group_matches(full_df)
 
             # --- 7. EXCEL GENERERING ---
-            output = io.BytesIO()
-            with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                writer.book.create_sheet('Prices')
-                ws = writer.book['Prices']
-                
-                #  FJERN GITTERLINJER ---
-                ws.sheet_view.showGridLines = False
-
-                # Definitioner af styles
-                header_font = Font(bold=True)
-                header_alignment = Alignment(textRotation=45, vertical='bottom', horizontal='center')
-                
-                #  Ramme-definitioner ---
-                thin_side = Side(style='thin')
-                medium_side = Side(style='medium') # Tykkere streg
-                
-                # Standard ramme (tynd hele vejen rundt)
-                thin_border = Border(left=thin_side, right=thin_side, top=thin_side, bottom=thin_side)
-                
-                # Ramme til start af ny klub (tyk venstre kant)
-                thick_left_border = Border(left=medium_side, right=thin_side, top=thin_side, bottom=thin_side)
-
-                green_fill = PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid")
-                red_fill = PatternFill(start_color="FFCCCC", end_color="FFCCCC", fill_type="solid")
-
-                # --- A. SKRIV HEADERS ---
-                col_idx = 2
-                prev_club = None # Til at huske forrige klub
-
-                for match in match_data_list:
-                    # Tjek om vi skal bruge tyk kant (hvis klubben skifter og det ikke er første kolonne)
-                    current_club = match['club']
-                    use_thick_border = (prev_club is not None) and (current_club != prev_club)
-                    current_border = thick_left_border if use_thick_border else thin_border
-                    
-                    # Opdater prev_club
-                    prev_club = current_club
-
-                    cell_match = ws.cell(row=1, column=col_idx, value=match['display'])
-                    cell_match.font = header_font
-                    cell_match.alignment = header_alignment
-                    cell_match.border = current_border # Brug den valgte ramme
-                    
-                    cell_nights = ws.cell(row=1, column=col_idx+1, value="Nætter")
-                    cell_nights.font = header_font
-                    cell_nights.alignment = header_alignment
-                    cell_nights.border = thin_border # Altid tynd her (det er inde i samme kamp)
-                    
-                    ws.column_dimensions[get_column_letter(col_idx)].width = 15
-                    ws.column_dimensions[get_column_letter(col_idx+1)].width = 8
-                    
-                    col_idx += 2
-
-                # --- B. SKRIV RÆKKER (VIRKSOMHEDER) ---
-                row_idx = 2
-                
-                for provider in all_providers:
-                    cell_prov = ws.cell(row=row_idx, column=1, value=provider)
-                    cell_prov.font = Font(bold=True)
-                    cell_prov.border = Border(top=medium_side, bottom=medium_side, left=medium_side, right=medium_side)
-                    
-                    col_idx = 2
-                    prev_club = None # Nulstil for hver række
-
-                    for match in match_data_list:
-                        # Samme logik for at finde ramme-typen
-                        current_club = match['club']
-                        use_thick_border = (prev_club is not None) and (current_club != prev_club)
-                        current_border = thick_left_border if use_thick_border else thin_border
-                        prev_club = current_club
-
-                        p_data = match['data'].get(provider, {'price': 0, 'nights': 0})
-                        price = p_data['price']
-                        nights = p_data['nights']
-                        
-                        # Skriv Pris
-                        cell_p = ws.cell(row=row_idx, column=col_idx, value=price if price > 0 else "")
-                        cell_p.border = current_border # Sæt rammen her på prisen (venstre celle i parret)
-                        
-                        if price > 0:
-                            if price == match['min_price']:
-                                cell_p.fill = green_fill
-                            elif price == match['max_price']:
-                                cell_p.fill = red_fill
-                        
-                        # Skriv Nætter
-                        cell_n = ws.cell(row=row_idx, column=col_idx+1, value=nights if nights > 0 else "")
-                        cell_n.border = thin_border # Altid tynd
-                        
-                        col_idx += 2
-                    
-                    row_idx += 1
-                
-                row_idx += 2
-
-                # Overskrift til sammenligningsafsnit
-                sect_header = ws.cell(row=row_idx, column=1, value="Sammenligning med Footballtravel.dk. Grøn = dyrere, Rød = billigere")
-                sect_header.font = Font(bold=True, size=11)
-                sect_header.border = Border(bottom=medium_side)
-                row_idx += 1
-
-                for provider in all_providers:
-                    cell_prov = ws.cell(row=row_idx, column=1, value=provider)
-                    cell_prov.font = Font(bold=True)
-                    cell_prov.border = Border(top=medium_side, bottom=medium_side, left=medium_side, right=medium_side)
-                    
-                    col_idx = 2
-                    prev_club = None
-
-                    for match in match_data_list:
-                        # Samme logik for at finde ramme-typen
-                        current_club = match['club']
-                        use_thick_border = (prev_club is not None) and (current_club != prev_club)
-                        current_border = thick_left_border if use_thick_border else thin_border
-                        prev_club = current_club
-
-                        p_data = match['data'].get(provider, {'price': 0, 'nights': 0})
-                        price = p_data['price']
-                        nights = p_data['nights']
-
-                        # Sikkerhed
-                        ft_data = match['data'].get("Footballtravel.dk", {'price': 0, 'nights': 0})
-                        ft_nights = ft_data['nights']
-                        ft_price = ft_data['price']
-
-                        # Beregn prisforskel mod Footballtravel.dk
-                        price_diff_val = ""
-                        if price > 0 and ft_price > 0:
-                            price_diff_val = price - ft_price                       
-
-                        # Forskel på nætter mod Footballtravel.dk
-                        nights_diff_val = ""
-                        if price > 0 and ft_nights > 0:
-                            nights_diff_val = nights - ft_nights
-                        
-                        # Skriv i excel
-                        # Pris
-                        cell_p_diff = ws.cell(row=row_idx, column=col_idx, value=price_diff_val)
-                        cell_p_diff.border = current_border
-
-                        # Farv cellen grøm
-                        if isinstance(price_diff_val, (int, float)):
-                            if price_diff_val > 0:
-                                cell_p_diff.fill = green_fill
-                            elif price_diff_val < 0:
-                                cell_p_diff.fill = red_fill
-                        
-                        # Nætter
-                        cell_n_diff = ws.cell(row=row_idx, column=col_idx+1, value=nights_diff_val)
-                        cell_n_diff.border = thin_border
-
-                        col_idx += 2
-                    
-                    row_idx += 1
-
-                ws.column_dimensions['A'].width = 25
-                ws.freeze_panes = "B2"
+            with Timing.span("excel", provider="Matrix"):
+                excel_bytes = Matrix.build_excel(match_data_list, all_providers)
+
+            # --- TIDSFORBRUG PR. FASE ---
+            try:
+                CostModel.save_history(Timing.spans(since=span_mark))
+            except OSError as e:
+                print(f"Kunne ikke gemme spans: {e}")
+            with st.expander("⏱️ Tidsforbrug pr. fase"):
+                st.dataframe(Timing.summary(since=span_mark), use_container_width=True, hide_index=True)
 
             # Download Knap og Preview (uændret)
             timestamp = datetime.now().strftime("%H-%M")
             st.download_button(
                 "📥 Download Excel", 
-                output.getvalue(), 
+                excel_bytes, 
                 f"prices_matrix_{timestamp}.xlsx", 
                 "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
             )
             
             # Vis preview i Streamlit (Vi laver en simpel dataframe til visning da Streamlit ikke viser rotationer)
-            preview_df = pd.DataFrame(index=all_providers)
-            for m in match_data_list:
-                col_name = m['display']
-                # Byg en kolonne med priser for preview
-                prices = []
-                for p in all_providers:
-                    val = m['data'].get(p, {}).get('price', 0)
-                    prices.append(val if val > 0 else 0)
-                preview_df[col_name] = prices
-
-            
-            
-            
-            st.write("Preview af data:")
-            st.dataframe(preview_df, use_container_width=True)
+            preview_df = Matrix.build_preview(match_data_list, all_providers)
+            preview_slot.dataframe(preview_df, use_container_width=True)
+            if live.fallback_for:
+                st.caption(f"{Matrix.FALLBACK_MARK.strip()} = priser for {', '.join(sorted(live.fallback_for))} "
+                           f"er fra {Fodboldrejseguiden.PROVIDER_NAME}, hvor den direkte søgning ikke leverede")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
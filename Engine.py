@@ -0,0 +1,357 @@
+import time
+import atexit
+import asyncio
+import threading
+import contextvars
+import concurrent.futures
+from contextlib import asynccontextmanager, contextmanager
+
+import BrowserBudget
+import Provision
+import Settings
+import Timing
+
+# --- BROWSER ENGINE ---
+# Én asyncio-baseret browser-motor (Playwright async) for alle providere.
+# En baggrundstråd kører event-loopet og én Chromium; hver søgning får sin egen
+# browser context (cookies, interception) og åbner faner i den. Alle faner på
+# tværs af providere deler loopet og loftet PAGES, så dusinvis af sider kan
+# køre samtidig uden en tråd og en Chrome-proces pr. stak links.
+#
+# Det lille API providerne bruger:
+#   Engine.fetch_pages(items, visit, emit, provider=..., pages=4)
+#       -> visit(page, item) er en coroutine der returnerer et snapshot
+#   Engine.wait_for / click_if_visible / scroll_to_bottom / content
+#       -> fælles ventetider og interaktioner inde i visit()
+#   Engine.run(coro)  -> kør en vilkårlig coroutine på motorens loop
+#   Engine.cancel_scope(event) -> fetch_pages stopper mellem sider når event sættes
+
+PAGES = Settings.ENGINE_PAGES
+NAV_TIMEOUT = 30.0             # Sekunder pr. navigation
+RECYCLE_PAGES = 200            # Chromium genstartes efter så mange sider (lækager)
+BLOCKED_RESOURCES = frozenset({"image", "media", "font"})
+VIEWPORT = {"width": 1920, "height": 1080}
+LAUNCH_ARGS = ["--no-sandbox", "--disable-dev-shm-usage", "--disable-gpu", "--disable-notifications"]
+
+_lock = threading.Lock()
+_loop = None
+
+# Kun rørt fra loop-tråden
+_playwright = None
+_browser = None
+_launch_lock = None
+_page_slots = None
+_open_contexts = 0
+_pages_served = 0
+_holds_slot = False
+
+# Afbrydelse (appens provider-budget): en threading.Event der følger konteksten,
+# så den når med ind på loopet via run() og ind i Pipeline's browser-tråde
+_cancel = contextvars.ContextVar("engine_cancel", default=None)
+
+
+@contextmanager
+def cancel_scope(event):
+    """Work started inside the block stops between pages once `event` is set."""
+    token = _cancel.set(event)
+    try:
+        yield event
+    finally:
+        _cancel.reset(token)
+
+
+def cancel_event():
+    return _cancel.get()
+
+
+def cancelled():
+    event = _cancel.get()
+    return event is not None and event.is_set()
+
+
+def _start_loop():
+    global _loop
+    with _lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="browser-loop", daemon=True).start()
+            _loop = loop
+    return _loop
+
+
+def run(coro):
+    """
+    Runs a coroutine on the engine loop and waits for the result.
+    The caller's Timing tags carry over, so spans nest under the provider run.
+    """
+    loop = _start_loop()
+    context = contextvars.copy_context()
+    result = concurrent.futures.Future()
+
+    def finish(task):
+        if task.cancelled():
+            result.cancel()
+        elif task.exception() is not None:
+            result.set_exception(task.exception())
+        else:
+            result.set_result(task.result())
+
+    def start():
+        loop.create_task(coro, context=context).add_done_callback(finish)
+
+    loop.call_soon_threadsafe(start)
+    return result.result()
+
+
+# --- BROWSER ---
+
+def _release_slot():
+    global _holds_slot
+    if _holds_slot:
+        _holds_slot = False
+        BrowserBudget.release()
+
+
+def _on_disconnect(browser):
+    # Chromium døde eller blev lukket: næste context starter en ny
+    global _browser
+    if browser is _browser:
+        _browser = None
+        _release_slot()
+
+
+async def _get_browser():
+    global _playwright, _browser, _launch_lock, _page_slots, _pages_served, _holds_slot
+    if _launch_lock is None:
+        _launch_lock = asyncio.Lock()
+        _page_slots = asyncio.Semaphore(PAGES)
+    async with _launch_lock:
+        if _browser is not None and _browser.is_connected():
+            return _browser
+
+        from playwright.async_api import async_playwright
+        # Motorens ene Chromium tæller som én browser i det fælles loft
+        with Timing.span("browser_queue", provider="Engine"):
+            await asyncio.to_thread(BrowserBudget.acquire)
+        _holds_slot = True
+        try:
+            with Timing.span("driver_start", provider="Engine"):
+                if _playwright is None:
+                    _playwright = await async_playwright().start()
+                browser = await _playwright.chromium.launch(
+                    headless=True, args=LAUNCH_ARGS, **Provision.playwright_launch_args()
+                )
+        except Exception:
+            _release_slot()
+            raise
+        browser.on("disconnected", _on_disconnect)
+        _browser = browser
+        _pages_served = 0
+        return _browser
+
+
+async def _close_browser():
+    global _browser
+    browser, _browser = _browser, None
+    if browser is not None:
+        try:
+            await browser.close()
+        except Exception:
+            pass
+    _release_slot()
+
+
+def _blocker(block):
+    async def handle(route):
+        if route.request.resource_type in block:
+            await route.abort()
+        else:
+            await route.continue_()
+    return handle
+
+
+@asynccontextmanager
+async def context(block=BLOCKED_RESOURCES, **options):
+    """
+    A fresh browser context (own cookies/storage) in the shared Chromium.
+    Requests for the resource types in `block` are intercepted and aborted.
+    """
+    global _open_contexts
+    # Tælles før første await, så en anden context der lukker imens ikke
+    # genbruger-lukker den browser vi er ved at åbne en context i
+    _open_contexts += 1
+    try:
+        browser = await _get_browser()
+        ctx = await browser.new_context(viewport=VIEWPORT, **options)
+        try:
+            ctx.set_default_navigation_timeout(NAV_TIMEOUT * 1000)
+            if block:
+                await ctx.route("**/*", _blocker(block))
+            yield ctx
+        finally:
+            try:
+                await ctx.close()
+            except Exception:
+                pass
+    finally:
+        _open_contexts -= 1
+        if _open_contexts == 0 and _pages_served >= RECYCLE_PAGES:
+            await _close_browser()
+
+
+# --- WAITS & INTERACTION ---
+
+async def wait_for(page, selector, timeout=5.0, state="attached"):
+    """Waits for a selector. Returns False instead of raising on timeout."""
+    try:
+        await page.wait_for_selector(selector, timeout=timeout * 1000, state=state)
+        return True
+    except Exception:
+        return False
+
+
+async def wait_until(page, js, timeout=5.0, poll=0.25):
+    """Waits until the JS expression is truthy. Returns False on timeout."""
+    try:
+        await page.wait_for_function(js, timeout=timeout * 1000, polling=poll * 1000)
+        return True
+    except Exception:
+        return False
+
+
+async def click_if_visible(locator, timeout=2.0, pause=0.0):
+    """Clicks the locator if it shows up within timeout (cookie banners, toggles)."""
+    try:
+        await locator.first.click(timeout=timeout * 1000)
+    except Exception:
+        return False
+    if pause:
+        await asyncio.sleep(pause)
+    return True
+
+
+async def scroll_to_bottom(page, step=500, pause=0.1, settle=1.0, retries=2):
+    """Scrolls down in steps until the page height stops growing (lazy loading)."""
+    last_height = await page.evaluate("document.body.scrollHeight")
+    tries = 0
+    while True:
+        current = await page.evaluate("window.pageYOffset")
+        while current < last_height:
+            current += step
+            await page.evaluate("y => window.scrollTo(0, y)", current)
+            await asyncio.sleep(pause)
+        await asyncio.sleep(settle)
+        new_height = await page.evaluate("document.body.scrollHeight")
+        if new_height != last_height:
+            last_height, tries = new_height, 0
+        elif tries < retries:
+            tries += 1
+        else:
+            break
+
+
+async def content(page):
+    """page.content(), or "" if the page is gone."""
+    try:
+        return await page.content()
+    except Exception:
+        return ""
+
+
+# --- FETCH ---
+
+async def _fetch_pages(items, visit, emit, provider, pages, block):
+    todo = asyncio.Queue()
+    for item in items:
+        todo.put_nowait(item)
+
+    async with context(block=block) as ctx:
+        async def tab():
+            global _pages_served
+            async with _page_slots:
+                page = None
+                try:
+                    while not todo.empty() and not cancelled():
+                        item = todo.get_nowait()
+                        if page is None or page.is_closed():
+                            page = await ctx.new_page()
+                        try:
+                            snapshot = await visit(page, item)
+                        except Exception as e:
+                            print(f"Engine fejl ({provider}): {e}")
+                            continue
+                        finally:
+                            _pages_served += 1
+                        if snapshot is not None:
+                            # emit kan blokere (Pipeline's backpressure) - ikke på loopet
+                            await asyncio.to_thread(emit, snapshot)
+                finally:
+                    if page is not None and not page.is_closed():
+                        await page.close()
+
+        await asyncio.gather(*(tab() for _ in range(max(1, min(pages, len(items))))))
+
+
+def fetch_pages(items, visit, emit, provider=None, pages=4, block=BLOCKED_RESOURCES):
+    """
+    Runs visit(page, item) for every item with up to `pages` tabs in one
+    browser context and emits the snapshots it returns. Meant to be called
+    from a Pipeline fetch_fn(chunk, emit).
+    """
+    items = list(items)
+    if not items:
+        return
+    start = time.perf_counter()
+    try:
+        run(_fetch_pages(items, visit, emit, provider, pages, block))
+    finally:
+        Timing.record("engine_fetch", time.perf_counter() - start, provider=provider,
+                      pages=len(items), tabs=min(pages, len(items)))
+
+
+def fetch_page(item, visit, provider=None, block=BLOCKED_RESOURCES):
+    """visit(page, item) for a single item in its own context. Returns what visit returns."""
+    async def one():
+        global _pages_served
+        async with context(block=block) as ctx:
+            async with _page_slots:
+                page = await ctx.new_page()
+                try:
+                    return await visit(page, item)
+                finally:
+                    _pages_served += 1
+                    await page.close()
+
+    return run(one())
+
+
+def fetch_html(url, provider=None, wait_selector=None, timeout=5.0, block=BLOCKED_RESOURCES):
+    """One rendered page as HTML (e.g. overview pages behind JavaScript)."""
+    async def visit(page, url):
+        await page.goto(url, wait_until="domcontentloaded")
+        if wait_selector:
+            await wait_for(page, wait_selector, timeout)
+        return await content(page)
+
+    with Timing.span("navigation", provider=provider, url=url):
+        return fetch_page(url, visit, provider=provider, block=block)
+
+
+def close():
+    if _loop is None:
+        return
+
+    async def shutdown():
+        global _playwright
+        await _close_browser()
+        if _playwright is not None:
+            await _playwright.stop()
+            _playwright = None
+
+    try:
+        asyncio.run_coroutine_threadsafe(shutdown(), _loop).result(timeout=10)
+    except Exception:
+        pass
+
+
+atexit.register(close)
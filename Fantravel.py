@@ -1,21 +1,20 @@
-import time
 import re
-import requests
+import asyncio
 import pandas as pd
-import concurrent.futures # Nødvendig til threading
 from datetime import datetime
-from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+import Engine
+import Settings
+import Http
+import Timing
+import Pipeline
+import HtmlParser
+import Offers
 
 # --- CONFIGURATION ---
-URL = "https://fantravel.dk/"
+URL = Settings.FANTRAVEL_BASE_URL
 PROVIDER_NAME = "Fantravel.dk"
 CURRENT_YEAR = 2026
-MAX_WORKERS = 4
+TABS = 4   # Produktsider der loader samtidig
 
 # --- ALIAS IMPORT ---
 try:
@@ -25,18 +24,6 @@ except ImportError:
 
 # --- HELPER FUNCTIONS ---
 
-def get_driver():
-    """Starts Chrome driver."""
-    chrome_options = Options()
-    chrome_options.add_argument("--headless=new")
-    chrome_options.add_argument("--window-size=1920,1080")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-notifications")
-    # For at spare ressourcer i tråde:
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--disable-extensions")
-    return webdriver.Chrome(options=chrome_options)
-
 def clean_price(price_str):
     if isinstance(price_str, (int, float)): return float(price_str)
     try:
@@ -91,100 +78,118 @@ def check_club_match(row_text, selected_clubs):
                     return club 
     return None
 
-def handle_cookies(driver):
-    try:
-        xpath = "//*[contains(translate(text(), 'KUN NØDVENDIGE', 'kun nødvendige'), 'kun nødvendige') or contains(text(), 'Afvis')]"
-        btn = WebDriverWait(driver, 3).until(EC.element_to_be_clickable((By.XPATH, xpath)))
-        btn.click()
-        time.sleep(1)
-    except: pass
-
-# --- WORKER FUNCTION ---
-
-def process_match_batch(match_data_list):
+COOKIE_XPATH = "//*[contains(translate(text(), 'KUN NØDVENDIGE', 'kun nødvendige'), 'kun nødvendige') or contains(text(), 'Afvis')]"
+HOME_ONLY_XPATH = "//a[contains(@class, 'drag_scroll_item') and contains(@href, 'vis-kun-hjemmekampe')]"
+
+async def handle_cookies(page):
+    await Engine.click_if_visible(page.locator(f"xpath={COOKIE_XPATH}"), timeout=3, pause=1)
+
+# --- PARSER (kører i Pipeline's proces-pulje) ---
+
+def parse_product_page(snapshot):
+    """Extracts the ticket + hotel offer from a product page snapshot."""
+    soup = HtmlParser.make_soup(snapshot["html"])
+    club_name = snapshot["meta"]["club"]
+
+    # A. Match Name
+    title = HtmlParser.select_text(soup, ".booking-title")
+    if title:
+        match_name = title.replace("Book din fodboldrejse til", "").strip()
+    else:
+        match_name = f"{club_name} Match"
+
+    # B. Price (Ticket + Hotel)
+    price_text = HtmlParser.select_text(soup, ".package-option.package-hotel .woocommerce-Price-amount bdi")
+    if not price_text:
+        return [] # Skip hvis ingen pris
+    price = clean_price(price_text)
+
+    # C. Dates & Nights
+    sort_date = pd.NaT
+    nights = 0
+    for li in soup.select("div.package-hotel li"):
+        date_text = HtmlParser.text(li)
+        if "Hotelophold fra" not in date_text: continue
+
+        nights = calculate_nights(date_text, CURRENT_YEAR)
+        match_start_date = re.search(r"fra\s+(.*?)\s+til", date_text)
+        if match_start_date:
+            sort_date = parse_danish_date(match_start_date.group(1), CURRENT_YEAR)
+        break
+
+    if pd.isna(sort_date):
+        sort_date = datetime(2100, 1, 1)
+
+    found = Offers.offer(club_name, match_name, sort_date, price, nights if isinstance(nights, int) else 0, PROVIDER_NAME,
+                         link=snapshot["url"])
+    return [found] if found else []
+
+def fragment_product_page(html):
+    """Title and hotel package of a product page (Pipeline skips the page if they are unchanged)."""
+    soup = HtmlParser.make_soup(html)
+    return "\n".join(HtmlParser.text(el) for el in soup.select(".booking-title, div.package-hotel"))
+
+def parse_club_links(snapshot):
+    """Match links on a club page snapshot -> [{'club', 'url'}]."""
+    soup = HtmlParser.make_soup(snapshot["html"])
+    club_name = snapshot["meta"]["club"]
+    return [
+        {"club": club_name, "url": l.get("href")}
+        for l in soup.find_all("a", class_="product_table_single") if l.get("href")
+    ]
+
+# --- BROWSER WORKERS ---
+
+async def visit_club_page(page, item):
+    """Opens a club page, filters to home matches and returns the snapshot."""
+    club_name, club_url = item
+    with Timing.span("club_page", provider=PROVIDER_NAME, club=club_name, url=club_url):
+        with Timing.span("navigation"):
+            await page.goto(club_url, wait_until="domcontentloaded")
+            await asyncio.sleep(1)
+        with Timing.span("cookies"):
+            await handle_cookies(page)
+
+        # Click "Vis kun hjemmekampe"
+        with Timing.span("toggle"):
+            await page.evaluate("window.scrollBy(0, 200)")
+            await asyncio.sleep(0.5)
+            if await Engine.click_if_visible(page.locator(f"xpath={HOME_ONLY_XPATH}"), timeout=4):
+                await asyncio.sleep(2)
+
+        return Pipeline.make_snapshot(club_url, await Engine.content(page), club=club_name)
+
+def fetch_club_pages(club_items, emit):
+    """Club pages one at a time in a single tab (cookies are handled on the first)."""
+    Engine.fetch_pages(club_items, visit_club_page, emit, provider=PROVIDER_NAME, pages=1)
+
+
+def fetch_product_pages(match_data_list, emit):
     """
-    Denne funktion køres af hver tråd.
-    Den får en liste af kampe, åbner én browser, og behandler dem.
+    Åbner produktsiderne i TABS faner i én browser context og sender HTML
+    videre - parsing sker i Pipeline.
     """
-    if not match_data_list:
-        return []
+    # Cookies håndteres kun på den første side; samtykket gælder hele context'en
+    cookies = {"done": False}
 
-    batch_results = []
-    driver = get_driver()
-    
-    try:
-        # Håndter cookies én gang per tråd hvis muligt, ellers per side
-        first_run = True
+    async def visit(page, item):
+        url = item['url']
+        with Timing.span("product_page", provider=PROVIDER_NAME, club=item['club'], url=url):
+            with Timing.span("navigation"):
+                await page.goto(url, wait_until="domcontentloaded")
+            if not cookies["done"]:
+                cookies["done"] = True
+                with Timing.span("cookies"):
+                    await handle_cookies(page)
 
-        for item in match_data_list:
-            url = item['url']
-            club_name = item['club']
-            
-            try:
-                driver.get(url)
-                if first_run:
-                    handle_cookies(driver)
-                    first_run = False
-                
-                # Vent lidt på load - mere robust end fast sleep
-                try:
-                    WebDriverWait(driver, 5).until(
-                        EC.presence_of_element_located((By.CLASS_NAME, "booking-title"))
-                    )
-                except:
-                    time.sleep(1) # Fallback
-
-                # A. Match Name
-                try:
-                    title_elem = driver.find_element(By.CLASS_NAME, "booking-title")
-                    raw_title = title_elem.text
-                    match_name = raw_title.replace("Book din fodboldrejse til", "").strip()
-                except:
-                    match_name = f"{club_name} Match"
-
-                # B. Price (Ticket + Hotel)
-                price = 0.0
-                try:
-                    price_elem = driver.find_element(By.CSS_SELECTOR, ".package-option.package-hotel .woocommerce-Price-amount bdi")
-                    price = clean_price(price_elem.text)
-                except:
-                    continue # Skip hvis ingen pris
-
-                # C. Dates & Nights
-                sort_date = pd.NaT
-                nights = 0
-                try:
-                    xpath_date = "//div[contains(@class, 'package-hotel')]//li[contains(text(), 'Hotelophold fra')]"
-                    date_elem = driver.find_element(By.XPATH, xpath_date)
-                    date_text = date_elem.text
-                    
-                    nights = calculate_nights(date_text, CURRENT_YEAR)
-                    
-                    match_start_date = re.search(r"fra\s+(.*?)\s+til", date_text)
-                    if match_start_date:
-                        sort_date = parse_danish_date(match_start_date.group(1), CURRENT_YEAR)
-                except:
-                    pass
-                
-                if pd.isna(sort_date):
-                    sort_date = datetime(2100, 1, 1)
-
-                batch_results.append({
-                    "Club": club_name,
-                    "Match": match_name,
-                    "SortDate": sort_date,
-                    "Price": price,
-                    "Provider": PROVIDER_NAME,
-                    "Nights": int(nights) if isinstance(nights, int) else 0
-                })
-            except Exception as e:
-                # print(f"Fejl på link {url}: {e}") # Debugging
-                continue
-
-    finally:
-        driver.quit()
-        
-    return batch_results
+            # Vent lidt på load - mere robust end fast sleep
+            with Timing.span("selector_wait"):
+                if not await Engine.wait_for(page, ".booking-title", timeout=5):
+                    await asyncio.sleep(1) # Fallback
+
+            return Pipeline.make_snapshot(url, await Engine.content(page), club=item['club'])
+
+    Engine.fetch_pages(match_data_list, visit, emit, provider=PROVIDER_NAME, pages=TABS)
 
 # --- MAIN EXPORT FUNCTION ---
 
@@ -192,15 +197,22 @@ def get_prices(selected_clubs):
     """
     Main function called by Streamlit.
     """
+    offers = list(iter_offers(selected_clubs))
+    with Timing.span("dataframe", provider=PROVIDER_NAME):
+        return Offers.to_frame(offers)
+
+def iter_offers(selected_clubs):
+    """Yields each Offer as soon as its product page is parsed."""
     print(f"--- FANTRAVEL: Starter søgning for {selected_clubs} ---")
     
     # 1. Fast Scan (Requests) to find club links
     club_links_map = {}
     try:
         headers = {"User-Agent": "Mozilla/5.0"}
-        resp = requests.get(URL, headers=headers, timeout=10)
+        with Timing.span("index_fetch", provider=PROVIDER_NAME, url=URL):
+            resp = Http.get(URL, headers=headers, cache=(PROVIDER_NAME, "index"))
         if resp.status_code == 200:
-            soup = BeautifulSoup(resp.content, "html.parser")
+            soup = HtmlParser.make_soup(resp.content)
             dropdown = soup.find("div", class_="fantravel-leagues-dropdown")
             if dropdown:
                 for link in dropdown.find_all("a"):
@@ -210,66 +222,22 @@ def get_prices(selected_clubs):
                         club_links_map[matched_club] = link.get("href")
     except Exception as e:
         print(f"Fantravel Error (Init): {e}")
-        return pd.DataFrame()
+        return
 
     if not club_links_map:
-        return pd.DataFrame()
+        return
 
-    # 2. Collect Match URLs (Single Driver - Fast)
+    # 2. Collect Match URLs (én fane - hurtigt)
     # Vi henter kun links her, vi besøger dem ikke.
-    matches_to_scrape = [] 
-    
-    driver = get_driver()
-    try:
-        for club_name, club_url in club_links_map.items():
-            try:
-                driver.get(club_url)
-                time.sleep(1)
-                handle_cookies(driver)
-
-                # Click "Vis kun hjemmekampe"
-                driver.execute_script("window.scrollBy(0, 200);")
-                time.sleep(0.5)
-                try:
-                    xpath = "//a[contains(@class, 'drag_scroll_item') and contains(@href, 'vis-kun-hjemmekampe')]"
-                    btn = WebDriverWait(driver, 4).until(EC.element_to_be_clickable((By.XPATH, xpath)))
-                    btn.click()
-                    time.sleep(2)
-                except: pass
-
-                # Get match links
-                soup = BeautifulSoup(driver.page_source, "html.parser")
-                match_links = [l.get("href") for l in soup.find_all("a", class_="product_table_single") if l.get("href")]
-                
-                for link in match_links:
-                    matches_to_scrape.append({
-                        "club": club_name,
-                        "url": link
-                    })
-                    
-            except Exception as e:
-                print(f"Fantravel Error ({club_name}): {e}")
-    finally:
-        driver.quit()
-
-    print(f"--- FANTRAVEL: Fandt {len(matches_to_scrape)} kampe. Starter tråde... ---")
-
-    # 3. Parallel Processing (Worker Threads)
-    final_data = []
-    
-    if matches_to_scrape:
-        # Del listen op i chunks baseret på MAX_WORKERS
-        # Dette sikrer, at hver tråd får en stak links og beholder sin browser åben
-        chunk_size = (len(matches_to_scrape) + MAX_WORKERS - 1) // MAX_WORKERS
-        chunks = [matches_to_scrape[i:i + chunk_size] for i in range(0, len(matches_to_scrape), chunk_size)]
-        
-        with concurrent.futures.ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-            # Map hver chunk til worker-funktionen
-            results = list(executor.map(process_match_batch, chunks))
-            
-            # Saml resultaterne (results er en liste af lister)
-            for batch in results:
-                final_data.extend(batch)
+    matches_to_scrape = Pipeline.run_pipeline(
+        [list(club_links_map.items())], fetch_club_pages, parse_club_links, item_url=lambda t: t[1],
+        page_kind="links"
+    )
 
-    # Return DataFrame
-    return pd.DataFrame(final_data)
\ No newline at end of file
+    print(f"--- FANTRAVEL: Fandt {len(matches_to_scrape)} kampe. Åbner {TABS} faner... ---")
+
+    # 3. Pipeline: motoren henter siderne i faner, proces-puljen parser dem
+    if matches_to_scrape:
+        yield from Pipeline.iter_pipeline([matches_to_scrape], fetch_product_pages, parse_product_page,
+                                          item_url=lambda i: i['url'], page_kind="price",
+                                          fragment_fn=fragment_product_page)
@@ -1,216 +1,236 @@
-import time
 import re
-import unicodedata
+import asyncio
 from urllib.parse import urljoin
-import pandas as pd
-import requests
-import concurrent.futures
-import streamlit as st
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from bs4 import BeautifulSoup
-
-# --- IMPORT ALIAS ---
-try:
-    from Alias import club_alias, suffix_pattern
-except ImportError:
-    club_alias = {}
-    suffix_pattern = None
-
-URL = "https://www.fodboldrejseguiden.dk/fodboldrejser-england/"
+import Engine
+import Settings
+import Http
+import Timing
+import Pipeline
+import HtmlParser
+import Offers
+import TeamRegistry
+
+URL = Settings.FODBOLDREJSEGUIDEN_BASE_URL + "/fodboldrejser-england/"
 PROVIDER_NAME = "Fodboldrejseguiden.dk"
+TABS = 8   # Klubsider der loader samtidig (faner i én browser context)
 
-# --- 1. SETUP CHROME DRIVER ---
-def get_driver():
-    chrome_options = Options()
-    chrome_options.add_argument("--headless=new") 
-    chrome_options.add_argument("--window-size=1920,1080")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--disable-notifications")
-    chrome_options.page_load_strategy = 'eager' 
-    
-    import os
-    if os.path.exists("/usr/bin/chromium"):
-        chrome_options.binary_location = "/usr/bin/chromium"
-    elif os.path.exists("/usr/bin/chromium-browser"):
-        chrome_options.binary_location = "/usr/bin/chromium-browser"
+# Klubnavne slås op på samme nøgle som i holdregistret
+clean = TeamRegistry.normalize
 
-    return webdriver.Chrome(options=chrome_options)
+# --- 3. SCRAPER WORKER ---
+# Alle hjemmekampe på en klubside åbnes med ét JS-kald, så detalje-panelerne
+# loader samtidig i stedet for ét toggle-klik (med pauser) ad gangen.
+JS_EXPAND_ALL = """() => {
+let clicked = 0;
+document.querySelectorAll('.match').forEach(function (m) {
+    if (m.getAttribute('data-is-away') === 'true') return;
+    if (m.querySelector('.packageholder .table-outer')) return;
+    const btn = m.querySelector('.togglemodule .koebsknap.toggle');
+    if (btn) { btn.click(); clicked++; }
+});
+return clicked;
+}"""
 
-def clean(text):
-    if not isinstance(text, str): return ""
-    text = unicodedata.normalize('NFKD', text).encode('ASCII', 'ignore').decode('utf-8')
-    try:
-        if suffix_pattern:
-            text = suffix_pattern.sub("", text)
-    except: pass
-    return text.lower().strip()
-
-def scroll_slowly(driver):
-    last_height = driver.execute_script("return document.body.scrollHeight")
-    retries = 0
-    while True:
-        current_scroll = driver.execute_script("return window.pageYOffset")
-        while current_scroll < last_height:
-            current_scroll += 500
-            driver.execute_script(f"window.scrollTo(0, {current_scroll});")
-            time.sleep(0.1)
-        time.sleep(1.0)
-        new_height = driver.execute_script("return document.body.scrollHeight")
-        if new_height == last_height:
-            if retries < 2:
-                retries += 1
-                time.sleep(1.0)
-                continue
-            else:
-                break
-        else:
-            last_height = new_height
-            retries = 0
+JS_MISSING_PANELS = """() => {
+let missing = 0;
+document.querySelectorAll('.match').forEach(function (m) {
+    if (m.getAttribute('data-is-away') === 'true') return;
+    if (!m.querySelector('.togglemodule .koebsknap.toggle')) return;
+    if (!m.querySelector('.packageholder .table-outer')) missing++;
+});
+return missing;
+}"""
 
-# --- 3. SCRAPER WORKER ---
-def scrape_specific_club(args):
-    club_name, club_url = args
-    local_data = []
-    
-    driver = get_driver()
-    try:
-        driver.get(club_url)
-        
-        # 1. Cookies
-        try:
-            cookie_btn = WebDriverWait(driver, 3).until(
-                EC.element_to_be_clickable((By.ID, 'onetrust-accept-btn-handler'))
-            )
-            cookie_btn.click()
-            time.sleep(1) 
-        except: pass
-
-        # 2. Find kampe
+PANEL_TIMEOUT = 8  # Sekunder vi venter på at alle paneler er loadet
+
+async def accept_cookies(page, timeout=3):
+    await Engine.click_if_visible(page.locator("#onetrust-accept-btn-handler"), timeout=timeout, pause=1)
+
+async def expand_all_matches(page):
+    """Clicks every home-match toggle at once and waits for the panels."""
+    await page.evaluate(JS_EXPAND_ALL)
+    if not await Engine.wait_until(page, f"({JS_MISSING_PANELS})() === 0", timeout=PANEL_TIMEOUT):
+        # "Rescue click" på de paneler der stadig mangler (nogle lukker ved dobbeltklik)
+        await page.evaluate(JS_EXPAND_ALL)
+        await asyncio.sleep(1)
+
+# --- PARSER (kører i Pipeline's proces-pulje) ---
+# Én gennemgang af klubsiden giver alle pakkegrupper, mærket med deres type.
+# Kalderne (get_prices her, DK_read/Data/EN_scraper) vælger selv typerne, så én
+# browser-tur og ét snapshot i PageCache dækker dem alle.
+PACKAGE_TYPES = ("ticket", "hotel", "flight+hotel", "flight")
+
+def package_type(header_text, nights):
+    """Type of a package row from its group header (lowercase) and nights."""
+    if "fly" in header_text:
+        return "flight+hotel" if "hotel" in header_text else "flight"
+    if "billet" in header_text and "hotel" not in header_text and "pakke" not in header_text:
+        return "ticket"
+    # LA Travel / Fodboldpakker har ingen overskrift - der afgør nætterne det
+    return "hotel" if "hotel" in header_text or (nights or 0) > 0 else "ticket"
+
+def extract_packages(html):
+    """
+    Every package row on an expanded club page, tagged with its type.
+    Returns (packages, titles of home matches whose panel never opened).
+    """
+    soup = HtmlParser.make_soup(html)
+    packages, unopened = [], []
+
+    for match in soup.select(".match"):
         try:
-            WebDriverWait(driver, 5).until(EC.presence_of_element_located((By.CLASS_NAME, "match")))
-            
-            scroll_slowly(driver)
-            driver.execute_script("window.scrollTo(0, 100);")
-            time.sleep(1.5)
-            
-            matches = driver.find_elements(By.CLASS_NAME, "match")
+            if match.get("data-is-away") == "true": continue
             
-            for match in matches:
-                try:
-                    if match.get_attribute("data-is-away") == "true": continue
-                    
-                    match_date_str = match.get_attribute("data-date")
-                    try:
-                        title_elem = match.find_element(By.CLASS_NAME, "toggle_title")
-                        match_title = title_elem.text.split("fra kr")[0].strip()
-                    except: match_title = "Unknown Match"
+            match_date_str = match.get("data-date")
+            match_title = HtmlParser.select_text(match, ".toggle_title").split("fra kr")[0].strip() or "Unknown Match"
+
+            groups = match.select(".packageholder .table-outer")
+            if not groups:
+                unopened.append(match_title)
+                continue
 
-                    # 3. Åbn boksen
+            # Gennemgå pakke-tabellerne
+            for group in groups:
+                # Tjek overskrift (hvis den findes)
+                header_text = HtmlParser.select_text(group, "span.pack").lower()
+
+                for row in group.select("tbody tr"):
                     try:
-                        toggle_btn = match.find_element(By.CSS_SELECTOR, ".togglemodule .koebsknap.toggle")
-                        driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", toggle_btn)
-                        time.sleep(0.2)
-                        driver.execute_script("arguments[0].click();", toggle_btn)
-                        time.sleep(0.5) 
-                    except: 
-                        try:
-                            time.sleep(0.5)
-                            driver.execute_script("arguments[0].click();", toggle_btn)
-                            time.sleep(0.5)
-                        except: pass
-                    
-                    # 4. Gennemgå pakke-tabellerne
-                    package_groups = match.find_elements(By.CSS_SELECTOR, ".packageholder .table-outer")
-                    
-                    for group in package_groups:
+                        first_td = row.find("td")
+                        if not first_td: continue
+                        provider_text = HtmlParser.text(first_td)
+
+                        # Hent nætter (None når rækken ikke angiver dem)
+                        nights = None
+                        nights_match = re.search(r"(\d+)", HtmlParser.select_text(row, ".nightsamount"))
+                        if nights_match: nights = int(nights_match.group(1))
+
+                        # Hent pris og link
+                        btn = row.select_one(".koebsknap")
+                        if not btn: continue
+                        link = btn.get("href")
                         try:
-                            # Tjek overskrift (hvis den findes)
-                            header_text = ""
-                            try:
-                                header_elems = group.find_elements(By.CSS_SELECTOR, "span.pack")
-                                if header_elems:
-                                    header_text = header_elems[0].get_attribute("innerText").strip().lower()
-                            except: pass
-
-                            # A. Hvis der står "fly", vil vi ALDRIG have den
-                            if "fly" in header_text: continue
-                            
-                            # B. Hvis der eksplicit står "kun billet" (uden hotel), vil vi ikke have den
-                            if "billet" in header_text and "hotel" not in header_text and "pakke" not in header_text:
-                                continue
-
-                            rows = group.find_elements(By.CSS_SELECTOR, "tbody tr")
-                            for row in rows:
-                                try:
-                                    provider_text = row.find_element(By.TAG_NAME, "td").get_attribute("innerText").strip()
-                                    
-                                    # --- DIN SPECIFIKKE FILTRERING AF DUBLETTER ---
-                                    # Denne blok er bevaret 100% som du ønskede
-                                    prov_check = provider_text.lower().replace(" ", "")
-                                    if "footballtravel" in prov_check or "olka" in prov_check or "fantravel" in prov_check:
-                                        continue
-                                    # ----------------------------------------------
-
-                                    # Hent nætter
-                                    nights = 0
-                                    try: 
-                                        nights_elem = row.find_element(By.CLASS_NAME, "nightsamount")
-                                        nights_text = nights_elem.get_attribute("innerText")
-                                        nights = int(re.search(r"(\d+)", nights_text).group(1))
-                                    except: 
-                                        nights = 0
-
-                                    # --- LOGIK TIL AT FANGE LA TRAVEL / FODBOLDPAKKER ---
-                                    # Vi accepterer rækken hvis:
-                                    # 1. Overskriften siger "Hotel" (Standard)
-                                    #    ELLER
-                                    # 2. Der er > 0 nætter (Fanger dem uden header)
-                                    is_hotel_package = "hotel" in header_text or nights > 0
-                                    
-                                    if not is_hotel_package:
-                                        continue
-
-                                    # Hent pris og link
-                                    try:
-                                        btn = row.find_element(By.CLASS_NAME, "koebsknap")
-                                        link = btn.get_attribute("href")
-                                        raw_price = btn.get_attribute("innerText")
-                                        price_clean = float(re.sub(r"[^\d]", "", raw_price))
-                                    except: continue
-
-                                    if link and "bestil-tilbud" not in link:
-                                        local_data.append({
-                                            "Club": club_name,
-                                            "Match": match_title,
-                                            "SortDate": match_date_str,
-                                            "Price": price_clean,
-                                            "Provider": provider_text,
-                                            "Nights": nights
-                                        })
-                                except: continue
-                        except: continue
-                except: continue
-        except Exception: pass
-    finally:
-        driver.quit()
-    
+                            price_clean = float(re.sub(r"[^\d]", "", HtmlParser.text(btn)))
+                        except ValueError: continue
+
+                        if link and "bestil-tilbud" not in link:
+                            packages.append({
+                                "type": package_type(header_text, nights),
+                                "match": match_title,
+                                "date": match_date_str,
+                                "provider": provider_text,
+                                "price": price_clean,
+                                "nights": nights,
+                                "link": link,
+                            })
+                    except Exception: continue
+        except Exception: continue
+
+    return packages, unopened
+
+def parse_club_packages(snapshot):
+    """All package types from a club page snapshot, as one record for the page."""
+    packages, unopened = extract_packages(snapshot["html"]) if snapshot["html"] else ([], [])
+    return [{
+        "club": snapshot["meta"]["club"],
+        "url": snapshot["url"],
+        "loaded": bool(snapshot["html"]),
+        "packages": packages,
+        "unopened": unopened,
+    }]
+
+# Rækker fra de direkte providere (dem henter vi selv) -> deres PROVIDER_NAME.
+# De bliver ikke FRG-tilbud, men billige sekundære observationer (Via), som
+# matrixen kun bruger når den direkte kørsel fejlede, sprængte budgettet eller
+# blev sprunget over (se Matrix.prepare_offers).
+AGGREGATED = {
+    "footballtravel": "Footballtravel.dk",
+    "olka": "Olka Express",
+    "fantravel": "Fantravel.dk",
+}
+
+def select_offers(club_name, packages, types=("hotel",), fallback=True):
+    """Offers for the chosen package types; direct providers' rows become fallback offers."""
+    local_data = []
+    for package in packages:
+        if package["type"] not in types: continue
+        provider, via = package["provider"], None
+
+        # --- DIN SPECIFIKKE FILTRERING AF DUBLETTER ---
+        # Rækkerne fra Footballtravel/Olka/Fantravel tælles ikke som FRG's egne
+        prov_check = provider.lower().replace(" ", "")
+        direct = next((name for key, name in AGGREGATED.items() if key in prov_check), None)
+        if direct:
+            if not fallback: continue
+            provider, via = direct, PROVIDER_NAME
+        # ----------------------------------------------
+
+        found = Offers.offer(club_name, package["match"], package["date"], package["price"], package["nights"] or 0,
+                             provider, link=package["link"], via=via)
+        if found: local_data.append(found)
     return local_data
 
+def parse_club_page(snapshot):
+    """
+    Reads the hotel package offers from a snapshot of a loaded and expanded
+    club page, plus the direct providers' rows as fallback offers.
+    """
+    packages, _ = extract_packages(snapshot["html"])
+    return select_offers(snapshot["meta"]["club"], packages, fallback=Settings.FRG_FALLBACK)
+
+# --- BROWSER WORKER ---
+async def load_club_page(page, cookie_timeout=3, load_timeout=5):
+    """Cookies, lazy-load scroll and expand on the current tab. Returns the HTML."""
+    with Timing.span("cookies"):
+        await accept_cookies(page, cookie_timeout)
+    with Timing.span("selector_wait"):
+        if not await Engine.wait_for(page, ".match", load_timeout):
+            return ""
+    try:
+        with Timing.span("scrolling"):
+            await Engine.scroll_to_bottom(page)
+            await page.evaluate("window.scrollTo(0, 100)")
+            await asyncio.sleep(0.5)
+
+        with Timing.span("toggle"):
+            await expand_all_matches(page)
+        return await Engine.content(page)
+    except Exception:
+        return ""
+
+async def visit_club_page(page, item, cookie_timeout=3):
+    club_name, club_url = item
+    with Timing.span("club_page", provider=PROVIDER_NAME, club=club_name, url=club_url):
+        with Timing.span("navigation"):
+            await page.goto(club_url, wait_until="domcontentloaded")
+        html = await load_club_page(page, cookie_timeout, load_timeout=15)
+    return Pipeline.make_snapshot(club_url, html, club=club_name)
+
+def fetch_clubs_in_tabs(tasks, emit, tabs=None):
+    """
+    Loads the club pages in up to `tabs` tabs of one browser context and emits
+    their snapshots. The tabs load concurrently on the engine's event loop.
+    """
+    # Cookie-samtykket gælder for hele context'en efter første fane
+    cookies = {"done": False}
+
+    async def visit(page, item):
+        timeout = 1 if cookies["done"] else 3
+        cookies["done"] = True
+        return await visit_club_page(page, item, timeout)
+
+    Engine.fetch_pages(tasks, visit, emit, provider=PROVIDER_NAME, pages=tabs or TABS)
+
 # --- 2. FETCH URLS ---
-@st.cache_resource(ttl=3600)
+# Klublisten caches på disken (PageCache, "index") i stedet for kun i Streamlit-processen
 def fetch_website_urls():
     website_data_lower = {}
     try:
         headers = {"User-Agent": "Mozilla/5.0"}
-        response = requests.get(URL, headers=headers, timeout=10)
+        with Timing.span("index_fetch", provider=PROVIDER_NAME, url=URL):
+            response = Http.get(URL, headers=headers, cache=(PROVIDER_NAME, "index"))
         if response.status_code == 200:
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = HtmlParser.make_soup(response.content)
             section = soup.find(id="klubber")
             if section:
                 for link in section.find_all('a'):
@@ -222,48 +242,30 @@ def fetch_website_urls():
 
 # --- 4. MAIN EXPORT FUNCTION ---
 def get_prices(selected_clubs):
+    return normalize(list(iter_offers(selected_clubs)))
+
+def iter_offers(selected_clubs):
+    """Yields the offers club page by club page, as they are parsed."""
     website_urls = fetch_website_urls()
     tasks = []
     
     for club in selected_clubs:
-        c_clean = clean(club)
-        found_url = website_urls.get(c_clean)
-        
-        if not found_url and club in club_alias:
-            for alias in club_alias[club]:
-                if clean(alias) in website_urls:
-                    found_url = website_urls[clean(alias)]
-                    break
-        
+        found_url = TeamRegistry.find(website_urls, club)
         if found_url:
             tasks.append((club, found_url))
     
     if not tasks:
-        return pd.DataFrame()
+        return
 
-    all_results = []
-    
-    with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
-        future_to_club = {executor.submit(scrape_specific_club, t): t[0] for t in tasks}
-        
-        for future in concurrent.futures.as_completed(future_to_club):
-            try:
-                data = future.result()
-                if data:
-                    all_results.extend(data)
-            except Exception: pass
-
-    df = pd.DataFrame(all_results)
-    
-    if not df.empty:
-        df['SortDate'] = pd.to_datetime(df['SortDate'], errors='coerce')
-        df = df.dropna(subset=['Price', 'SortDate'])
-        
-        cols = ["Club", "Match", "SortDate", "Price", "Provider", "Nights"]
-        existing_cols = [c for c in cols if c in df.columns]
-        df = df[existing_cols]
-
-    return df
+    # Alle klubsider i faner i én browser context (Engine). Parsing sker i
+    # Pipeline's proces-pulje.
+    yield from Pipeline.iter_pipeline([tasks], fetch_clubs_in_tabs, parse_club_page, item_url=lambda t: t[1],
+                                      page_kind="price")
+
+def normalize(all_results):
+    """Offers from parse_club_page -> the typed offer frame (see Offers)."""
+    with Timing.span("dataframe", provider=PROVIDER_NAME):
+        return Offers.to_frame(all_results)
 
 if __name__ == "__main__":
     print("Test run...")
\ No newline at end of file
@@ -1,5 +1,4 @@
 import pandas as pd
-import requests
 import io
 import re
 from datetime import datetime
@@ -10,13 +9,18 @@ try:
 except ImportError:
     club_alias = {}
 
+import Settings
+import Http
+import Timing
+import Offers
+
 # --- KONFIGURATION ---
-CSV_URL = "https://api.footballtravel.com/feed/footballtravel-dk/all-offers.csv"
-PROVIDER_NAME = "FootballTravel.dk"
+CSV_URL = Settings.FOOTBALLTRAVEL_FEED_URL
+PROVIDER_NAME = "Footballtravel.dk"
 
 def load_csv_data():
     try:
-        response = requests.get(CSV_URL, timeout=10)
+        response = Http.get(CSV_URL, cache=(PROVIDER_NAME, "feed"))
         response.raise_for_status()
         df = pd.read_csv(io.StringIO(response.text), sep=',', header=None, on_bad_lines='skip')
         return df
@@ -56,11 +60,13 @@ def check_club_match(row_text, selected_clubs):
                     return club 
     return None
 
-def get_prices(selected_clubs):
-    full_df = load_csv_data()
-    if full_df.empty: return pd.DataFrame()
+def parse_feed(full_df, selected_clubs):
+    """Turns the raw offer feed into the typed offer frame for the selected clubs."""
+    return Offers.to_frame(list(iter_feed(full_df, selected_clubs)))
 
-    processed_data = []
+def iter_feed(full_df, selected_clubs):
+    """Yields an Offer per feed row that matches the selected clubs."""
+    if full_df.empty: return
     
     # Kolonne indexer
     IDX_FILTER_TYPE = 1   # B
@@ -100,14 +106,18 @@ def get_prices(selected_clubs):
             # 5. NAVN
             match_name = f"{str(row[IDX_FILTER_CLUB]).strip()} – {str(row[IDX_OPPONENT]).strip()}"
 
-            processed_data.append({
-                "Club": found_club,
-                "Match": match_name,
-                "SortDate": sort_date,
-                "Price": price,
-                "Provider": PROVIDER_NAME,
-                "Nights": nights
-            })
+            found = Offers.offer(found_club, match_name, sort_date, price, nights, PROVIDER_NAME)
         except: continue
-        
-    return pd.DataFrame(processed_data)
\ No newline at end of file
+        if found: yield found
+
+def iter_offers(selected_clubs):
+    """Streams the offers (see EN_scraper_app); the feed is one request, so they come all at once."""
+    with Timing.span("feed_fetch", provider=PROVIDER_NAME, url=CSV_URL):
+        full_df = load_csv_data()
+    yield from iter_feed(full_df, selected_clubs)
+
+def get_prices(selected_clubs):
+    with Timing.span("feed_fetch", provider=PROVIDER_NAME, url=CSV_URL):
+        full_df = load_csv_data()
+    with Timing.span("extraction", provider=PROVIDER_NAME):
+        return parse_feed(full_df, selected_clubs)
\ No newline at end of file
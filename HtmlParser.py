@@ -0,0 +1,60 @@
+import importlib.util
+
+from bs4 import BeautifulSoup
+
+# --- PARSER BACKEND ---
+# lxml er markant hurtigere end Pythons indbyggede html.parser.
+# Mangler lxml, falder vi tilbage til html.parser, så intet går i stykker.
+HAS_LXML = importlib.util.find_spec("lxml") is not None
+
+PARSER = "lxml" if HAS_LXML else "html.parser"
+
+
+def available_backends():
+    return ["lxml", "html.parser"] if HAS_LXML else ["html.parser"]
+
+
+def make_soup(markup, parser=None):
+    """BeautifulSoup with the fastest available backend."""
+    return BeautifulSoup(markup, parser or PARSER)
+
+
+# --- HJÆLPERE ---
+# Samme form som selektorerne providerne allerede bruger: CSS via soup'en,
+# XPath (fx Fantravel's cookie-knap) direkte på lxml.
+
+def text(node, default=""):
+    """Whitespace-normalised text of a node, roughly what Selenium's .text gives."""
+    if node is None:
+        return default
+    return node.get_text(" ", strip=True)
+
+
+def select_text(node, css, default=""):
+    """Text of the first element matching a CSS selector."""
+    if node is None:
+        return default
+    return text(node.select_one(css), default)
+
+
+def xpath(markup, expression):
+    """
+    Runs an XPath query directly on lxml (much faster than going through
+    BeautifulSoup). Returns [] when lxml is not installed.
+    """
+    if not HAS_LXML or not markup:
+        return []
+    import lxml.html
+    tree = lxml.html.fromstring(markup)
+    return tree.xpath(expression)
+
+
+def xpath_texts(markup, expression):
+    """Normalised text of every element an XPath query returns."""
+    result = []
+    for elem in xpath(markup, expression):
+        if isinstance(elem, str):
+            result.append(" ".join(elem.split()))
+        else:
+            result.append(" ".join(elem.text_content().split()))
+    return result
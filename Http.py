@@ -0,0 +1,162 @@
+import time
+import atexit
+import random
+import asyncio
+import threading
+from urllib.parse import urlparse
+
+import httpx
+
+import Cassette
+import PageCache
+
+# --- HTTP ---
+# Ét fælles HTTP-lag til alt der ikke kræver browser (feeds, forsider,
+# slug-tjek). Kernen er asyncio + httpx.AsyncClient på en baggrundstråd med
+# keep-alive pools, så TCP/TLS-handshakes genbruges; get()/get_many() er den
+# synkrone facade, som providerne (der kører i almindelige tråde) bruger.
+# Alle kald går gennem Cassette, så record/replay virker som før. Med
+# cache=(provider, sidetype) gemmes 200-svar i PageCache og genbruges inden for TTL.
+
+TIMEOUT = 10.0          # Samlet timeout pr. forsøg (sekunder)
+CONNECT_TIMEOUT = 5.0
+RETRIES = 3             # Ekstra forsøg efter det første
+BACKOFF = 0.5           # Første pause før retry; fordobles pr. forsøg (+ jitter)
+RETRY_STATUS = {429, 500, 502, 503, 504}
+MAX_CONNECTIONS = 32    # I alt, på tværs af hosts
+PER_HOST = 6            # Samtidige requests mod samme host
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0",
+    "Accept-Encoding": "gzip, deflate, br",   # br kræver brotli-pakken
+}
+
+HTTPError = httpx.HTTPError
+
+_lock = threading.Lock()
+_loop = None
+_client = None
+_host_slots = {}
+
+
+def _start_loop():
+    global _loop
+    with _lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="http-loop", daemon=True).start()
+            _loop = loop
+    return _loop
+
+
+def _get_client():
+    """The shared AsyncClient. Only touched from the loop thread."""
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            headers=HEADERS,
+            timeout=httpx.Timeout(TIMEOUT, connect=CONNECT_TIMEOUT),
+            limits=httpx.Limits(max_connections=MAX_CONNECTIONS,
+                                max_keepalive_connections=MAX_CONNECTIONS,
+                                keepalive_expiry=60),
+            follow_redirects=True,
+        )
+    return _client
+
+
+def _host_slot(url):
+    host = urlparse(url).netloc
+    if host not in _host_slots:
+        _host_slots[host] = asyncio.Semaphore(PER_HOST)
+    return _host_slots[host]
+
+
+def _backoff(attempt, response=None):
+    """Exponential backoff with full jitter; honours Retry-After when the server sends one."""
+    if response is not None:
+        retry_after = response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return min(float(retry_after), 30.0)
+    return BACKOFF * (2 ** attempt) * random.uniform(0.5, 1.5)
+
+
+# --- ASYNC KERNE ---
+
+async def aget(url, headers=None, timeout=None, retries=RETRIES, cache=None):
+    """
+    GET with per-host concurrency limit and retries on network errors and 429/5xx.
+    cache=(provider, kind) serves and stores the response through PageCache.
+    """
+    if Cassette.replaying():
+        entry = Cassette.replay_http(url)
+        if Cassette.timed():
+            await asyncio.sleep(entry.elapsed)
+        return entry
+    if cache and PageCache.enabled():
+        hit = await asyncio.to_thread(PageCache.get_http, url, *cache)
+        if hit is not None:
+            return hit
+
+    client = _get_client()
+    kwargs = {"headers": headers}
+    if timeout is not None:
+        kwargs["timeout"] = timeout
+
+    start = time.perf_counter()
+    async with _host_slot(url):
+        for attempt in range(retries + 1):
+            try:
+                response = await client.get(url, **kwargs)
+            except httpx.TransportError:
+                if attempt == retries:
+                    raise
+                await asyncio.sleep(_backoff(attempt))
+                continue
+            if response.status_code in RETRY_STATUS and attempt < retries:
+                await asyncio.sleep(_backoff(attempt, response))
+                continue
+            break
+
+    if Cassette.recording():
+        Cassette.record_http(url, response, time.perf_counter() - start)
+    if cache:
+        await asyncio.to_thread(PageCache.put_http, url, response, *cache)
+    return response
+
+
+async def agather(urls, headers=None, timeout=None, cache=None):
+    """Fetches many URLs concurrently. Failed URLs get the exception instead of a response."""
+    return await asyncio.gather(*(aget(u, headers=headers, timeout=timeout, cache=cache) for u in urls),
+                                return_exceptions=True)
+
+
+# --- SYNC FACADE ---
+
+def run(coro):
+    """Runs a coroutine on the shared HTTP loop and waits for the result."""
+    return asyncio.run_coroutine_threadsafe(coro, _start_loop()).result()
+
+
+def get(url, headers=None, timeout=None, retries=RETRIES, cache=None):
+    """Drop-in for requests.get(url, headers=..., timeout=...)."""
+    return run(aget(url, headers=headers, timeout=timeout, retries=retries, cache=cache))
+
+
+def get_many(urls, headers=None, timeout=None, cache=None):
+    """{url: response or exception}, fetched concurrently over the shared pools."""
+    urls = list(dict.fromkeys(urls))
+    return dict(zip(urls, run(agather(urls, headers=headers, timeout=timeout, cache=cache))))
+
+
+def close():
+    global _client
+    if _loop is None or _client is None:
+        return
+    try:
+        asyncio.run_coroutine_threadsafe(_client.aclose(), _loop).result(timeout=2)
+    except Exception:
+        pass
+    _client = None
+
+
+atexit.register(close)
@@ -0,0 +1,331 @@
+import io
+import pandas as pd
+from datetime import datetime, timedelta
+# Tilføjet 'Alignment' til imports for at kunne rotere tekst
+from openpyxl.styles import Border, Side, PatternFill, Font, Alignment
+from openpyxl.comments import Comment
+from openpyxl.utils import get_column_letter
+import Offers
+
+# Prismatrixen bag Excel-filen og preview'et i EN_scraper_app.
+# Holdt fri af Streamlit, så den også kan køres fra benchmarks og scripts.
+
+# Markering af fallback-priser (Offer.via) i preview'et
+FALLBACK_MARK = " *"
+
+def prepare_offers(frames, now=None, fallback_for=()):
+    """
+    Concats the typed provider frames (see Offers) and drops matches within 24 hours.
+    Fallback offers (Via set) are only kept for the providers in fallback_for -
+    those whose direct run failed, went over budget or was skipped.
+    """
+    full_df = Offers.concat(frames)
+    keep = (full_df['Via'].astype(str).isin(["", "nan"])) | full_df['Provider'].isin(list(fallback_for))
+    full_df = full_df[keep]
+
+    # Filter: > 24 timer
+    cutoff = (now or datetime.now()) + timedelta(hours=24)
+    return full_df[full_df['SortDate'] > cutoff]
+
+class LiveMatrix:
+    """
+    Collects offers streamed from the providers' iter_offers() and keeps them as
+    one compact typed frame, so the matrix can be re-rendered while they arrive.
+    Not thread-safe: feed it from one thread (EN_scraper_app drains a queue).
+    """
+
+    def __init__(self):
+        self._frame = Offers.empty_frame()
+        self._pending = []
+        self.count = 0
+        # Providere hvis fallback-priser må vises (sættes af appen undervejs)
+        self.fallback_for = set()
+
+    def add(self, offer):
+        self._pending.append(offer)
+        self.count += 1
+
+    @property
+    def pending(self):
+        return len(self._pending)
+
+    def frame(self):
+        if self._pending:
+            self._frame = Offers.concat([self._frame, Offers.to_frame(self._pending)])
+            self._pending = []
+        return self._frame
+
+    def preview(self, now=None):
+        """The preview frame for the offers so far, or None if there is nothing to show."""
+        full_df = prepare_offers([self.frame()], now, self.fallback_for)
+        if full_df.empty:
+            return None
+        all_providers, match_data_list = group_matches(full_df)
+        return build_preview(match_data_list, all_providers)
+
+def group_matches(full_df):
+    """
+    Groups offers into matches (same club, dates within 2 days).
+    Returns (all_providers, match_data_list).
+    """
+    # Sortering og ID-generering
+    full_df = full_df.sort_values(by=['Club', 'SortDate'])
+    full_df['club_change'] = full_df['Club'] != full_df['Club'].shift()
+    full_df['date_diff'] = full_df['SortDate'].diff().dt.days.abs()
+    full_df['big_gap'] = full_df['date_diff'] > 2 
+    full_df['Match_Group_ID'] = (full_df['club_change'] | full_df['big_gap']).cumsum()
+
+
+    # --- FORBERED DATA TIL EXCEL (TRANSFORMERING) ---
+
+    # 1. Find alle unikke udbydere og sorter dem
+    all_providers = sorted(full_df['Provider'].unique())
+    if "Footballtravel.dk" in all_providers:
+        all_providers.remove("Footballtravel.dk")
+        all_providers.insert(0, "Footballtravel.dk")
+
+    # 2. Gruppér data per kamp
+    matches_grouped = full_df.groupby('Match_Group_ID').agg({
+        'Club': 'first',
+        'Match': lambda x: max(x, key=len),
+        'SortDate': 'first'
+    }).reset_index()
+
+    match_data_list = []
+
+    for _, match_row in matches_grouped.iterrows():
+        group_id = match_row['Match_Group_ID']
+        match_name = match_row['Match']
+        date_str = match_row['SortDate'].strftime('%d/%m')
+        display_name = f"{match_name} ({date_str})"
+
+        prices_in_group = full_df[full_df['Match_Group_ID'] == group_id]
+
+        provider_data = {}
+
+        for _, p_row in prices_in_group.iterrows():
+            prov = p_row['Provider']
+            price_val = p_row['PriceOre'] / 100   # Excel viser kroner
+            nights_val = int(p_row['Nights'])
+            via = p_row['Via'] if isinstance(p_row['Via'], str) and p_row['Via'] else None
+
+            # LOGIK ÆNDRING 1:
+            # Vi gemmer kun prisen, hvis vi ikke har set udbyderen før, 
+            # ELLER hvis den nye pris er lavere end den vi allerede har.
+            # En direkte pris går altid forud for en fallback-pris (via).
+            current = provider_data.get(prov)
+            if (current is None or (current['via'] and not via)
+                    or (bool(current['via']) == bool(via) and price_val < current['price'])):
+                provider_data[prov] = {
+                    'price': price_val,
+                    'nights': nights_val,
+                    'via': via
+                }
+
+        # LOGIK ÆNDRING 2:
+        # Vi beregner min/max baseret på de priser, der FAKTISK bliver vist
+        final_prices = [d['price'] for d in provider_data.values() if d['price'] > 0]
+
+        min_price = min(final_prices) if final_prices else None
+        max_price = max(final_prices) if final_prices else None
+
+        match_data_list.append({
+            'display': display_name,
+            'data': provider_data,
+            'min_price': min_price, 
+            'max_price': max_price,
+            'club': match_row['Club']
+        })
+
+    return all_providers, match_data_list
+
+def build_excel(match_data_list, all_providers):
+    """Renders the price matrix workbook and returns it as bytes."""
+    # --- 7. EXCEL GENERERING ---
+    output = io.BytesIO()
+    with pd.ExcelWriter(output, engine='openpyxl') as writer:
+        writer.book.create_sheet('Prices')
+        ws = writer.book['Prices']
+
+        #  FJERN GITTERLINJER ---
+        ws.sheet_view.showGridLines = False
+
+        # Definitioner af styles
+        header_font = Font(bold=True)
+        header_alignment = Alignment(textRotation=45, vertical='bottom', horizontal='center')
+
+        #  Ramme-definitioner ---
+        thin_side = Side(style='thin')
+        medium_side = Side(style='medium') # Tykkere streg
+
+        # Standard ramme (tynd hele vejen rundt)
+        thin_border = Border(left=thin_side, right=thin_side, top=thin_side, bottom=thin_side)
+
+        # Ramme til start af ny klub (tyk venstre kant)
+        thick_left_border = Border(left=medium_side, right=thin_side, top=thin_side, bottom=thin_side)
+
+        green_fill = PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid")
+        red_fill = PatternFill(start_color="FFCCCC", end_color="FFCCCC", fill_type="solid")
+
+        # --- A. SKRIV HEADERS ---
+        col_idx = 2
+        prev_club = None # Til at huske forrige klub
+
+        for match in match_data_list:
+            # Tjek om vi skal bruge tyk kant (hvis klubben skifter og det ikke er første kolonne)
+            current_club = match['club']
+            use_thick_border = (prev_club is not None) and (current_club != prev_club)
+            current_border = thick_left_border if use_thick_border else thin_border
+
+            # Opdater prev_club
+            prev_club = current_club
+
+            cell_match = ws.cell(row=1, column=col_idx, value=match['display'])
+            cell_match.font = header_font
+            cell_match.alignment = header_alignment
+            cell_match.border = current_border # Brug den valgte ramme
+
+            cell_nights = ws.cell(row=1, column=col_idx+1, value="Nætter")
+            cell_nights.font = header_font
+            cell_nights.alignment = header_alignment
+            cell_nights.border = thin_border # Altid tynd her (det er inde i samme kamp)
+
+            ws.column_dimensions[get_column_letter(col_idx)].width = 15
+            ws.column_dimensions[get_column_letter(col_idx+1)].width = 8
+
+            col_idx += 2
+
+        # --- B. SKRIV RÆKKER (VIRKSOMHEDER) ---
+        row_idx = 2
+        fallback_sources = set()
+
+        for provider in all_providers:
+            cell_prov = ws.cell(row=row_idx, column=1, value=provider)
+            cell_prov.font = Font(bold=True)
+            cell_prov.border = Border(top=medium_side, bottom=medium_side, left=medium_side, right=medium_side)
+
+            col_idx = 2
+            prev_club = None # Nulstil for hver række
+
+            for match in match_data_list:
+                # Samme logik for at finde ramme-typen
+                current_club = match['club']
+                use_thick_border = (prev_club is not None) and (current_club != prev_club)
+                current_border = thick_left_border if use_thick_border else thin_border
+                prev_club = current_club
+
+                p_data = match['data'].get(provider, {'price': 0, 'nights': 0})
+                price = p_data['price']
+                nights = p_data['nights']
+
+                # Skriv Pris
+                cell_p = ws.cell(row=row_idx, column=col_idx, value=price if price > 0 else "")
+                cell_p.border = current_border # Sæt rammen her på prisen (venstre celle i parret)
+
+                if price > 0:
+                    if price == match['min_price']:
+                        cell_p.fill = green_fill
+                    elif price == match['max_price']:
+                        cell_p.fill = red_fill
+                    # Fallback-pris fra en aggregator: kursiv + kommentar med kilden
+                    if p_data.get('via'):
+                        cell_p.font = Font(italic=True)
+                        cell_p.comment = Comment(f"Pris fra {p_data['via']} (fallback)", "Scraper")
+                        fallback_sources.add(p_data['via'])
+
+                # Skriv Nætter
+                cell_n = ws.cell(row=row_idx, column=col_idx+1, value=nights if nights > 0 else "")
+                cell_n.border = thin_border # Altid tynd
+
+                col_idx += 2
+
+            row_idx += 1
+
+        if fallback_sources:
+            note = ws.cell(row=row_idx, column=1, value=f"Kursiv = pris fra {', '.join(sorted(fallback_sources))} (fallback)")
+            note.font = Font(italic=True, size=9)
+            row_idx += 1
+
+        row_idx += 2
+
+        # Overskrift til sammenligningsafsnit
+        sect_header = ws.cell(row=row_idx, column=1, value="Sammenligning med Footballtravel.dk. Grøn = dyrere, Rød = billigere")
+        sect_header.font = Font(bold=True, size=11)
+        sect_header.border = Border(bottom=medium_side)
+        row_idx += 1
+
+        for provider in all_providers:
+            cell_prov = ws.cell(row=row_idx, column=1, value=provider)
+            cell_prov.font = Font(bold=True)
+            cell_prov.border = Border(top=medium_side, bottom=medium_side, left=medium_side, right=medium_side)
+
+            col_idx = 2
+            prev_club = None
+
+            for match in match_data_list:
+                # Samme logik for at finde ramme-typen
+                current_club = match['club']
+                use_thick_border = (prev_club is not None) and (current_club != prev_club)
+                current_border = thick_left_border if use_thick_border else thin_border
+                prev_club = current_club
+
+                p_data = match['data'].get(provider, {'price': 0, 'nights': 0})
+                price = p_data['price']
+                nights = p_data['nights']
+
+                # Sikkerhed
+                ft_data = match['data'].get("Footballtravel.dk", {'price': 0, 'nights': 0})
+                ft_nights = ft_data['nights']
+                ft_price = ft_data['price']
+
+                # Beregn prisforskel mod Footballtravel.dk
+                price_diff_val = ""
+                if price > 0 and ft_price > 0:
+                    price_diff_val = price - ft_price                       
+
+                # Forskel på nætter mod Footballtravel.dk
+                nights_diff_val = ""
+                if price > 0 and ft_nights > 0:
+                    nights_diff_val = nights - ft_nights
+
+                # Skriv i excel
+                # Pris
+                cell_p_diff = ws.cell(row=row_idx, column=col_idx, value=price_diff_val)
+                cell_p_diff.border = current_border
+
+                # Farv cellen grøm
+                if isinstance(price_diff_val, (int, float)):
+                    if price_diff_val > 0:
+                        cell_p_diff.fill = green_fill
+                    elif price_diff_val < 0:
+                        cell_p_diff.fill = red_fill
+
+                # Nætter
+                cell_n_diff = ws.cell(row=row_idx, column=col_idx+1, value=nights_diff_val)
+                cell_n_diff.border = thin_border
+
+                col_idx += 2
+
+            row_idx += 1
+
+        ws.column_dimensions['A'].width = 25
+        ws.freeze_panes = "B2"
+
+    return output.getvalue()
+
+def build_preview(match_data_list, all_providers):
+    """Simple price-only frame for st.dataframe (Streamlit can't show the rotated headers)."""
+    # Vis preview i Streamlit (Vi laver en simpel dataframe til visning da Streamlit ikke viser rotationer)
+    # Providere med fallback-priser markeres i rækkenavnet (FALLBACK_MARK)
+    labels = [p + FALLBACK_MARK if any(m['data'].get(p, {}).get('via') for m in match_data_list) else p
+              for p in all_providers]
+    preview_df = pd.DataFrame(index=labels)
+    for m in match_data_list:
+        col_name = m['display']
+        # Byg en kolonne med priser for preview
+        prices = []
+        for p in all_providers:
+            val = m['data'].get(p, {}).get('price', 0)
+            prices.append(val if val > 0 else 0)
+        preview_df[col_name] = prices
+    return preview_df
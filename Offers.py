@@ -0,0 +1,118 @@
+import math
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+# --- OFFER SCHEMA ---
+# Ét fælles format for tilbud fra alle providere:
+#   Offer       - __slots__-record til streaming (parsere, pipeline, historik)
+#   to_frame()  - kolonneformen: kategoriske Club/Match/Provider, pris i øre
+#                 som int32, nætter som int8 og datetime64 datoer
+# Alle providere returnerer frames i dette format, så samlingen i appen bare
+# er en concat uden oprydning.
+# Via er tom for direkte observationer og navnet på aggregatoren for priser
+# der er læst hos en anden (fx Fodboldrejseguiden's rækker for Olka).
+
+COLUMNS = ["Club", "Match", "SortDate", "PriceOre", "Nights", "Provider", "Link", "Via"]
+CATEGORICAL = ["Club", "Match", "Provider", "Via"]
+MAX_PRICE_ORE = 2**31 - 1   # int32
+MAX_NIGHTS = 127            # int8
+DTYPES = {
+    "Club": "category",
+    "Match": "category",
+    "SortDate": "datetime64[ns]",
+    "PriceOre": "int32",
+    "Nights": "int8",
+    "Provider": "category",
+    "Link": "object",
+    "Via": "category",
+}
+
+
+class Offer:
+    """One price observation. Prices are kept in øre to stay integral."""
+
+    __slots__ = ("club", "match", "date", "price_ore", "nights", "provider", "link", "via")
+
+    def __init__(self, club, match, date, price_ore, nights, provider, link=None, via=None):
+        self.club = club
+        self.match = match
+        self.date = date
+        self.price_ore = price_ore
+        self.nights = nights
+        self.provider = provider
+        self.link = link
+        self.via = via
+
+    @property
+    def price(self):
+        """Price in kr."""
+        return self.price_ore / 100
+
+    def __repr__(self):
+        via = f" via {self.via!r}" if self.via else ""
+        return f"Offer({self.club!r}, {self.match!r}, {self.date!r}, {self.price:.2f} kr, {self.nights} nætter, {self.provider!r}{via})"
+
+
+def offer(club, match, date, price_kr, nights, provider, link=None, via=None):
+    """Builds an Offer from a price in kr. Returns None when the price or nights are unusable."""
+    try:
+        price = float(price_kr)
+    except (TypeError, ValueError):
+        return None
+    if math.isnan(price) or price <= 0 or price * 100 > MAX_PRICE_ORE:
+        return None
+    try:
+        nights = int(nights or 0)
+    except (TypeError, ValueError):
+        nights = 0
+    # Uden tjek ville int8-kolonnen i to_frame stille og roligt vende fx 200 til -56
+    if not 0 <= nights <= MAX_NIGHTS:
+        return None
+    return Offer(club, match, date, int(round(price * 100)), nights, provider, link, via)
+
+
+def empty_frame():
+    return pd.DataFrame({c: pd.Series(dtype=t) for c, t in DTYPES.items()})
+
+
+def to_frame(offers):
+    """Offer records -> typed frame. Offers whose date can't be parsed are dropped."""
+    offers = [o for o in offers if o is not None]
+    if not offers:
+        return empty_frame()
+
+    frame = pd.DataFrame({
+        "Club": [o.club for o in offers],
+        "Match": [o.match for o in offers],
+        "SortDate": pd.to_datetime([o.date for o in offers], errors="coerce"),
+        "PriceOre": [o.price_ore for o in offers],
+        "Nights": [o.nights for o in offers],
+        "Provider": [o.provider for o in offers],
+        "Link": [o.link for o in offers],
+        "Via": [o.via or "" for o in offers],
+    })
+    frame = frame[frame["SortDate"].notna()]
+    return frame.astype(DTYPES).reset_index(drop=True)
+
+
+def concat(frames):
+    """Concats typed frames; categories are unioned (sorted) first so the columns stay categorical."""
+    frames = [f for f in frames if f is not None and not f.empty]
+    if not frames:
+        return empty_frame()
+    if len(frames) > 1:
+        frames = [f.copy() for f in frames]
+        for col in CATEGORICAL:
+            # Sorterede kategorier, så klubrækkefølgen ikke afhænger af hvilken provider svarede først
+            categories = union_categoricals([f[col] for f in frames], sort_categories=True).categories
+            for f in frames:
+                f[col] = f[col].cat.set_categories(categories)
+    return pd.concat(frames, ignore_index=True)
+
+
+def iter_offers(frame):
+    """Typed frame -> Offer records."""
+    for row in frame.itertuples(index=False):
+        yield Offer(row.Club, row.Match, row.SortDate, int(row.PriceOre), int(row.Nights), row.Provider, row.Link,
+                    row.Via or None)
@@ -1,52 +1,39 @@
 import pandas as pd
 import io
-import requests
 import re
+import os
+import json
 import time
 import random
+import asyncio
+import threading
+import unicodedata
 from datetime import datetime
-from playwright.sync_api import sync_playwright
+import Engine
+import Cassette
+import Settings
+import Http
+import Timing
+import Pipeline
+import HtmlParser
+import Offers
+import TeamRegistry
 
 # --- IMPORT ALIAS ---
 # Matches the logic in Footballtravel.py to handle team variations
 try:
-    from Alias import club_alias
+    from Alias import club_alias, provider_slugs
 except ImportError:
     club_alias = {}
+    provider_slugs = {}
 
 # --- CONFIGURATION ---
-URL_TEMPLATE = "https://olka.dk/event/soccer/{date}-{home}-{away}/"
-
-# Mapping for URL slugs (specific to Olka's URL structure)
-TEAM_MAPPING = {
-    #English
-    "Bournemouth": "bournemouth",
-    "Aston Villa": "aston-villa",
-    "Leeds": "leeds-united",
-    "Brentford": "brentford",
-    "Burnley": "burnley",
-    "Brighton": "brighton",
-    "Chelsea": "chelsea-fc",
-    "Crystal Palace": "crystal-palace",
-    "Everton": "everton",
-    "Fulham": "fulham-fc",
-    "Liverpool FC": "liverpool-fc",
-    "Liverpool": "liverpool-fc",
-    "Manchester United": "manchester-united",
-    "Newcastle": "newcastle-united",
-    "Nottingham Forest": "nottingham-forest",
-    "Sunderland": "sunderland",
-    "West Ham": "west-ham",
-    "Wolverhampton": "wolves",
-    "Tottemnham": "tottenham",
-    # Spanish
-    "FC Barcelona": "fc-barcelona",
-    "Atlético Madrid": "atltico-madrid",
-    "Real Madrid": "real-madrid",
-    # Other
-    "FC Kairat": "kairat-almaty",
-    "Qarabag FK": "qarabag",
-}
+PROVIDER_NAME = "Olka Express"
+URL_TEMPLATE = Settings.OLKA_BASE_URL + "/event/soccer/{date}-{home}-{away}/"
+
+# Mapping for URL slugs (specific to Olka's URL structure) - lives in Alias.py
+# with the rest of the team data, so TeamRegistry can compile it
+TEAM_MAPPING = provider_slugs.get(PROVIDER_NAME, {})
 
 def check_club_match(row_text, selected_clubs):
     """
@@ -74,7 +61,12 @@ def get_slug(team_name, is_home=False):
     
     if "Arsenal" in clean_name:
         return "arsenal-" if is_home else "arsenal-fc"
-            
+
+    # Kendte stavemåder (aliaser, xlsx-navne) slås op direkte i holdregistret
+    slug = TeamRegistry.slug(clean_name, PROVIDER_NAME)
+    if slug:
+        return slug
+
     for key, slug in TEAM_MAPPING.items():
         if key.lower() in clean_name.lower():
             return slug
@@ -83,16 +75,175 @@ def get_slug(team_name, is_home=False):
     generel_slug = re.sub(r'\s+', '-', generel_slug)
     return generel_slug
 
-def generate_links(selected_clubs):
-    """Fetches CSV data and generates a DataFrame of matches with Links based on selected clubs."""
-    url = "https://api.footballtravel.com/feed/footballtravel-dk/all-offers.csv"
+# --- SLUG RESOLVER ---
+# get_slug er et gæt. Et forkert gæt opdages ellers først efter en hel
+# browser-navigation, så kandidaterne tjekkes med samtidige HTTP-kald før
+# browseren starter. Slugs der virker huskes pr. hold (hjemme/ude), og kampe
+# hvor ingen kandidat findes huskes som manglende i MISSING_TTL.
+# Filen er delt op pr. OLKA_BASE_URL, så stand-in- og benchmark-kørsler ikke
+# blander deres slugs med de rigtige.
+SLUG_CACHE_PATH = Settings.OLKA_SLUG_CACHE
+SLUG_NAMESPACE = Settings.OLKA_BASE_URL
+MISSING_TTL = 12 * 3600
+MAX_CANDIDATES = 3          # Pr. hold, så en kamp højst giver 3 x 3 kald
+MISSING_STATUS = (404, 410)
+
+_slug_lock = threading.Lock()
+_slug_cache = None
+
+def _load_slug_cache():
+    """The slug cache section for the current OLKA_BASE_URL."""
+    global _slug_cache
+    if _slug_cache is None:
+        try:
+            with open(SLUG_CACHE_PATH, encoding="utf-8") as f:
+                _slug_cache = json.load(f)
+        except (OSError, ValueError):
+            _slug_cache = {}
+        if "slugs" in _slug_cache:
+            # Gammelt format uden sektioner - det kom altid fra live-sitet
+            _slug_cache = {"https://olka.dk": _slug_cache}
+    section = _slug_cache.setdefault(SLUG_NAMESPACE, {})
+    section.setdefault("slugs", {})
+    section.setdefault("missing", {})
+    return section
+
+def _save_slug_cache():
+    try:
+        os.makedirs(os.path.dirname(SLUG_CACHE_PATH) or ".", exist_ok=True)
+        tmp = f"{SLUG_CACHE_PATH}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(_slug_cache, f, ensure_ascii=False, indent=1)
+        os.replace(tmp, SLUG_CACHE_PATH)
+    except OSError as e:
+        print(f"Could not save Olka slug cache: {e}")
+
+def _team_key(team_name, is_home):
+    return f"{'home' if is_home else 'away'}:{team_name.strip().lower()}"
+
+def _fixture_key(row):
+    return f"{row['SortDate']:%Y-%m-%d}|{row['Home']}|{row['Away']}"
+
+def slug_candidates(team_name, is_home=False, known_slugs=None):
+    """Slug guesses for a team, best first. A slug that worked before leads."""
+    if not isinstance(team_name, str): return []
+    if known_slugs is None:
+        with _slug_lock:
+            known_slugs = dict(_load_slug_cache()["slugs"])
+    known = known_slugs.get(_team_key(team_name, is_home))
+
+    ascii_name = unicodedata.normalize("NFKD", team_name).encode("ascii", "ignore").decode()
+    plain = re.sub(r'[^a-z0-9]+', '-', ascii_name.lower()).strip('-')
+    bare = re.sub(r'^(fc|afc|cf)-|-(fc|afc|cf)$', '', plain)
+
+    candidates = [known, get_slug(team_name, is_home), plain, bare, f"{bare}-fc"]
+    return list(dict.fromkeys(c for c in candidates if c))[:MAX_CANDIDATES]
+
+def _is_event_page(response):
+    # Olka sender ukendte events videre til forsiden/søgningen i stedet for en 404
+    return (not isinstance(response, Exception) and response.status_code == 200
+            and "/event/" in str(response.url))
+
+def _is_missing(response):
+    if isinstance(response, Exception):
+        return False
+    return response.status_code in MISSING_STATUS or (response.status_code == 200 and not _is_event_page(response))
+
+def resolve_links(df_matches):
+    """
+    Validates each fixture's event URL over HTTP before any browser work.
+    Links are replaced with the variant that exists; fixtures Olka has no page
+    for are dropped (and remembered for MISSING_TTL). On network errors the
+    guessed link is kept so the browser can still try.
+    In replay the probes are served from the cassette, so the links match the
+    recording; the slug cache is then only read, never written.
+    """
+    if df_matches.empty:
+        return df_matches
+
+    rows = df_matches.to_dict("records")
+    # Låsen holdes kun mens cachen læses og flettes - ikke under netværkskaldene
+    now = time.time()
+    with _slug_lock:
+        cache = _load_slug_cache()
+        known_slugs = dict(cache["slugs"])
+        missing = {k for k, t in cache["missing"].items() if t > now}
+
+    # url -> (home_slug, away_slug) for hver kamp, bedste gæt først
+    candidates = {}
+    skipped = 0
+    for i, row in enumerate(rows):
+        if _fixture_key(row) in missing:
+            skipped += 1
+            continue
+        date_str = row['SortDate'].strftime("%Y-%m-%d")
+        pairs = {}
+        for home in slug_candidates(row['Home'], is_home=True, known_slugs=known_slugs):
+            for away in slug_candidates(row['Away'], is_home=False, known_slugs=known_slugs):
+                pairs[URL_TEMPLATE.format(date=date_str, home=home, away=away)] = (home, away)
+        candidates[i] = pairs
+
+    # Runde 1: kun det bedste gæt pr. kamp. Runde 2: resten for dem der fejlede.
+    resolved, transient = {}, set()
+    with Timing.span("slug_check", provider=PROVIDER_NAME, fixtures=len(candidates)):
+        for first_round in (True, False):
+            todo = {i: list(pairs)[:1] if first_round else list(pairs)[1:]
+                    for i, pairs in candidates.items() if i not in resolved}
+            urls = [u for group in todo.values() for u in group]
+            if not urls:
+                continue
+            # Siderne gemmes i PageCache, så browseren/HTTP-stien bagefter kan genbruge dem
+            responses = Http.get_many(urls, cache=(PROVIDER_NAME, "price"))
+            for i, group in todo.items():
+                for url in group:
+                    response = responses.get(url)
+                    if _is_event_page(response):
+                        resolved[i] = url
+                        break
+                    if not _is_missing(response):
+                        transient.add(i)
+
+    kept, found_slugs, new_missing = [], {}, {}
+    for i, pairs in candidates.items():
+        row = rows[i]
+        if i in resolved:
+            url = resolved[i]
+            home, away = pairs[url]
+            found_slugs[_team_key(row['Home'], True)] = home
+            found_slugs[_team_key(row['Away'], False)] = away
+            kept.append({**row, 'Link': url})
+        elif i in transient:
+            kept.append(row)
+        else:
+            new_missing[_fixture_key(row)] = now + MISSING_TTL
+            print(f"   -> No Olka page for {row['Match']} ({row['Date']})")
+
+    # En afspilning må ikke ændre cachen, som live-kørsler bruger
+    if not Cassette.replaying():
+        with _slug_lock:
+            cache = _load_slug_cache()
+            cache["slugs"].update(found_slugs)
+            cache["missing"] = {k: t for k, t in cache["missing"].items() if t > now}
+            cache["missing"].update(new_missing)
+            _save_slug_cache()
+
+    if skipped:
+        print(f"   -> Skipped {skipped} fixtures known to be missing on Olka.")
+    if not kept:
+        return pd.DataFrame()
+    return pd.DataFrame(kept)
+
+def fetch_feed():
+    """Fetches the Footballtravel offer feed that Olka's fixtures are derived from."""
+    url = Settings.FOOTBALLTRAVEL_FEED_URL
     print("Fetching CSV data...")
-    
+    response = Http.get(url, cache=(PROVIDER_NAME, "feed"))
+    response.encoding = 'utf-8'
+    return pd.read_csv(io.StringIO(response.text))
+
+def links_from_feed(df, selected_clubs):
+    """Generates a DataFrame of matches with Olka links from the feed for the selected clubs."""
     try:
-        response = requests.get(url)
-        response.encoding = 'utf-8'
-        df = pd.read_csv(io.StringIO(response.text))
-        
         # Filter for 'billet + hotel' (Column B / Index 1)
         col_b_values = df.iloc[:, 1].astype(str).str.strip().str.lower()
         df_filtered = df[col_b_values == 'billet + hotel'].copy()
@@ -106,7 +257,7 @@ def generate_links(selected_clubs):
         results = results.drop_duplicates()
         
     except Exception as e:
-        print(f"Error fetching CSV: {e}")
+        print(f"Error reading CSV: {e}")
         return pd.DataFrame()
 
     generated_links = []
@@ -136,6 +287,8 @@ def generate_links(selected_clubs):
                 'SortDate': date_obj,                             # Key fixed (datetime object)
                 'Date': display_date,
                 'Match': match_display,
+                'Home': home_team,
+                'Away': away_team,
                 'Link': link
             })
             
@@ -150,66 +303,145 @@ def generate_links(selected_clubs):
     df_final = df_final.sort_values(by=['Club', 'SortDate'])
     return df_final
 
+def generate_links(selected_clubs):
+    """Fetches CSV data and generates a DataFrame of matches with Links based on selected clubs."""
+    try:
+        with Timing.span("feed_fetch", provider=PROVIDER_NAME):
+            df = fetch_feed()
+    except Exception as e:
+        print(f"Error fetching CSV: {e}")
+        return pd.DataFrame()
+    return resolve_links(links_from_feed(df, selected_clubs))
+
+PRICE_PATTERN = re.compile(r'(\d[\d\s\.]*)\s?DKK', re.IGNORECASE)
+
+# Olka sælger pakkerne med 2 nætter
+NIGHTS = 2
+
+def read_package_price(html):
+    """
+    (price, rendered) from the 'Billet + hotel' package card. rendered is False
+    when the HTML has no package cards or the card has no price yet - the price
+    is drawn client-side or a consent wall stands in front of the content.
+    """
+    soup = HtmlParser.make_soup(html)
+    cards = soup.select("div.package")
+    if not cards:
+        return None, False
+    for card in cards:
+        rå_tekst = card.get_text(" ", strip=True).replace('\xa0', ' ')
+        if "billet + hotel" not in rå_tekst.lower(): continue
+
+        match = PRICE_PATTERN.search(rå_tekst)
+        if not match:
+            return None, False
+        ren_pris = re.sub(r'[^\d]', '', match.group(1))
+        return int(ren_pris), True
+    # Siden er færdig, men har ingen 'Billet + hotel'-pakke
+    return None, True
+
+def parse_event_page(snapshot):
+    """Finds the 'Billet + hotel' price in an event page snapshot (runs in Pipeline's process pool)."""
+    row = snapshot["meta"]
+    price = read_package_price(snapshot["html"])[0] if snapshot["html"] else None
+
+    found = Offers.offer(row["Club"], row["Match"], row["SortDate"], price, NIGHTS, PROVIDER_NAME, link=row["Link"])
+    return [found] if found else []
+
+COOKIE_BUTTON = re.compile("Godkend|Allow all|Accepter", re.IGNORECASE)
+
+async def visit_event_page(page, row):
+    """Opens one event page with human-like delays and returns its snapshot."""
+    url = row['Link']
+    print(f"Checking: {row['Match']}")
+
+    with Timing.span("event_page", provider=PROVIDER_NAME, club=row['Club'], url=url):
+        # --- HUMAN DELAY START ---
+        with Timing.span("human_delay"):
+            await asyncio.sleep(random.uniform(0.2, 1.3))
+        # -------------------------
+
+        html = ""
+        try:
+            with Timing.span("navigation"):
+                await page.goto(url, timeout=60000)
+                await asyncio.sleep(random.uniform(0.2, 1.3))
+
+            with Timing.span("cookies"):
+                await Engine.click_if_visible(page.get_by_role("button", name=COOKIE_BUTTON), timeout=2, pause=1.1)
+
+            html = await Engine.content(page)
+        except Exception as e:
+            print(f"   -> Error: {e}")
+
+        # Tom HTML giver en række uden pris, ligesom før
+        return Pipeline.make_snapshot(url, html, **row)
+
+def fetch_event_pages(rows, emit):
+    """Navigates the event pages one at a time (Olka is sensitive to bursts) and emits the raw HTML."""
+    print("\nStarting Scraper...")
+    # Ingen interception: Olka skal se en helt almindelig browser
+    Engine.fetch_pages(rows, visit_event_page, emit, provider=PROVIDER_NAME, pages=1, block=None)
+
 def scrape_prices(df_matches):
-    """Iterates through the DataFrame and scrapes prices with human-like delays."""
-    print("\nStarting Scraper (Browser will open)...")
-    
-    prices = []
-    
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True) 
-        page = browser.new_page()
-        
-        total = len(df_matches)
-        
-        for index, row in df_matches.iterrows():
-            url = row['Link']
-            print(f"[{index + 1}/{total}] Checking: {row['Match']}")
-            
-            # --- HUMAN DELAY START ---
-            sleep_time = random.uniform(0.2, 1.3)
-            print(f"   ...waiting {sleep_time:.2f}s to act human...")
-            time.sleep(sleep_time) 
-            # -------------------------
-
-            try:
-                page.goto(url, timeout=60000)
-                time.sleep(random.uniform(0.2, 1.3))
-
-                try:
-                    cookie_knap = page.get_by_role("button", name=re.compile("Godkend|Allow all|Accepter", re.IGNORECASE))
-                    if cookie_knap.is_visible(timeout=2000):
-                        cookie_knap.click()
-                        time.sleep(1.1) 
-                except:
-                    pass
-
-                pakke_kort = page.locator("div.package").filter(has_text="Billet + hotel").first
-                
-                if pakke_kort.count() > 0:
-                    rå_tekst = pakke_kort.inner_text().replace('\xa0', ' ')
-                    match = re.search(r'(\d[\d\s\.]*)\s?DKK', rå_tekst, re.IGNORECASE)
-                    
-                    if match:
-                        pris_str = match.group(1)
-                        ren_pris = re.sub(r'[^\d]', '', pris_str)
-                        print(f"   -> Found Price: {ren_pris}")
-                        prices.append(int(ren_pris))
-                    else:
-                        print("   -> Price format not found.")
-                        prices.append(None)
-                else:
-                    print("   -> 'Billet + hotel' package not found.")
-                    prices.append(None)
-
-            except Exception as e:
-                print(f"   -> Error: {e}")
-                prices.append(None)
-                
-        browser.close()
-
-    df_matches['Price'] = prices
-    return df_matches
+    """
+    Reads the prices over plain HTTP where the HTML has them, and fetches the
+    rest in the browser with parsing in Pipeline's process pool.
+    """
+    return list(iter_prices(df_matches))
+
+def read_over_http(rows):
+    """
+    Fast path: the event pages over pooled HTTP (the slug check has usually
+    cached them already). Returns (offers, rows that still need the browser).
+    """
+    urls = [row['Link'] for row in rows]
+    offers, browser_rows = [], []
+    with Timing.span("http_fast_path", provider=PROVIDER_NAME, pages=len(urls)):
+        responses = Http.get_many(urls, cache=(PROVIDER_NAME, "price"))
+        for row in rows:
+            response = responses.get(row['Link'])
+            if isinstance(response, Exception) or response.status_code != 200:
+                browser_rows.append(row)
+                continue
+            price, rendered = read_package_price(response.text)
+            if not rendered:
+                browser_rows.append(row)
+                continue
+            found = Offers.offer(row["Club"], row["Match"], row["SortDate"], price, NIGHTS, PROVIDER_NAME,
+                                 link=row["Link"])
+            if found:
+                offers.append(found)
+    return offers, browser_rows
+
+def iter_prices(df_matches):
+    """Like scrape_prices, but yields each Offer as soon as its page is parsed."""
+    rows = df_matches.to_dict("records")
+    found = 0
+
+    offers, browser_rows = read_over_http(rows)
+    for offer in offers:
+        found += 1
+        yield offer
+    print(f"   -> Read {len(rows) - len(browser_rows)}/{len(rows)} events over HTTP.")
+
+    # Kun sider hvor prisen ikke står i HTML'en (JS eller consent-væg) går til browseren.
+    # Ingen fragment_fn: HTTP-HTML'en for netop de sider har ingen pris, så en
+    # uændret hash ville genbruge en gammel pris.
+    if browser_rows:
+        for offer in Pipeline.iter_pipeline([browser_rows], fetch_event_pages, parse_event_page,
+                                            item_url=lambda r: r['Link'], page_kind="price"):
+            found += 1
+            yield offer
+    print(f"   -> Found 'Billet + hotel' price for {found}/{len(rows)} events.")
+
+def iter_offers(selected_clubs):
+    """Streaming version of get_prices (see EN_scraper_app)."""
+    df = generate_links(selected_clubs)
+    if df.empty:
+        print("No matches found.")
+        return
+    yield from iter_prices(df)
 
 def get_prices(selected_clubs):
     """
@@ -222,18 +454,11 @@ def get_prices(selected_clubs):
     
     if df.empty:
         print("No matches found.")
-        return pd.DataFrame()
+        return Offers.empty_frame()
 
-    df_results = scrape_prices(df)
-    
-    # UPDATED: Add missing columns for EN_scraper_app compatibility
-    df_results['Provider'] = "Olka Express"
-    # Sæt Nætter til 2, HVIS der er en pris (og den ikke er None/0). Ellers 0.
-    df_results['Nights'] = df_results['Price'].apply(lambda x: 2 if pd.notnull(x) and x > 0 else 0)
-    
-    # UPDATED: Return all necessary columns including SortDate and Club
-    output_df = df_results[['Club', 'SortDate', 'Date', 'Match', 'Price', 'Nights', 'Provider', 'Link']]
-    return output_df
+    offers = scrape_prices(df)
+    with Timing.span("dataframe", provider=PROVIDER_NAME):
+        return Offers.to_frame(offers).sort_values(by=['Club', 'SortDate'], ignore_index=True)
 
 if __name__ == "__main__":
     # Test Input
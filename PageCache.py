@@ -0,0 +1,276 @@
+import os
+import gzip
+import json
+import time
+import pickle
+import sqlite3
+import hashlib
+import threading
+
+import Cassette
+import Settings
+
+# --- PAGE CACHE ---
+# Disk-cache for hentede dokumenter (Http) og browser-snapshots (Pipeline), så
+# en gentaget søgning inden for TTL hverken rører netværk eller browser.
+#   - nøglen er recipe + URL (som i Cassette); indholdet gemmes efter sha256 i
+#     blobs/, så identiske sider kun ligger på disken én gang
+#   - TTL pr. sidetype med overrides pr. provider
+#   - LRU-oprydning når blobs fylder mere end PAGE_CACHE_MB
+#   - hit/miss-tællere pr. provider og sidetype (stats())
+#   - fragment-hash + udtrukne tilbud pr. side (EXTRACTIONS), så en uændret
+#     side kan genbruge sidste udtræk uden browser (se Pipeline)
+# Slås fra med SCRAPER_PAGE_CACHE=0 og er altid fra mens Cassette optager eller
+# afspiller, så optagelser og afspilninger ikke blandes med cachen.
+
+CACHE_DIR = Settings.PAGE_CACHE_DIR
+MAX_BYTES = Settings.PAGE_CACHE_MB * 1024 * 1024
+HTTP_RECIPE = "http"
+
+# Sekunder en side er frisk
+TTLS = {
+    "index": 6 * 3600,     # klub-oversigter (Fantravel-forsiden, FRG's klubliste)
+    "links": 3 * 3600,     # klubsider der kun bruges til at finde kampene
+    "feed": 15 * 60,       # Footballtravel-feedet (priser)
+    "price": 15 * 60,      # produkt-, event- og klubsider med priser
+}
+PROVIDER_TTLS = {
+    # FRG samler andres priser og er dyr at hente (scroll + paneler)
+    "Fodboldrejseguiden.dk": {"price": 30 * 60},
+}
+# Et udtræk genbruges højst så længe, selv om fragmentet er uændret
+EXTRACTION_MAX_AGE = 24 * 3600
+
+_lock = threading.Lock()
+_db = None
+_counters = {}
+
+
+def enabled():
+    return Settings.PAGE_CACHE and not Cassette.mode()
+
+
+def ttl(provider, kind):
+    return PROVIDER_TTLS.get(provider, {}).get(kind, TTLS.get(kind, 0))
+
+
+def _connect():
+    global _db
+    if _db is None:
+        os.makedirs(os.path.join(CACHE_DIR, "blobs"), exist_ok=True)
+        db = sqlite3.connect(os.path.join(CACHE_DIR, "index.sqlite"), timeout=10, check_same_thread=False)
+        db.execute("""CREATE TABLE IF NOT EXISTS entries (
+            key TEXT PRIMARY KEY, provider TEXT, kind TEXT, digest TEXT,
+            meta BLOB, stored_at REAL, used_at REAL)""")
+        db.execute("CREATE TABLE IF NOT EXISTS blobs (digest TEXT PRIMARY KEY, size INTEGER)")
+        db.execute("CREATE INDEX IF NOT EXISTS entries_used ON entries (used_at)")
+        db.execute("CREATE TABLE IF NOT EXISTS extractions (key TEXT PRIMARY KEY, digest TEXT, offers BLOB, stored_at REAL)")
+        db.commit()
+        _db = db
+    return _db
+
+
+def _blob_path(digest):
+    return os.path.join(CACHE_DIR, "blobs", digest[:2], digest + ".gz")
+
+
+def _count(provider, kind, event):
+    counts = _counters.setdefault((provider or "", kind), {})
+    counts[event] = counts.get(event, 0) + 1
+
+
+# --- KERNE ---
+
+def get(recipe, url, provider, kind):
+    """(content bytes, meta) for a fresh entry, or None."""
+    if not enabled():
+        return None
+    key = Cassette.snapshot_key(recipe, url)
+    now = time.time()
+    with _lock:
+        try:
+            db = _connect()
+            row = db.execute("SELECT digest, meta, stored_at FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                _count(provider, kind, "misses")
+                return None
+            digest, meta, stored_at = row
+            if now - stored_at > ttl(provider, kind):
+                _count(provider, kind, "expired")
+                return None
+            with gzip.open(_blob_path(digest), "rb") as f:
+                content = f.read()
+            db.execute("UPDATE entries SET used_at = ? WHERE key = ?", (now, key))
+            db.commit()
+        except (OSError, sqlite3.Error, EOFError) as e:
+            print(f"PageCache læsefejl ({url}): {e}")
+            _count(provider, kind, "misses")
+            return None
+        _count(provider, kind, "hits")
+        return content, pickle.loads(meta) if meta else None
+
+
+def put(recipe, url, content, provider, kind, meta=None):
+    """Stores content (bytes) under recipe + url. Identical content is stored once."""
+    if not enabled() or not content:
+        return
+    key = Cassette.snapshot_key(recipe, url)
+    digest = hashlib.sha256(content).hexdigest()
+    now = time.time()
+    with _lock:
+        try:
+            db = _connect()
+            path = _blob_path(digest)
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp = f"{path}.{os.getpid()}.tmp"
+                with gzip.open(tmp, "wb") as f:
+                    f.write(content)
+                os.replace(tmp, path)
+            db.execute("INSERT OR REPLACE INTO blobs (digest, size) VALUES (?, ?)", (digest, os.path.getsize(path)))
+            db.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)",
+                       (key, provider, kind, digest,
+                        pickle.dumps(meta, protocol=pickle.HIGHEST_PROTOCOL) if meta is not None else None,
+                        now, now))
+            _count(provider, kind, "stores")
+            _evict(db)
+            db.commit()
+        except (OSError, sqlite3.Error) as e:
+            print(f"PageCache skrivefejl ({url}): {e}")
+
+
+def _evict(db):
+    """Drops least recently used entries (and blobs nothing points to) until under MAX_BYTES."""
+    total = db.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+    if total <= MAX_BYTES:
+        return
+    for key, digest, provider, kind in db.execute(
+            "SELECT key, digest, provider, kind FROM entries ORDER BY used_at").fetchall():
+        if total <= MAX_BYTES:
+            break
+        db.execute("DELETE FROM entries WHERE key = ?", (key,))
+        _count(provider, kind, "evictions")
+        if db.execute("SELECT 1 FROM entries WHERE digest = ? LIMIT 1", (digest,)).fetchone():
+            continue
+        size = db.execute("SELECT size FROM blobs WHERE digest = ?", (digest,)).fetchone()
+        db.execute("DELETE FROM blobs WHERE digest = ?", (digest,))
+        total -= size[0] if size else 0
+        try:
+            os.remove(_blob_path(digest))
+        except OSError:
+            pass
+
+
+# --- HTTP ---
+
+def get_http(url, provider, kind):
+    """A cached 200 response as a Cassette.RecordedResponse, or None."""
+    found = get(HTTP_RECIPE, url, provider, kind)
+    if found is None:
+        return None
+    content, meta = found
+    # Den endelige URL efter redirects (Olka's slug-tjek ser på den)
+    return Cassette.RecordedResponse({**meta, "url": meta.get("final_url", url), "content": content, "elapsed": 0.0})
+
+
+def put_http(url, response, provider, kind):
+    if response.status_code != 200:
+        return
+    meta = {"status_code": response.status_code, "headers": dict(response.headers), "encoding": response.encoding,
+            "final_url": str(response.url)}
+    put(HTTP_RECIPE, url, response.content, provider, kind, meta)
+
+
+# --- BROWSER SNAPSHOTS ---
+
+def get_snapshot(recipe, url, provider, kind):
+    found = get(recipe, url, provider, kind)
+    if found is None:
+        return None
+    html, meta = found
+    return {"url": url, "html": html.decode("utf-8"), "meta": meta or {}}
+
+
+def put_snapshot(recipe, snapshot, provider, kind):
+    # Tomme sider (fejl, timeouts) caches ikke - de skal prøves igen
+    if snapshot["html"]:
+        put(recipe, snapshot["url"], snapshot["html"].encode("utf-8"), provider, kind, snapshot["meta"])
+
+
+# --- EXTRACTIONS ---
+
+def get_extraction(recipe, url):
+    """(fragment digest, offers) from the last extraction of the page, or None."""
+    if not enabled():
+        return None
+    key = Cassette.snapshot_key(recipe, url)
+    with _lock:
+        try:
+            row = _connect().execute("SELECT digest, offers, stored_at FROM extractions WHERE key = ?",
+                                     (key,)).fetchone()
+        except sqlite3.Error as e:
+            print(f"PageCache læsefejl ({url}): {e}")
+            return None
+    if row is None or time.time() - row[2] > EXTRACTION_MAX_AGE:
+        return None
+    return row[0], pickle.loads(row[1])
+
+
+def put_extraction(recipe, url, digest, offers):
+    if not enabled() or not digest:
+        return
+    key = Cassette.snapshot_key(recipe, url)
+    now = time.time()
+    with _lock:
+        try:
+            db = _connect()
+            db.execute("INSERT OR REPLACE INTO extractions VALUES (?, ?, ?, ?)",
+                       (key, digest, pickle.dumps(list(offers), protocol=pickle.HIGHEST_PROTOCOL), now))
+            db.execute("DELETE FROM extractions WHERE stored_at < ?", (now - EXTRACTION_MAX_AGE,))
+            db.commit()
+        except (sqlite3.Error, pickle.PicklingError) as e:
+            print(f"PageCache skrivefejl ({url}): {e}")
+
+
+def count_extraction(provider, reused):
+    with _lock:
+        _count(provider, "extraction", "reused" if reused else "changed")
+
+
+# --- STATUS ---
+
+def stats():
+    """Hit/miss counters per provider and page type, plus the size on disk."""
+    with _lock:
+        rows = [{"provider": p, "kind": k, **c} for (p, k), c in sorted(_counters.items())]
+        entries, size = 0, 0
+        if enabled():
+            try:
+                db = _connect()
+                entries = db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+                size = db.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+            except sqlite3.Error:
+                pass
+    events = ("hits", "misses", "expired", "stores", "evictions", "reused", "changed")
+    totals = {event: sum(r.get(event, 0) for r in rows) for event in events}
+    return {**totals, "entries": entries, "mb": round(size / 1024 / 1024, 1), "by_kind": rows}
+
+
+def clear():
+    """Empties the cache (entries and blobs)."""
+    with _lock:
+        db = _connect()
+        for (digest,) in db.execute("SELECT digest FROM blobs").fetchall():
+            try:
+                os.remove(_blob_path(digest))
+            except OSError:
+                pass
+        db.execute("DELETE FROM entries")
+        db.execute("DELETE FROM blobs")
+        db.execute("DELETE FROM extractions")
+        db.commit()
+        _counters.clear()
+
+
+if __name__ == "__main__":
+    print(json.dumps(stats(), indent=2))
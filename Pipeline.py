@@ -0,0 +1,316 @@
+import os
+import sys
+import hashlib
+import queue
+import threading
+import multiprocessing
+import time
+import concurrent.futures
+from concurrent.futures.process import BrokenProcessPool
+
+import Cassette
+import Engine
+import Http
+import PageCache
+import Timing
+import BrowserWorker
+
+# --- KONFIGURATION ---
+# To-trins pipeline: browser-tråde navigerer og lægger rå page_source på en
+# begrænset kø, mens en pulje af processer (uden GIL) parser til tilbud.
+QUEUE_SIZE = 16
+PARSE_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+
+_pool = None
+_pool_lock = threading.Lock()
+_DONE = object()
+
+
+def make_snapshot(url, html, **meta):
+    """A raw page as emitted by a browser worker. Must stay picklable."""
+    return {"url": url, "html": html or "", "meta": meta}
+
+
+def get_parse_pool():
+    """Shared process pool, started once and reused across searches."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # fork fra en proces med tråde (Streamlit) kan deadlocke.
+            # NB: scripts der bruger puljen skal have en __main__-guard.
+            try:
+                ctx = multiprocessing.get_context("forkserver")
+            except ValueError:
+                ctx = multiprocessing.get_context("spawn")
+            _pool = concurrent.futures.ProcessPoolExecutor(max_workers=PARSE_WORKERS, mp_context=ctx)
+        return _pool
+
+
+def _reset_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def _timed_parse(parse_fn, snapshot):
+    """Runs in the pool; returns the offers and how long parsing took."""
+    start = time.perf_counter()
+    offers = parse_fn(snapshot) or []
+    return offers, time.perf_counter() - start
+
+
+def recipe_name(fetch_fn):
+    """Identifies the navigation/interaction recipe (used as cassette key)."""
+    return f"{fetch_fn.__module__}.{fetch_fn.__name__}"
+
+
+def fragment_digest(response, fragment_fn):
+    """sha256 of the page fragment the offers come from, or None if it can't be compared."""
+    if isinstance(response, Exception) or response is None or response.status_code != 200:
+        return None
+    try:
+        fragment = fragment_fn(response.text)
+    except Exception:
+        return None
+    if not fragment:
+        return None
+    return hashlib.sha256(fragment.encode("utf-8")).hexdigest()
+
+
+def skip_unchanged(chunks, item_url, fragment_fn, recipe, provider):
+    """
+    Fetches every item with a plain GET and hashes its fragment. Items whose
+    fragment is unchanged since the last extraction reuse those offers and
+    never reach the browser. Returns (remaining chunks, reused offers, {url: digest}).
+    """
+    urls = [item_url(item) for chunk in chunks for item in chunk]
+    with Timing.span("fragment_check", provider=provider, pages=len(urls)):
+        responses = Http.get_many(urls)
+
+    remaining, reused, digests = [], [], {}
+    for chunk in chunks:
+        todo = []
+        for item in chunk:
+            url = item_url(item)
+            digest = fragment_digest(responses.get(url), fragment_fn)
+            stored = PageCache.get_extraction(recipe, url) if digest else None
+            if stored is not None and stored[0] == digest:
+                reused.extend(stored[1])
+                PageCache.count_extraction(provider, reused=True)
+                continue
+            if digest:
+                digests[url] = digest
+                PageCache.count_extraction(provider, reused=False)
+            todo.append(item)
+        if todo:
+            remaining.append(todo)
+    return remaining, reused, digests
+
+
+def run_pipeline(chunks, fetch_fn, parse_fn, max_in_flight=None, item_url=None, page_kind=None, fragment_fn=None):
+    """All offers of iter_pipeline() as a list, in completion order."""
+    return list(iter_pipeline(chunks, fetch_fn, parse_fn, max_in_flight=max_in_flight, item_url=item_url,
+                              page_kind=page_kind, fragment_fn=fragment_fn))
+
+
+def iter_pipeline(chunks, fetch_fn, parse_fn, max_in_flight=None, item_url=None, page_kind=None,
+                  fragment_fn=None):
+    """
+    Runs one browser thread per chunk, parses their snapshots in processes and
+    yields the offers as soon as each page is parsed.
+
+    fetch_fn(chunk, emit) navigates/interacts and calls emit(snapshot) per page.
+    parse_fn(snapshot) returns a list of offers; it must be a top-level
+    function so it can be sent to the process pool.
+    item_url(item) gives the URL a chunk item will be fetched from; it lets
+    cassette replay pick exactly the recorded pages for this selection.
+    page_kind (a PageCache page type, needs item_url) serves fresh snapshots
+    from the page cache and only sends the rest to the browser.
+    fragment_fn(html) picks the part of the plain (non-browser) HTML the offers
+    depend on; pages where it hasn't changed reuse their last extraction.
+    Inside an Engine.cancel_scope the browser threads stop between pages and
+    the pipeline returns once the event is set.
+    """
+    cancel = Engine.cancel_event()
+    if cancel is not None and cancel.is_set():
+        return
+    chunks = [c for c in chunks if c]
+    recipe = recipe_name(fetch_fn)
+    provider = getattr(sys.modules.get(fetch_fn.__module__), "PROVIDER_NAME", fetch_fn.__module__)
+    in_flight_meta = {}
+
+    cached = []
+    if page_kind and item_url is not None and PageCache.enabled():
+        remaining = []
+        for chunk in chunks:
+            todo = []
+            for item in chunk:
+                snapshot = PageCache.get_snapshot(recipe, item_url(item), provider, page_kind)
+                if snapshot is None:
+                    todo.append(item)
+                else:
+                    cached.append(snapshot)
+            if todo:
+                remaining.append(todo)
+        chunks = remaining
+
+    digests = {}
+    if fragment_fn is not None and item_url is not None and PageCache.enabled() and chunks:
+        chunks, reused, digests = skip_unchanged(chunks, item_url, fragment_fn, recipe, provider)
+        yield from reused
+
+    if not chunks and not cached:
+        return
+
+    snapshots = queue.Queue(maxsize=QUEUE_SIZE)
+
+    def record_extraction(snapshot, seconds, offers):
+        meta = snapshot["meta"]
+        Timing.record("extraction", seconds, provider=provider, url=snapshot["url"],
+                      club=meta.get("club") or meta.get("Club"))
+        # Udtrækket gemmes med fragment-hashen, så en uændret side kan springes over næste gang
+        if snapshot["url"] in digests and snapshot["html"]:
+            PageCache.put_extraction(recipe, snapshot["url"], digests[snapshot["url"]], offers)
+
+    def browser_worker(chunk):
+        last = time.perf_counter()
+
+        def emit(snapshot):
+            nonlocal last
+            if Cassette.recording():
+                now = time.perf_counter()
+                Cassette.record_snapshot(recipe, snapshot, now - last)
+                last = now
+            if page_kind:
+                PageCache.put_snapshot(recipe, snapshot, provider, page_kind)
+            # emit blokerer når køen er fuld (backpressure mod parserne)
+            snapshots.put(snapshot)
+
+        try:
+            # Nye tråde arver ikke konteksten - afbrydelsen sendes med eksplicit
+            with Engine.cancel_scope(cancel):
+                if BrowserWorker.enabled():
+                    # Browseren kører i en overvåget subprocess (RSS-loft, watchdog)
+                    BrowserWorker.run_chunk(fetch_fn, chunk, emit, item_url=item_url)
+                else:
+                    fetch_fn(chunk, emit)
+        except Exception as e:
+            print(f"Pipeline fetch-fejl: {e}")
+        finally:
+            snapshots.put(_DONE)
+
+    def replay_worker(chunk, index):
+        # Ingen browser: optagede snapshots sendes direkte til parserne
+        try:
+            if item_url is not None:
+                found = [Cassette.find_snapshot(recipe, item_url(item)) for item in chunk]
+                missing = sum(1 for snap, _ in found if snap is None)
+                if missing:
+                    print(f"Cassette: {missing} sider mangler i optagelsen ({recipe})")
+            else:
+                found = Cassette.all_snapshots(recipe) if index == 0 else []
+            for snapshot, elapsed in found:
+                if snapshot is None: continue
+                if Cassette.timed():
+                    time.sleep(elapsed)
+                snapshots.put(snapshot)
+        finally:
+            snapshots.put(_DONE)
+
+    def cache_worker():
+        # Friske sider fra PageCache går direkte til parserne
+        try:
+            for snapshot in cached:
+                snapshots.put(snapshot)
+        finally:
+            snapshots.put(_DONE)
+
+    if Cassette.replaying():
+        threads = [threading.Thread(target=replay_worker, args=(c, i), daemon=True) for i, c in enumerate(chunks)]
+    else:
+        threads = [threading.Thread(target=browser_worker, args=(c,), daemon=True) for c in chunks]
+    if cached:
+        threads.append(threading.Thread(target=cache_worker, daemon=True))
+    for t in threads:
+        t.start()
+
+    max_in_flight = max_in_flight or PARSE_WORKERS * 2
+    in_flight = set()
+
+    def collect(done):
+        offers = []
+        for future in done:
+            snapshot = in_flight_meta.pop(future, None)
+            try:
+                parsed, seconds = future.result()
+                offers.extend(parsed)
+                if snapshot is not None:
+                    record_extraction(snapshot, seconds, parsed)
+            except BrokenProcessPool as e:
+                print(f"Pipeline parse-fejl (pulje genstartes): {e}")
+                _reset_pool()
+            except Exception as e:
+                print(f"Pipeline parse-fejl: {e}")
+        return offers
+
+    def submit(snapshot):
+        """Queues the snapshot in the pool; returns offers only if it had to parse inline."""
+        try:
+            future = get_parse_pool().submit(_timed_parse, parse_fn, snapshot)
+            in_flight_meta[future] = snapshot
+            in_flight.add(future)
+        except (BrokenProcessPool, RuntimeError, OSError):
+            # Kan vi ikke starte processer, parser vi i denne tråd i stedet
+            _reset_pool()
+            try:
+                parsed, seconds = _timed_parse(parse_fn, snapshot)
+                record_extraction(snapshot, seconds, parsed)
+                return parsed
+            except Exception as e:
+                print(f"Pipeline parse-fejl: {e}")
+        return []
+
+    finished = 0
+    try:
+        while finished < len(threads):
+            if cancel is not None and cancel.is_set():
+                break
+            # Kort timeout, så færdige parses leveres mens browserne stadig arbejder
+            try:
+                item = snapshots.get(timeout=0.2)
+            except queue.Empty:
+                item = None
+            if in_flight:
+                done = {f for f in in_flight if f.done()}
+                if done:
+                    in_flight -= done
+                    yield from collect(done)
+            if item is None:
+                continue
+            if item is _DONE:
+                finished += 1
+                continue
+            if len(in_flight) >= max_in_flight:
+                done, in_flight = concurrent.futures.wait(in_flight, return_when=concurrent.futures.FIRST_COMPLETED)
+                yield from collect(done)
+            yield from submit(item)
+
+        while in_flight:
+            done, in_flight = concurrent.futures.wait(in_flight, return_when=concurrent.futures.FIRST_COMPLETED)
+            yield from collect(done)
+    finally:
+        if finished < len(threads):
+            # Forbrugeren stoppede før tid: tøm køen, så browser-trådene ikke hænger på put()
+            producers = len(threads) - finished
+
+            def drain():
+                left = producers
+                while left:
+                    if snapshots.get() is _DONE:
+                        left -= 1
+            threading.Thread(target=drain, daemon=True).start()
+
+    for t in threads:
+        t.join()
@@ -0,0 +1,186 @@
+import os
+import re
+import sys
+import json
+import time
+import shutil
+import argparse
+import threading
+import subprocess
+
+import Settings
+
+# --- BROWSER PROVISIONING ---
+# Finder (eller installerer) den ene Chromium som Engine kører, én gang, og
+# gemmer stien i et lille manifest. Playwright's egen Chromium foretrækkes;
+# findes den ikke, bruges systemets Chromium (packages.txt), og først derefter
+# downloades Playwright's. Så starter motoren uden opslag over netværket.
+#
+# Den valgte browser skal kunne startes af Playwright (en launch-probe i en
+# subprocess) før manifestet skrives. Lykkes ingen, gemmes forsøget med
+# Playwright-versionen, så næste start ikke installerer forfra før
+# RETRY_AFTER er gået - eller Playwright er blevet opgraderet.
+#
+#   python Provision.py            -> vis/lav manifestet
+#   python Provision.py --refresh  -> find browseren forfra
+
+MANIFEST_PATH = Settings.PROVISION_MANIFEST
+
+BROWSER_CANDIDATES = [
+    os.environ.get("CHROME_BINARY", ""),
+    "/usr/bin/chromium",
+    "/usr/bin/chromium-browser",
+    "/usr/bin/google-chrome",
+    "/usr/bin/google-chrome-stable",
+    "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+    r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+]
+VERSION_PATTERN = re.compile(r"(\d+)\.\d+\.\d+(?:\.\d+)?")
+RETRY_AFTER = 6 * 3600      # Sekunder før et mislykket forsøg prøves igen
+PROBE_TIMEOUT = 60
+
+# Starter og lukker browseren med Playwright - det eneste tjek der viser om
+# Playwright faktisk kan køre den (en --version siger intet om CDP-protokollen)
+PROBE_SCRIPT = """
+import sys
+from playwright.sync_api import sync_playwright
+with sync_playwright() as p:
+    p.chromium.launch(headless=True, executable_path=sys.argv[1]).close()
+"""
+
+_lock = threading.Lock()
+_manifest = None
+
+
+def _version(path):
+    """'Chromium 131.0.6778.85' -> ('131.0.6778.85', 131). (None, None) if it won't run."""
+    try:
+        out = subprocess.run([path, "--version"], capture_output=True, text=True, timeout=15).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None, None
+    match = VERSION_PATTERN.search(out or "")
+    if not match:
+        return None, None
+    return match.group(0), int(match.group(1))
+
+
+def _candidates(paths, names):
+    found = []
+    for path in paths + [shutil.which(n) for n in names]:
+        if path and os.path.exists(path) and path not in found:
+            found.append(path)
+    return found
+
+
+def _launches(path):
+    """True when Playwright can launch the executable (checked in a subprocess)."""
+    try:
+        result = subprocess.run([sys.executable, "-c", PROBE_SCRIPT, path], capture_output=True, text=True,
+                                timeout=PROBE_TIMEOUT)
+    except (OSError, subprocess.SubprocessError) as e:
+        print(f"Launch-probe fejlede for {path}: {e}")
+        return False
+    if result.returncode != 0:
+        print(f"Playwright kan ikke starte {path}: {(result.stderr or '').strip()[-300:]}")
+    return result.returncode == 0
+
+
+def _playwright_version():
+    try:
+        from importlib.metadata import version
+        return version("playwright")
+    except Exception:
+        return None
+
+
+def _find_local_browser():
+    """First installed Chrome/Chromium that runs and that Playwright can launch."""
+    for browser in _candidates(BROWSER_CANDIDATES, ["chromium", "chromium-browser", "google-chrome", "chrome"]):
+        version, major = _version(browser)
+        if major is not None and _launches(browser):
+            return {"browser": browser, "browser_version": version, "source": "local"}
+    return None
+
+
+def _playwright_chromium(install=True):
+    """Path to Playwright's Chromium; installs it when missing and install=True."""
+    try:
+        from playwright.sync_api import sync_playwright
+        with sync_playwright() as p:
+            path = p.chromium.executable_path
+        if not os.path.exists(path) and install:
+            subprocess.run([sys.executable, "-m", "playwright", "install", "chromium"], check=False)
+        return path if os.path.exists(path) and _launches(path) else None
+    except Exception as e:
+        print(f"Playwright Chromium ikke fundet: {e}")
+        return None
+
+
+def _valid(manifest):
+    if not manifest:
+        return False
+    paths = [manifest.get("playwright_chromium"), manifest.get("browser")]
+    return any(p and os.path.exists(p) for p in paths)
+
+
+def _failed_recently(manifest):
+    """A recorded failed attempt that is still within RETRY_AFTER for this Playwright version."""
+    if not manifest or "failed_at" not in manifest:
+        return False
+    return (manifest.get("playwright_version") == _playwright_version()
+            and time.time() - manifest["failed_at"] < RETRY_AFTER)
+
+
+def _read():
+    try:
+        with open(MANIFEST_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write(manifest):
+    folder = os.path.dirname(MANIFEST_PATH)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    with open(MANIFEST_PATH, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+
+def provision(refresh=False):
+    """Returns the manifest, resolving and caching the browser if needed."""
+    global _manifest
+    with _lock:
+        if _manifest is not None and not refresh:
+            return _manifest
+        manifest = None if refresh else _read()
+        if not _valid(manifest) and not _failed_recently(manifest):
+            manifest = {"playwright_chromium": _playwright_chromium(install=False)}
+            if not manifest["playwright_chromium"]:
+                manifest.update(_find_local_browser() or {})
+            if not manifest["playwright_chromium"] and not manifest.get("browser"):
+                manifest["playwright_chromium"] = _playwright_chromium(install=True)
+            manifest["resolved_at"] = time.strftime("%Y-%m-%d %H:%M:%S")
+            manifest["playwright_version"] = _playwright_version()
+            if not _valid(manifest):
+                # Husk forsøget, så hver app-start ikke kører playwright install igen
+                manifest["failed_at"] = time.time()
+            _write(manifest)
+        _manifest = manifest
+        return _manifest
+
+
+# --- LAUNCH HELPERS ---
+
+def playwright_launch_args():
+    """Extra kwargs for playwright's chromium.launch(): the provisioned Chromium, if any."""
+    manifest = provision()
+    path = manifest.get("playwright_chromium") or manifest.get("browser")
+    return {"executable_path": path} if path else {}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Find/install the Chromium the engine runs and cache the path.")
+    parser.add_argument("--refresh", action="store_true", help="Ignore the existing manifest")
+    args = parser.parse_args()
+    print(json.dumps(provision(refresh=args.refresh), indent=2))
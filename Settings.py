@@ -0,0 +1,82 @@
+import os
+
+# --- BASE URLS ---
+# Alle providere læser deres adresser herfra, så de kan peges mod en lokal
+# stand-in (benchmarks/standin_server.py) i stedet for de rigtige sider.
+#
+#   SCRAPER_STANDIN_URL=http://127.0.0.1:8765   -> alle providere mod stand-in
+#   FANTRAVEL_BASE_URL=...                      -> kun én provider
+STANDIN_URL = os.environ.get("SCRAPER_STANDIN_URL", "").rstrip("/")
+
+
+def _base(env_name, live_url, standin_path):
+    if os.environ.get(env_name):
+        return os.environ[env_name]
+    if STANDIN_URL:
+        return STANDIN_URL + standin_path
+    return live_url
+
+
+FOOTBALLTRAVEL_FEED_URL = _base(
+    "FOOTBALLTRAVEL_FEED_URL",
+    "https://api.footballtravel.com/feed/footballtravel-dk/all-offers.csv",
+    "/footballtravel/all-offers.csv",
+)
+OLKA_BASE_URL = _base("OLKA_BASE_URL", "https://olka.dk", "/olka").rstrip("/")
+FANTRAVEL_BASE_URL = _base("FANTRAVEL_BASE_URL", "https://fantravel.dk/", "/fantravel/")
+FODBOLDREJSEGUIDEN_BASE_URL = _base(
+    "FODBOLDREJSEGUIDEN_BASE_URL", "https://www.fodboldrejseguiden.dk", "/fodboldrejseguiden"
+).rstrip("/")
+
+# --- CASSETTE (record/replay) ---
+#   SCRAPER_CASSETTE=record        -> gem alle HTTP-svar og browser-snapshots
+#   SCRAPER_CASSETTE=replay        -> afspil uden netværk/browser
+#   SCRAPER_CASSETTE=replay-timed  -> afspil med de optagede ventetider
+CASSETTE_MODE = os.environ.get("SCRAPER_CASSETTE", "").strip().lower()
+CASSETTE_PATH = os.environ.get("SCRAPER_CASSETTE_PATH", os.path.join("cassettes", "latest.pkl.gz"))
+
+# --- TIMING ---
+SPAN_LOG = os.environ.get("SCRAPER_SPAN_LOG", os.path.join("logs", "spans.jsonl"))
+
+# --- ORKESTRERING ---
+# Antal providere der kører samtidig (browserne deles stadig via BrowserBudget)
+PROVIDER_WORKERS = max(1, int(os.environ.get("SCRAPER_PROVIDER_WORKERS", "2")))
+
+# --- PROVISIONING ---
+PROVISION_MANIFEST = os.environ.get("SCRAPER_PROVISION_MANIFEST", os.path.join(".cache", "browser_manifest.json"))
+
+# --- BROWSER WORKERS ---
+#   SCRAPER_BROWSER_PROCESSES=1  -> hver browser i sin egen overvågede subprocess
+BROWSER_PROCESSES = os.environ.get("SCRAPER_BROWSER_PROCESSES", "").strip().lower() in ("1", "true", "yes")
+WORKER_RSS_MB = int(os.environ.get("SCRAPER_WORKER_RSS_MB", "1500"))
+WORKER_MAX_PAGES = max(1, int(os.environ.get("SCRAPER_WORKER_MAX_PAGES", "40")))
+WORKER_STALL_SECONDS = int(os.environ.get("SCRAPER_WORKER_STALL_SECONDS", "120"))
+
+# --- BROWSER ENGINE ---
+# Samtidige sider på tværs af alle providere i Engine's ene Chromium
+ENGINE_PAGES = max(1, int(os.environ.get("SCRAPER_ENGINE_PAGES", "12")))
+
+# --- PAGE CACHE ---
+#   SCRAPER_PAGE_CACHE=0  -> ingen disk-cache af sider og feeds
+PAGE_CACHE = os.environ.get("SCRAPER_PAGE_CACHE", "1").strip().lower() not in ("0", "false", "no")
+PAGE_CACHE_DIR = os.environ.get("SCRAPER_PAGE_CACHE_DIR", os.path.join(".cache", "pages"))
+PAGE_CACHE_MB = int(os.environ.get("SCRAPER_PAGE_CACHE_MB", "500"))
+
+# --- OLKA ---
+# Slugs der virker pr. hold og kampe Olka ikke har en side til (se Olka.resolve_links)
+OLKA_SLUG_CACHE = os.environ.get("SCRAPER_OLKA_SLUG_CACHE", os.path.join(".cache", "olka_slugs.json"))
+
+# --- TEAM REGISTRY ---
+# Kompileret holdregister (club_names.xlsx + Alias.py), bygges om når kilderne ændres
+TEAM_REGISTRY_CACHE = os.environ.get("SCRAPER_TEAM_REGISTRY_CACHE", os.path.join(".cache", "team_registry.pkl"))
+
+# --- FALLBACK FRA FODBOLDREJSEGUIDEN ---
+# Fodboldrejseguiden viser også Footballtravel/Olka/Fantravel's priser. De
+# gemmes som fallback (Offer.via) og bruges i matrixen for en direkte provider
+# der fejler, sprænger budgettet eller springes over.
+#   SCRAPER_FRG_FALLBACK=0                 -> rækkerne smides væk som før
+#   SCRAPER_FALLBACK_ONLY=Olka,Fantravel   -> hent ikke disse direkte (kun fallback)
+#   SCRAPER_PROVIDER_BUDGET=120            -> sekunder en direkte provider må bruge
+FRG_FALLBACK = os.environ.get("SCRAPER_FRG_FALLBACK", "1").strip().lower() not in ("0", "false", "no")
+FALLBACK_ONLY = {name.strip().lower() for name in os.environ.get("SCRAPER_FALLBACK_ONLY", "").split(",") if name.strip()}
+PROVIDER_BUDGET_SECONDS = float(os.environ.get("SCRAPER_PROVIDER_BUDGET", "0") or 0)
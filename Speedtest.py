@@ -1,123 +1,251 @@
-import os
+import ssl
 import sys
+import json
 import time
-import re
-import unicodedata
-from urllib.parse import urljoin
-import pandas as pd
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from bs4 import BeautifulSoup
-import concurrent.futures
-import streamlit as st
-from datetime import datetime
-import io
-from openpyxl.styles import Border, Side, PatternFill, Font
-from openpyxl.utils import get_column_letter
-import requests
-
-# --- IMPORT ALIAS (Assumes Alias.py is in the same folder) ---
-try:
-    from Alias import club_alias, suffix_pattern
-except ImportError:
-    st.error("❌ Critical Error: 'Alias.py' was not found in the same folder as this script.")
-    st.stop()
-
-URL = "https://www.fodboldrejseguiden.dk/fodboldrejser-england/"
-
-# --- STREAMLIT CONFIG ---
-st.set_page_config(page_title="Football Scraper - Debug Mode", layout="wide")
-st.markdown("""
-<style>
-    div[data-testid="stButton"] > button[kind="primary"] {
-        background-color: #28a745 !important;
-        border-color: #28a745 !important; 
-        color: white !important;
+import socket
+import argparse
+import http.client
+from urllib.parse import urlparse
+import Engine
+import Settings
+
+# --- PROVIDER DIAGNOSTICS ---
+# Headless diagnostics for all four providers. For each HTTP endpoint we split
+# the time into DNS / connect / TLS / TTFB / download, and for the browser
+# providers we time cold and warm launch, first page render and the time until
+# the selector the scraper waits for is ready. N samples -> p50/p95/p99.
+#
+#   python Speedtest.py --samples 5
+#   python Speedtest.py --samples 10 --json > diag.json
+#   python Speedtest.py --providers fantravel --no-browser
+
+PROVIDERS = {
+    "footballtravel": {
+        "http": [Settings.FOOTBALLTRAVEL_FEED_URL],
+    },
+    "olka": {
+        "http": [Settings.OLKA_BASE_URL + "/"],
+        "browser": True,
+        "page": Settings.OLKA_BASE_URL + "/",
+        "selector": "a",
+    },
+    "fantravel": {
+        "http": [Settings.FANTRAVEL_BASE_URL],
+        "browser": True,
+        "page": Settings.FANTRAVEL_BASE_URL,
+        "selector": ".fantravel-leagues-dropdown",
+    },
+    "fodboldrejseguiden": {
+        "http": [Settings.FODBOLDREJSEGUIDEN_BASE_URL + "/fodboldrejser-england/"],
+        "browser": True,
+        "page": Settings.FODBOLDREJSEGUIDEN_BASE_URL + "/fodboldrejser-england/",
+        "selector": "#klubber",
+    },
+}
+
+HTTP_PHASES = ["dns", "connect", "tls", "ttfb", "download", "total"]
+BROWSER_PHASES = ["warm_launch", "first_render", "selector_ready"]
+
+# Grænser for diagnosen (sekunder, p50)
+SLOW_TTFB = 2.0
+SLOW_LAUNCH = 5.0
+
+# --- 1. STATISTICS ---
+def percentile(values, q):
+    """Linear-interpolated percentile (q in 0..100)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    pos = (len(ordered) - 1) * q / 100.0
+    low = int(pos)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (pos - low)
+
+def summarize(values):
+    values = [v for v in values if v is not None]
+    if not values:
+        return None
+    return {
+        "n": len(values),
+        "p50": round(percentile(values, 50), 4),
+        "p95": round(percentile(values, 95), 4),
+        "p99": round(percentile(values, 99), 4),
     }
-</style>
-""", unsafe_allow_html=True)
-
-# --- 1. SETUP CHROME DRIVER ---
-def get_driver():
-    chrome_options = Options()
-    chrome_options.add_argument("--headless=new") 
-    chrome_options.add_argument("--window-size=1920,1080")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--disable-notifications")
-    
-    # SPEED FIX: Don't wait for full page load
-    chrome_options.page_load_strategy = 'eager' 
-    
-    # Check if running on Streamlit Cloud (Linux) to find Chromium
-    if os.path.exists("/usr/bin/chromium"):
-        chrome_options.binary_location = "/usr/bin/chromium"
-    elif os.path.exists("/usr/bin/chromium-browser"):
-        chrome_options.binary_location = "/usr/bin/chromium-browser"
-
-    return webdriver.Chrome(options=chrome_options)
-
-def clean(text):
-    if not isinstance(text, str): return ""
-    text = unicodedata.normalize('NFKD', text).encode('ASCII', 'ignore').decode('utf-8')
+
+# --- 2. HTTP ---
+def measure_http(url, timeout=35):
+    """One GET split into DNS / connect / TLS / TTFB / download (seconds)."""
+    parsed = urlparse(url)
+    https = parsed.scheme == "https"
+    host = parsed.hostname
+    port = parsed.port or (443 if https else 80)
+    path = parsed.path or "/"
+    if parsed.query:
+        path += "?" + parsed.query
+
+    t0 = time.perf_counter()
+    family, sock_type, proto, _, addr = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)[0]
+    t_dns = time.perf_counter()
+
+    sock = socket.socket(family, sock_type, proto)
+    sock.settimeout(timeout)
+    sock.connect(addr)
+    t_connect = time.perf_counter()
+
+    if https:
+        sock = ssl.create_default_context().wrap_socket(sock, server_hostname=host)
+    t_tls = time.perf_counter()
+
+    conn = http.client.HTTPConnection(host, port, timeout=timeout)
+    conn.sock = sock
     try:
-        if suffix_pattern:
-            text = suffix_pattern.sub("", text)
-    except NameError: pass
-    return text.lower().strip()
+        conn.putrequest("GET", path)
+        conn.putheader("User-Agent", "Mozilla/5.0")
+        conn.putheader("Accept-Encoding", "identity")
+        conn.endheaders()
+        t_sent = time.perf_counter()
+        response = conn.getresponse()
+        t_first_byte = time.perf_counter()
+        body = response.read()
+        t_done = time.perf_counter()
+    finally:
+        conn.close()
 
-# --- 2. DIAGNOSTIC MAIN FUNCTION ---
-def main():
-    st.title("⏱️ Speed Diagnostic Tool")
-    st.write("This tool will identify exactly why the app hangs for 30 seconds.")
-    
-    if st.button("▶️ Run Speed Test", type="primary"):
-        st.divider()
-        
-        # --- TEST 1: The Website Connection ---
-        st.subheader("1️⃣ Testing Website Connection")
-        st.write("Connecting to `fodboldrejseguiden.dk`...")
-        
-        start_net = time.time()
+    return {
+        "status": response.status,
+        "bytes": len(body),
+        "dns": t_dns - t0,
+        "connect": t_connect - t_dns,
+        "tls": (t_tls - t_connect) if https else None,
+        "ttfb": t_first_byte - t_sent,
+        "download": t_done - t_first_byte,
+        "total": t_done - t0,
+    }
+
+def run_http(url, samples):
+    runs, errors = [], []
+    for _ in range(samples):
         try:
-            # We simulate the exact request used to fetch URLs
-            headers = {"User-Agent": "Mozilla/5.0"}
-            r = requests.get(URL, headers=headers, timeout=35)
-            elapsed_net = round(time.time() - start_net, 2)
-            
-            if elapsed_net > 5:
-                st.error(f"❌ SLOW: Website took {elapsed_net} seconds to respond.")
-                st.write("**Diagnosis:** The target website is slow or blocking you. You must use caching.")
-            else:
-                st.success(f"✅ FAST: Website responded in {elapsed_net} seconds.")
+            runs.append(measure_http(url))
         except Exception as e:
-            st.error(f"❌ FAILED: Website connection error: {e}")
+            errors.append(str(e))
+    result = {"url": url, "errors": errors}
+    if runs:
+        result["status"] = runs[-1]["status"]
+        result["bytes"] = runs[-1]["bytes"]
+        for phase in HTTP_PHASES:
+            result[phase] = summarize([r[phase] for r in runs])
+    return result
 
-        st.divider()
+# --- 3. BROWSER ---
+def engine_sample(page_url, selector):
+    """Context -> render -> selector ready in the shared Engine. The first call also launches Chromium."""
+    async def sample():
+        t0 = time.perf_counter()
+        async with Engine.context() as ctx:
+            page = await ctx.new_page()
+            t_launch = time.perf_counter()
+            await page.goto(page_url, wait_until="domcontentloaded", timeout=60000)
+            t_render = time.perf_counter()
+            await page.wait_for_selector(selector, timeout=30000)
+            t_ready = time.perf_counter()
+        return {"launch": t_launch - t0, "first_render": t_render - t_launch, "selector_ready": t_ready - t_launch}
+    return Engine.run(sample())
 
-        # --- TEST 2: The Browser Startup ---
-        st.subheader("2️⃣ Testing Browser Startup")
-        st.write("Attempting to launch a single Chrome Driver...")
-        
-        start_driver = time.time()
+def run_browser(page_url, selector, samples):
+    """First sample launches the engine's Chromium (cold); the rest only open a context (warm)."""
+    # Motorens Chromium deles på tværs af providere - luk den, så første måling er en ægte kold start
+    Engine.close()
+    runs, errors = [], []
+    for _ in range(samples + 1):
         try:
-            # This is the exact line that launches the browser
-            driver = get_driver()
-            elapsed_driver = round(time.time() - start_driver, 2)
-            driver.quit()
-            
-            if elapsed_driver > 5:
-                st.error(f"❌ SLOW: Chrome Driver took {elapsed_driver} seconds to launch.")
-                st.info("💡 **Diagnosis:** Selenium is timing out trying to download driver updates. You need to download `chromedriver` manually.")
-            else:
-                st.success(f"✅ FAST: Chrome Driver launched in {elapsed_driver} seconds.")
+            runs.append(engine_sample(page_url, selector))
         except Exception as e:
-            st.error(f"❌ FAILED: Driver error: {e}")
+            errors.append(str(e).splitlines()[0] if str(e) else type(e).__name__)
+    result = {"engine": "playwright-async", "page": page_url, "selector": selector, "errors": errors}
+    if runs:
+        result["cold_launch"] = round(runs[0]["launch"], 4)
+        warm = runs[1:] or runs
+        result["warm_launch"] = summarize([r["launch"] for r in warm])
+        result["first_render"] = summarize([r["first_render"] for r in runs])
+        result["selector_ready"] = summarize([r["selector_ready"] for r in runs])
+    return result
+
+# --- 4. DIAGNOSIS & REPORT ---
+def diagnose(result):
+    notes = []
+    for h in result.get("http", []):
+        ttfb = h.get("ttfb")
+        if h.get("errors") and not ttfb:
+            notes.append(f"NETWORK: {h['url']} failed ({h['errors'][0]})")
+        elif ttfb and ttfb["p50"] > SLOW_TTFB:
+            notes.append(f"NETWORK: {h['url']} is slow to answer (TTFB p50 {ttfb['p50']:.2f}s) - the site, not the driver")
+        elif h.get("dns") and h["dns"]["p50"] > 1.0:
+            notes.append(f"NETWORK: DNS lookups are slow ({h['dns']['p50']:.2f}s)")
+    b = result.get("browser")
+    if b:
+        if b.get("errors") and "cold_launch" not in b:
+            notes.append(f"DRIVER: browser failed to start ({b['errors'][0]})")
+        elif b.get("cold_launch", 0) > SLOW_LAUNCH:
+            notes.append(f"DRIVER: cold launch took {b['cold_launch']:.1f}s - browser resolution/download (Provision)?")
+        elif b.get("warm_launch") and b["warm_launch"]["p50"] > SLOW_LAUNCH:
+            notes.append(f"DRIVER: every launch is slow ({b['warm_launch']['p50']:.1f}s) - check CPU/memory")
+    return notes or ["OK"]
+
+def format_row(label, stats):
+    if not stats:
+        return f"    {label:<16}{'-':>10}{'-':>10}{'-':>10}"
+    return f"    {label:<16}{stats['p50']:>10.3f}{stats['p95']:>10.3f}{stats['p99']:>10.3f}"
+
+def print_report(report):
+    print(f"Provider diagnostics  ({report['samples']} samples, {report['timestamp']})")
+    for name, result in report["providers"].items():
+        print(f"\n== {name} ==")
+        for h in result.get("http", []):
+            print(f"  HTTP {h['url']}  status={h.get('status', '-')}  bytes={h.get('bytes', '-')}")
+            print(f"    {'phase (s)':<16}{'p50':>10}{'p95':>10}{'p99':>10}")
+            for phase in HTTP_PHASES:
+                print(format_row(phase, h.get(phase)))
+            for err in h.get("errors", [])[:3]:
+                print(f"    ! {err}")
+        b = result.get("browser")
+        if b:
+            print(f"  Browser ({b['engine']}) {b['page']}  selector={b['selector']}")
+            print(f"    {'cold_launch':<16}{b.get('cold_launch', float('nan')):>10.3f}")
+            for phase in BROWSER_PHASES:
+                print(format_row(phase, b.get(phase)))
+            for err in b.get("errors", [])[:3]:
+                print(f"    ! {err}")
+        for note in result["diagnosis"]:
+            print(f"  -> {note}")
+
+# --- 5. MAIN ---
+def main():
+    parser = argparse.ArgumentParser(description="Network vs. driver diagnostics for all providers.")
+    parser.add_argument("--samples", type=int, default=5, help="Samples per measurement")
+    parser.add_argument("--providers", nargs="+", choices=list(PROVIDERS), default=list(PROVIDERS))
+    parser.add_argument("--no-browser", action="store_true", help="Only measure the HTTP endpoints")
+    parser.add_argument("--json", action="store_true", help="Print JSON instead of the text report")
+    args = parser.parse_args()
+
+    report = {
+        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "samples": args.samples,
+        "providers": {},
+    }
+    for name in args.providers:
+        config = PROVIDERS[name]
+        result = {"http": [run_http(url, args.samples) for url in config["http"]]}
+        if config.get("browser") and not args.no_browser:
+            result["browser"] = run_browser(config["page"], config["selector"], args.samples)
+        result["diagnosis"] = diagnose(result)
+        report["providers"][name] = result
+        print(f"... {name} done", file=sys.stderr)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
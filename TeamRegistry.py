@@ -0,0 +1,200 @@
+import os
+import json
+import pickle
+import threading
+import unicodedata
+
+import pandas as pd
+
+import Settings
+
+try:
+    import Alias
+except ImportError:
+    Alias = None
+
+# --- TEAM REGISTRY ---
+# Ét sted for holdidentitet. Kilderne er
+#   - club_names.xlsx (ét ark pr. liga, navnene i kolonne A)
+#   - Alias.club_alias, Alias.suffix_pattern og Alias.provider_slugs
+# De kompileres én gang til et pickle-artefakt i .cache og bygges kun om, når
+# en af kildefilerne ændres. Hvert hold får visningsnavn, aliaser,
+# normaliserede nøgler og slugs pr. provider. Alle stavemåder peger på holdet
+# i én dict, så opslag er O(1).
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+XLSX_PATH = os.path.join(ROOT, "club_names.xlsx")
+SOURCES = [XLSX_PATH, os.path.join(ROOT, "Alias.py")]
+CACHE_PATH = Settings.TEAM_REGISTRY_CACHE
+VERSION = 1   # Hæves når artefaktets form ændres
+
+_lock = threading.Lock()
+_registry = None
+
+
+class Team:
+    """One canonical team."""
+
+    __slots__ = ("name", "sheets", "aliases", "keys", "slugs")
+
+    def __init__(self, name):
+        self.name = name
+        self.sheets = []      # Ark i club_names.xlsx holdet står på
+        self.aliases = []     # Andre stavemåder (Alias.py, provider-tabeller)
+        self.keys = []        # normalize() af navn og aliaser, navnet først
+        self.slugs = {}       # provider -> URL-slug
+
+    def __repr__(self):
+        return f"Team({self.name!r}, aliases={self.aliases!r}, slugs={self.slugs!r})"
+
+
+def normalize(text):
+    """Lookup key for a team name: ASCII, club suffixes (FC, AFC, ...) removed, lowercase."""
+    if not isinstance(text, str): return ""
+    text = unicodedata.normalize('NFKD', text).encode('ASCII', 'ignore').decode('utf-8')
+    suffix_pattern = getattr(Alias, "suffix_pattern", None)
+    if suffix_pattern:
+        text = suffix_pattern.sub("", text)
+    return " ".join(text.lower().split())
+
+
+# --- BUILD ---
+
+def _signature():
+    signature = []
+    for path in SOURCES:
+        try:
+            st = os.stat(path)
+            signature.append((path, st.st_mtime_ns, st.st_size))
+        except OSError:
+            signature.append((path, None, None))
+    return [VERSION, signature]
+
+
+def _read_sheets():
+    if not os.path.exists(XLSX_PATH):
+        print(f"TeamRegistry: mangler {XLSX_PATH}")
+        return {}
+    try:
+        sheets = pd.read_excel(XLSX_PATH, sheet_name=None, usecols="A", header=None)
+    except Exception as e:
+        print(f"TeamRegistry: kunne ikke læse {XLSX_PATH}: {e}")
+        return {}
+    return {sheet: df[0].dropna().astype(str).str.strip().tolist() for sheet, df in sheets.items()}
+
+
+def build(signature=None):
+    """Compiles the registry from the sources."""
+    sheets = _read_sheets()
+    teams, index = {}, {}
+
+    def add(name, spellings=(), sheet=None):
+        # Et eksisterende hold findes via en af stavemåderne, ellers oprettes det
+        names = [name, *spellings]
+        found = next((index[k] for k in map(normalize, names) if k in index), None)
+        team = teams[found] if found else teams.setdefault(name, Team(name))
+        if sheet and sheet not in team.sheets:
+            team.sheets.append(sheet)
+        for spelling in names:
+            if spelling != team.name and spelling not in team.aliases:
+                team.aliases.append(spelling)
+            key = normalize(spelling)
+            if key and key not in team.keys:
+                team.keys.append(key)
+            index.setdefault(key, team.name)
+        return team
+
+    for sheet, names in sheets.items():
+        for name in names:
+            add(name, sheet=sheet)
+    for name, aliases in getattr(Alias, "club_alias", {}).items():
+        add(name, aliases)
+    for provider, slugs in getattr(Alias, "provider_slugs", {}).items():
+        for name, slug in slugs.items():
+            add(name).slugs.setdefault(provider, slug)
+
+    index.pop("", None)
+    return {"signature": signature or _signature(), "teams": teams, "index": index, "sheets": sheets}
+
+
+def _read_cache(signature):
+    try:
+        with open(CACHE_PATH, "rb") as f:
+            registry = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+        return None
+    if json.dumps(registry.get("signature")) != json.dumps(signature):
+        return None
+    return registry
+
+
+def _write_cache(registry):
+    try:
+        os.makedirs(os.path.dirname(CACHE_PATH) or ".", exist_ok=True)
+        tmp = f"{CACHE_PATH}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(registry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, CACHE_PATH)
+    except OSError as e:
+        print(f"TeamRegistry: kunne ikke gemme {CACHE_PATH}: {e}")
+
+
+def load():
+    """
+    The compiled registry. Only stats the source files; the xlsx is read
+    again only when one of them has changed since the artefact was built.
+    """
+    global _registry
+    signature = _signature()
+    with _lock:
+        if _registry is not None and json.dumps(_registry["signature"]) == json.dumps(signature):
+            return _registry
+        registry = _read_cache(signature)
+        if registry is None:
+            registry = build(signature)
+            _write_cache(registry)
+        _registry = registry
+        return registry
+
+
+def _current():
+    return _registry or load()
+
+
+# --- OPSLAG ---
+
+def club_names(sheet="EN"):
+    """The club list of one sheet in club_names.xlsx, in file order."""
+    return list(load()["sheets"].get(sheet, []))
+
+
+def lookup(spelling):
+    """The Team for any known spelling (name, alias, provider spelling), or None."""
+    registry = _current()
+    name = registry["index"].get(normalize(spelling))
+    return registry["teams"][name] if name else None
+
+
+def slug(spelling, provider):
+    """The team's URL slug at a provider, or None when the registry has none."""
+    team = lookup(spelling)
+    return team.slugs.get(provider) if team else None
+
+
+def find(mapping, spelling):
+    """
+    The value in a {normalize(name): value} mapping (e.g. club links read from
+    a provider's overview page) for any spelling of the team, or None.
+    """
+    team = lookup(spelling)
+    for key in (team.keys if team else [normalize(spelling)]):
+        if key in mapping:
+            return mapping[key]
+    return None
+
+
+if __name__ == "__main__":
+    registry = load()
+    print(f"{len(registry['teams'])} hold, {len(registry['index'])} stavemåder")
+    for team in registry["teams"].values():
+        print(team)
@@ -0,0 +1,125 @@
+import os
+import json
+import time
+import threading
+import contextvars
+from contextlib import contextmanager
+
+import pandas as pd
+
+# --- SPANS ---
+# Letvægts tidsmåling pr. fase (driver-start, navigation, cookies, scroll,
+# toggles, udtræk, DataFrame). Hver span bærer provider/club/url-tags og kan
+# eksporteres som JSON lines eller vises som oversigt i appen.
+MAX_SPANS = 50000   # Ældste spans smides ud, så en langlivet server ikke vokser
+
+_lock = threading.Lock()
+_spans = []
+_seq = 0
+# Stakken af åbne spans følger tråden og - på Engine's event loop - den enkelte
+# asyncio-task, så samtidige sider ikke arver hinandens tags
+_stack = contextvars.ContextVar("span_stack", default=())
+
+
+def _add(record):
+    global _seq
+    with _lock:
+        _seq += 1
+        record["seq"] = _seq
+        _spans.append(record)
+        if len(_spans) > MAX_SPANS:
+            del _spans[:len(_spans) - MAX_SPANS]
+
+
+@contextmanager
+def span(name, **tags):
+    """
+    Times a block. Tags of an enclosing span in the same thread (or asyncio task)
+    are inherited, so a "navigation" inside a "club" span gets the club's tags.
+    Yields the tag dict, so tags can be added while the block runs.
+    """
+    stack = _stack.get()
+    merged = dict(stack[-1]) if stack else {}
+    merged.update({k: v for k, v in tags.items() if v is not None})
+    token = _stack.set(stack + (merged,))
+    start = time.perf_counter()
+    started_at = time.time()
+    error = None
+    try:
+        yield merged
+    except BaseException as e:
+        error = type(e).__name__
+        raise
+    finally:
+        try:
+            _stack.reset(token)
+        except ValueError:
+            _stack.set(stack)
+        _add({
+            "name": name,
+            "start": round(started_at, 3),
+            "duration_s": round(time.perf_counter() - start, 4),
+            "thread": threading.current_thread().name,
+            "error": error,
+            **merged,
+        })
+
+
+def record(name, duration_s, **tags):
+    """Adds a span measured elsewhere (e.g. parsing in Pipeline's process pool)."""
+    _add({
+        "name": name,
+        "start": round(time.time() - duration_s, 3),
+        "duration_s": round(duration_s, 4),
+        "thread": threading.current_thread().name,
+        "error": None,
+        **{k: v for k, v in tags.items() if v is not None},
+    })
+
+
+def merge(records):
+    """Adds spans recorded in another process (BrowserWorker subprocesses)."""
+    for r in records:
+        r = dict(r)
+        r.pop("seq", None)
+        _add(r)
+
+
+def mark():
+    """Position to pass to spans(since=...) to get only what happened after it."""
+    with _lock:
+        return _seq
+
+
+def spans(since=0):
+    with _lock:
+        return [dict(s) for s in _spans if s["seq"] > since]
+
+
+def export_jsonl(path, since=0):
+    """Appends the spans to a JSON lines file."""
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        for s in spans(since):
+            f.write(json.dumps(s, default=str, ensure_ascii=False) + "\n")
+
+
+def summary(since=0):
+    """Per provider/phase: count, total, mean, p95 and max seconds."""
+    df = pd.DataFrame(spans(since))
+    if df.empty:
+        return df
+    if "provider" not in df.columns:
+        df["provider"] = ""
+    df["provider"] = df["provider"].fillna("")
+    grouped = df.groupby(["provider", "name"])["duration_s"]
+    result = pd.DataFrame({
+        "count": grouped.count(),
+        "total_s": grouped.sum().round(2),
+        "mean_s": grouped.mean().round(3),
+        "p95_s": grouped.quantile(0.95).round(3),
+        "max_s": grouped.max().round(3),
+    }).reset_index()
+    return result.sort_values("total_s", ascending=False)
@@ -0,0 +1,67 @@
+"""
+End-to-end latency benchmark of the real provider code (browsers included)
+against the local stand-in server, so no network is needed.
+
+    python benchmarks/bench_e2e.py --latency 150 --jitter 50 --clubs Arsenal Chelsea --out e2e.json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+
+# --- Setup ---
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+sys.path.append(current_dir)
+
+import standin_server
+
+PROVIDERS = ["Footballtravel", "Olka", "Fantravel", "Fodboldrejseguiden"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=100)
+    parser.add_argument("--jitter", type=float, default=30)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--clubs", nargs="+", default=["Arsenal", "Chelsea", "Liverpool"])
+    parser.add_argument("--providers", nargs="+", default=PROVIDERS, choices=PROVIDERS)
+    parser.add_argument("--out", help="Write JSON results to this file")
+    args = parser.parse_args()
+
+    server = standin_server.make_server("127.0.0.1", args.port, args.latency, args.jitter, args.error_rate, args.seed)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    # Skal sættes før provider-modulerne (og Settings) importeres
+    os.environ["SCRAPER_STANDIN_URL"] = f"http://127.0.0.1:{args.port}"
+    # Ellers ville gentagne målinger blive serveret fra PageCache
+    os.environ["SCRAPER_PAGE_CACHE"] = "0"
+
+    results = {}
+    try:
+        for name in args.providers:
+            module = __import__(name)
+            start = time.perf_counter()
+            try:
+                df = module.get_prices(args.clubs)
+                rows, error = len(df), None
+            except Exception as e:
+                rows, error = 0, str(e)
+            elapsed = time.perf_counter() - start
+            results[name] = {"seconds": round(elapsed, 3), "offers": rows, "error": error}
+            print(f"{name:<22}{elapsed:>9.2f} s{rows:>7} tilbud" + (f"  FEJL: {error}" if error else ""))
+    finally:
+        server.shutdown()
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"settings": vars(args), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
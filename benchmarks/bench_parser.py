@@ -0,0 +1,115 @@
+"""
+Microbenchmark: HTML parser backend per provider page type.
+
+Runs every saved page in benchmarks/fixtures through the same parse code the
+providers use, once per available backend (html.parser, lxml), and prints the
+time per page and the speed-up.
+
+    python benchmarks/bench_parser.py [--repeat 20]
+"""
+import os
+import sys
+import time
+import argparse
+import statistics
+
+# --- Setup ---
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+FIXTURES = os.path.join(current_dir, "fixtures")
+
+import HtmlParser
+import Pipeline
+
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+# --- PAGE TYPES ---
+# Hver funktion gør det samme som provider-koden gør med siden
+
+def parse_fantravel_index(html):
+    soup = HtmlParser.make_soup(html)
+    dropdown = soup.find("div", class_="fantravel-leagues-dropdown")
+    return [a.get("href") for a in dropdown.find_all("a")] if dropdown else []
+
+
+def parse_fantravel_club(html):
+    soup = HtmlParser.make_soup(html)
+    return [l.get("href") for l in soup.find_all("a", class_="product_table_single") if l.get("href")]
+
+
+def parse_fantravel_product(html):
+    import Fantravel
+    return Fantravel.parse_product_page(Pipeline.make_snapshot("fixture", html, club="Arsenal"))
+
+
+def parse_frg_index(html):
+    soup = HtmlParser.make_soup(html)
+    section = soup.find(id="klubber")
+    return [a.get("href") for a in section.find_all("a")] if section else []
+
+
+def parse_frg_club(html):
+    import Fodboldrejseguiden
+    return Fodboldrejseguiden.parse_club_page(Pipeline.make_snapshot("fixture", html, club="Arsenal"))
+
+
+def parse_olka_event(html):
+    import Olka
+    meta = {"Club": "Arsenal", "Match": "Arsenal – Chelsea", "SortDate": None, "Date": "", "Link": "fixture"}
+    return Olka.parse_event_page(Pipeline.make_snapshot("fixture", html, **meta))
+
+
+PAGE_TYPES = [
+    ("fantravel_index", "fantravel_index.html", parse_fantravel_index),
+    ("fantravel_club", "fantravel_club.html", parse_fantravel_club),
+    ("fantravel_product", "fantravel_product.html", parse_fantravel_product),
+    ("frg_index", "frg_index.html", parse_frg_index),
+    ("frg_club", "frg_club.html", parse_frg_club),
+    ("olka_event", "olka_event.html", parse_olka_event),
+]
+
+
+def time_call(fn, html, repeat):
+    fn(html)  # Opvarmning (imports, regex-kompilering)
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(html)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    backends = HtmlParser.available_backends()
+    default_backend = HtmlParser.PARSER
+    print(f"{'page type':<20}{'size KB':>9}" + "".join(f"{b + ' ms':>16}" for b in backends) + f"{'speed-up':>10}")
+
+    try:
+        for label, fixture, fn in PAGE_TYPES:
+            html = read_fixture(fixture)
+            timings = {}
+            for backend in backends:
+                HtmlParser.PARSER = backend
+                timings[backend] = time_call(fn, html, args.repeat)
+
+            speedup = ""
+            if "lxml" in timings and timings["lxml"] > 0:
+                speedup = f"{timings['html.parser'] / timings['lxml']:.1f}x"
+            print(f"{label:<20}{len(html) / 1024:>9.1f}"
+                  + "".join(f"{timings[b] * 1000:>16.2f}" for b in backends)
+                  + f"{speedup:>10}")
+    finally:
+        HtmlParser.PARSER = default_backend
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""
+Offline benchmark suite for the provider parse/normalize paths and the matrix.
+
+Everything runs on the recorded snapshots in benchmarks/fixtures - no network,
+no browser. Results are written as JSON so two commits can be compared:
+
+    python benchmarks/run_benchmarks.py --out before.json
+    python benchmarks/run_benchmarks.py --out after.json --compare before.json
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import statistics
+import subprocess
+from datetime import datetime, timedelta
+
+# --- Setup ---
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+FIXTURES = os.path.join(current_dir, "fixtures")
+
+import pandas as pd
+import HtmlParser
+import Pipeline
+import Matrix
+import Offers
+
+CLUBS = ["Arsenal", "Chelsea", "Liverpool", "Tottenham", "Manchester United", "Newcastle", "Real Madrid"]
+MATRIX_SIZES = [100, 1000, 10000]
+PAGES_PER_RUN = 20   # Antal produkt-/eventsider pr. måling (ca. én klubs kampe)
+
+BENCHMARKS = []
+
+
+def benchmark(name, repeat=None):
+    """Registers a setup function. It returns the callable that gets timed."""
+    def register(setup):
+        BENCHMARKS.append((name, setup, repeat))
+        return setup
+    return register
+
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def make_offers(n, seed=1):
+    """Synthetic offers as a typed offer frame (see Offers)."""
+    rng = random.Random(seed)
+    providers = ["Footballtravel.dk", "Olka Express", "Fantravel.dk", "LA Travel", "Fodboldpakker", "Sportsrejser"]
+    start = datetime.now() + timedelta(days=3)
+    rows = []
+    matches_per_club = max(1, n // (len(CLUBS) * len(providers)))
+    for club in CLUBS:
+        for m in range(matches_per_club):
+            date = start + timedelta(days=7 * m)
+            for provider in providers:
+                rows.append(Offers.offer(club, f"{club} – Opponent {m}", date + timedelta(days=rng.choice([0, 0, 1])),
+                                         rng.randint(1500, 14000), rng.randint(1, 4), provider))
+    return Offers.to_frame(rows[:n])
+
+
+# --- PROVIDERS ---
+
+@benchmark("footballtravel.parse_feed")
+def bench_footballtravel():
+    import Footballtravel
+    # Samme indlæsning som Footballtravel.load_csv_data
+    df = pd.read_csv(os.path.join(FIXTURES, "footballtravel_feed.csv"), sep=',', header=None, on_bad_lines='skip')
+    return lambda: Footballtravel.parse_feed(df, CLUBS)
+
+
+@benchmark("olka.links_from_feed")
+def bench_olka_links():
+    import Olka
+    df = pd.read_csv(os.path.join(FIXTURES, "footballtravel_feed.csv"))
+    return lambda: Olka.links_from_feed(df, CLUBS)
+
+
+@benchmark("olka.parse_event_pages")
+def bench_olka_events():
+    import Olka
+    html = read_fixture("olka_event.html")
+    meta = {"Club": "Arsenal", "Match": "Arsenal – Chelsea", "SortDate": pd.Timestamp("2026-03-14"),
+            "Date": "14/03/2026", "Link": "fixture"}
+    snapshots = [Pipeline.make_snapshot("fixture", html, **meta) for _ in range(PAGES_PER_RUN)]
+
+    def run():
+        return Offers.to_frame([o for s in snapshots for o in Olka.parse_event_page(s)])
+    return run
+
+
+@benchmark("fantravel.parse_club_links")
+def bench_fantravel_club():
+    html = read_fixture("fantravel_club.html")
+
+    def run():
+        soup = HtmlParser.make_soup(html)
+        return [l.get("href") for l in soup.find_all("a", class_="product_table_single") if l.get("href")]
+    return run
+
+
+@benchmark("fantravel.parse_product_pages")
+def bench_fantravel_products():
+    import Fantravel
+    html = read_fixture("fantravel_product.html")
+    snapshots = [Pipeline.make_snapshot("fixture", html, club="Arsenal") for _ in range(PAGES_PER_RUN)]
+    return lambda: Offers.to_frame([o for s in snapshots for o in Fantravel.parse_product_page(s)])
+
+
+@benchmark("fodboldrejseguiden.parse_club_page")
+def bench_frg_club():
+    import Fodboldrejseguiden
+    snapshot = Pipeline.make_snapshot("fixture", read_fixture("frg_club.html"), club="Arsenal")
+    return lambda: Fodboldrejseguiden.normalize(Fodboldrejseguiden.parse_club_page(snapshot))
+
+
+# --- MATRIX (EN_scraper_app) ---
+
+def _register_matrix(size):
+    @benchmark(f"matrix.group_matches[{size}]")
+    def bench_group():
+        df = Matrix.prepare_offers([make_offers(size)])
+        return lambda: Matrix.group_matches(df)
+
+    @benchmark(f"matrix.build_excel[{size}]", repeat=3 if size >= 10000 else None)
+    def bench_excel():
+        all_providers, match_data_list = Matrix.group_matches(Matrix.prepare_offers([make_offers(size)]))
+        return lambda: Matrix.build_excel(match_data_list, all_providers)
+
+
+for _size in MATRIX_SIZES:
+    _register_matrix(_size)
+
+
+# --- RUNNER ---
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=parent_dir,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        return None
+
+
+def run(name_filter=None, repeat=5):
+    results = {}
+    for name, setup, bench_repeat in BENCHMARKS:
+        if name_filter and name_filter not in name:
+            continue
+        fn = setup()
+        fn()  # Opvarmning
+        samples = []
+        for _ in range(bench_repeat or repeat):
+            start = time.perf_counter()
+            fn()
+            samples.append((time.perf_counter() - start) * 1000)
+        results[name] = {
+            "median_ms": round(statistics.median(samples), 3),
+            "min_ms": round(min(samples), 3),
+            "max_ms": round(max(samples), 3),
+            "n": len(samples),
+        }
+        print(f"{name:<42}{results[name]['median_ms']:>12.2f} ms")
+    return results
+
+
+def compare(results, baseline_path):
+    with open(baseline_path) as f:
+        baseline = json.load(f)["results"]
+    print(f"\n{'benchmark':<42}{'before ms':>12}{'after ms':>12}{'ratio':>9}")
+    for name, res in results.items():
+        if name not in baseline:
+            continue
+        before = baseline[name]["median_ms"]
+        after = res["median_ms"]
+        ratio = after / before if before else float("nan")
+        print(f"{name:<42}{before:>12.2f}{after:>12.2f}{ratio:>8.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", help="Write JSON results to this file")
+    parser.add_argument("--compare", help="Baseline JSON from an earlier run")
+    parser.add_argument("--filter", help="Only run benchmarks whose name contains this")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    results = run(args.filter, args.repeat)
+    report = {
+        "meta": {
+            "git": git_revision(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "html_parser": HtmlParser.PARSER,
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+        },
+        "results": results,
+    }
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResultater gemt i {args.out}")
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
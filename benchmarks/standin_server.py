@@ -0,0 +1,270 @@
+"""
+Local stand-in for the provider sites, served from benchmarks/fixtures.
+
+Serves the Footballtravel feed and recorded copies of fantravel.dk, olka.dk and
+fodboldrejseguiden.dk - including cookie banners, the Fodboldrejseguiden
+toggle panels (loaded by JS on click) and lazy loading of matches on scroll -
+with configurable latency, jitter and error injection.
+
+    python benchmarks/standin_server.py --port 8765 --latency 150 --jitter 50 --error-rate 0.02
+    SCRAPER_STANDIN_URL=http://127.0.0.1:8765 streamlit run EN_scraper_app.py
+"""
+import os
+import re
+import sys
+import time
+import random
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+# --- Setup ---
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+FIXTURES = os.path.join(current_dir, "fixtures")
+
+import HtmlParser
+
+LAZY_BATCH = 6   # Kampe pr. "side" når Fodboldrejseguiden lazy-loader
+
+COOKIE_BANNER = """
+<div id="cookie-banner" style="position:fixed;bottom:0;left:0;right:0;padding:20px;background:#eee;z-index:999">
+  Vi bruger cookies.
+  <button id="onetrust-accept-btn-handler" onclick="document.getElementById('cookie-banner').remove()">{label}</button>
+</div>
+"""
+
+FRG_SCRIPT = """
+<script>
+(function () {
+  var club = %(club)s;
+  var loading = false;
+  var done = false;
+  function bindToggles(root) {
+    root.querySelectorAll('.togglemodule .koebsknap.toggle').forEach(function (btn) {
+      if (btn.dataset.bound) return;
+      btn.dataset.bound = '1';
+      btn.addEventListener('click', function (ev) {
+        ev.preventDefault();
+        var match = btn.closest('.match');
+        var holder = match.querySelector('.packageholder');
+        if (holder.dataset.loaded) { holder.style.display = holder.style.display === 'none' ? '' : 'none'; return; }
+        fetch('/fodboldrejseguiden/api/panel/' + club + '/' + match.dataset.index)
+          .then(function (r) { return r.ok ? r.text() : ''; })
+          .then(function (html) { holder.innerHTML = html; holder.dataset.loaded = '1'; });
+      });
+    });
+  }
+  function loadMore() {
+    if (loading || done) return;
+    if (window.innerHeight + window.pageYOffset < document.body.scrollHeight - 200) return;
+    loading = true;
+    var offset = document.querySelectorAll('.match').length;
+    fetch('/fodboldrejseguiden/api/matches/' + club + '?offset=' + offset)
+      .then(function (r) { return r.ok ? r.text() : ''; })
+      .then(function (html) {
+        if (!html.trim()) { done = true; }
+        var list = document.querySelector('.matches');
+        list.insertAdjacentHTML('beforeend', html);
+        bindToggles(list);
+        loading = false;
+      });
+  }
+  bindToggles(document);
+  window.addEventListener('scroll', loadMore);
+})();
+</script>
+"""
+
+
+class Faults:
+    """Latency, jitter and error injection shared by all handler threads."""
+
+    def __init__(self, latency_ms=0, jitter_ms=0, error_rate=0.0, seed=None):
+        self.latency = latency_ms / 1000.0
+        self.jitter = jitter_ms / 1000.0
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def draw(self):
+        with self._lock:
+            delay = max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter))
+            fail = self._rng.random() < self.error_rate
+        return delay, fail
+
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def slug_to_name(slug):
+    return " ".join(part.capitalize() for part in slug.strip("/").split("-") if part)
+
+
+class Site:
+    """Pre-processed fixtures, so each request is only string work."""
+
+    def __init__(self):
+        self.feed = read_fixture("footballtravel_feed.csv")
+        self.fantravel_index = read_fixture("fantravel_index.html")
+        self.fantravel_club = read_fixture("fantravel_club.html")
+        self.fantravel_product = read_fixture("fantravel_product.html")
+        self.olka_event = read_fixture("olka_event.html")
+        self.frg_index = read_fixture("frg_index.html")
+
+        # Fodboldrejseguiden: del klubsiden op i kampe og pakke-paneler.
+        # Panelerne hentes først når toggle-knappen klikkes (som på den rigtige side).
+        soup = HtmlParser.make_soup(read_fixture("frg_club.html"))
+        self.frg_panels = []
+        self.frg_matches = []
+        for i, match in enumerate(soup.select(".match")):
+            holder = match.select_one(".packageholder")
+            self.frg_panels.append(holder.decode_contents() if holder else "")
+            if holder:
+                holder.clear()
+            match["data-index"] = str(i)
+            self.frg_matches.append(str(match))
+        container = soup.select_one(".matches")
+        container.clear()
+        container.append("__MATCHES__")
+        self.frg_club_shell = str(soup)
+
+
+def absolute_links(html, host, prefix):
+    """Rewrites root-relative links to absolute links under the provider prefix."""
+    return re.sub(r'href="/(?!/)', f'href="http://{host}/{prefix}/', html)
+
+
+def inject(html, snippet):
+    return html.replace("</body>", snippet + "\n</body>", 1)
+
+
+class Handler(BaseHTTPRequestHandler):
+    site = None
+    faults = None
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, fmt, *args):
+        if self.server.verbose:
+            super().log_message(fmt, *args)
+
+    def send_body(self, body, content_type="text/html; charset=utf-8", status=200):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(data)
+
+    def do_HEAD(self):
+        self.do_GET()
+
+    def do_GET(self):
+        delay, fail = self.faults.draw()
+        if delay:
+            time.sleep(delay)
+        if fail:
+            self.send_body("Injected error", "text/plain", 503)
+            return
+
+        parsed = urlparse(self.path)
+        path = parsed.path
+        host = self.headers.get("Host", f"127.0.0.1:{self.server.server_port}")
+        site = self.site
+
+        try:
+            # --- Footballtravel ---
+            if path == "/footballtravel/all-offers.csv":
+                return self.send_body(site.feed, "text/csv; charset=utf-8")
+
+            # --- Fantravel ---
+            if path in ("/fantravel", "/fantravel/"):
+                html = absolute_links(site.fantravel_index, host, "fantravel")
+                return self.send_body(inject(html, COOKIE_BANNER.format(label="Kun nødvendige")))
+            m = re.match(r"^/fantravel/klub/([\w-]+)/?$", path)
+            if m:
+                slug = m.group(1)
+                html = site.fantravel_club.replace("/produkt/arsenal-", f"/produkt/{slug}-")
+                html = html.replace("Arsenal", slug_to_name(slug))
+                html = absolute_links(html, host, "fantravel")
+                return self.send_body(inject(html, COOKIE_BANNER.format(label="Kun nødvendige")))
+            m = re.match(r"^/fantravel/produkt/([\w-]+)/?$", path)
+            if m:
+                html = site.fantravel_product.replace("Arsenal - Chelsea", slug_to_name(m.group(1)))
+                return self.send_body(inject(html, COOKIE_BANNER.format(label="Kun nødvendige")))
+
+            # --- Olka ---
+            m = re.match(r"^/olka/event/soccer/([\w-]+)/?$", path)
+            if m:
+                html = site.olka_event.replace("Arsenal - Chelsea", slug_to_name(m.group(1)[11:]))
+                return self.send_body(inject(html, COOKIE_BANNER.format(label="Accepter")))
+
+            # --- Fodboldrejseguiden ---
+            if path in ("/fodboldrejseguiden/fodboldrejser-england", "/fodboldrejseguiden/fodboldrejser-england/"):
+                html = absolute_links(site.frg_index, host, "fodboldrejseguiden")
+                return self.send_body(inject(html, COOKIE_BANNER.format(label="Accepter alle")))
+            m = re.match(r"^/fodboldrejseguiden/fodboldrejser-england/([\w-]+)/?$", path)
+            if m:
+                slug = m.group(1)
+                name = slug_to_name(slug)
+                first = "\n".join(site.frg_matches[:LAZY_BATCH]).replace("Arsenal", name)
+                html = site.frg_club_shell.replace("__MATCHES__", first).replace("Arsenal", name)
+                html = inject(html, COOKIE_BANNER.format(label="Accepter alle"))
+                return self.send_body(inject(html, FRG_SCRIPT % {"club": repr(slug)}))
+            m = re.match(r"^/fodboldrejseguiden/api/matches/([\w-]+)$", path)
+            if m:
+                offset = int(parse_qs(parsed.query).get("offset", ["0"])[0])
+                batch = site.frg_matches[offset:offset + LAZY_BATCH]
+                return self.send_body("\n".join(batch).replace("Arsenal", slug_to_name(m.group(1))))
+            m = re.match(r"^/fodboldrejseguiden/api/panel/([\w-]+)/(\d+)$", path)
+            if m:
+                index = int(m.group(2))
+                if index >= len(site.frg_panels):
+                    return self.send_body("Not found", "text/plain", 404)
+                return self.send_body(site.frg_panels[index])
+
+            self.send_body("Not found", "text/plain", 404)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+def make_server(host="127.0.0.1", port=8765, latency_ms=0, jitter_ms=0, error_rate=0.0, seed=None, verbose=False):
+    """Builds the server without starting it (handy from benchmark scripts)."""
+    handler = type("StandinHandler", (Handler,), {
+        "site": Site(),
+        "faults": Faults(latency_ms, jitter_ms, error_rate, seed),
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.verbose = verbose
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0, help="Base latency per request in ms")
+    parser.add_argument("--jitter", type=float, default=0, help="+/- random jitter in ms")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 503")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for repeatable jitter/errors")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.latency, args.jitter, args.error_rate, args.seed, args.verbose)
+    print(f"Stand-in kører på http://{args.host}:{args.port}  (SCRAPER_STANDIN_URL=http://{args.host}:{args.port})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
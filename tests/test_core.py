@@ -0,0 +1,190 @@
+"""
+Tests for the pure logic behind the scrapers: offer schema, matrix grouping,
+FRG package selection, scheduling and the page cache.
+
+    python -m pytest tests
+"""
+import os
+import sys
+from datetime import datetime
+
+import pytest
+
+# --- Setup ---
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+FIXTURES = os.path.join(parent_dir, "benchmarks", "fixtures")
+
+import Offers
+import Matrix
+import CostModel
+import Cassette
+import PageCache
+import Settings
+import Fodboldrejseguiden
+
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+# --- OFFERS ---
+
+def test_offer_rejects_unusable_price():
+    for price in (None, "abc", 0, -5, float("nan"), Offers.MAX_PRICE_ORE):
+        assert Offers.offer("Arsenal", "m", "2026-03-14", price, 2, "p") is None
+
+
+def test_offer_nights_range():
+    assert Offers.offer("Arsenal", "m", "2026-03-14", 100, None, "p").nights == 0
+    assert Offers.offer("Arsenal", "m", "2026-03-14", 100, Offers.MAX_NIGHTS, "p").nights == Offers.MAX_NIGHTS
+    assert Offers.offer("Arsenal", "m", "2026-03-14", 100, Offers.MAX_NIGHTS + 1, "p") is None
+    assert Offers.offer("Arsenal", "m", "2026-03-14", 100, -1, "p") is None
+
+
+def test_to_frame_dtypes_and_bad_dates():
+    frame = Offers.to_frame([
+        Offers.offer("Arsenal", "Arsenal - Chelsea", "2026-03-14", 4895.5, 2, "Fantravel.dk"),
+        Offers.offer("Arsenal", "Arsenal - Chelsea", "ikke en dato", 4000, 2, "Fantravel.dk"),
+        None,
+    ])
+    assert len(frame) == 1
+    assert {c: str(t) for c, t in frame.dtypes.items()} == Offers.DTYPES
+    assert frame.loc[0, "PriceOre"] == 489550
+    assert frame.loc[0, "Via"] == ""
+
+
+def test_concat_sorts_categories():
+    frames = [Offers.to_frame([Offers.offer(club, f"{club} match", "2026-03-14", 100, 1, "p")])
+              for club in ("Liverpool", "Arsenal")]
+    merged = Offers.concat(frames)
+    assert str(merged["Club"].dtype) == "category"
+    assert list(merged["Club"].cat.categories) == ["Arsenal", "Liverpool"]
+
+
+# --- MATRIX ---
+
+def _offers_frame():
+    return Offers.to_frame([
+        Offers.offer("Arsenal", "Arsenal - Chelsea", "2026-03-14", 5000, 2, "Olka Express"),
+        Offers.offer("Arsenal", "Arsenal - Chelsea", "2026-03-14", 4000, 2, "Olka Express",
+                     via="Fodboldrejseguiden.dk"),
+        Offers.offer("Arsenal", "Arsenal - Chelsea", "2026-03-15", 3000, 2, "Fantravel.dk",
+                     via="Fodboldrejseguiden.dk"),
+        Offers.offer("Arsenal", "Arsenal - Chelsea", "2026-03-01", 1000, 2, "Olka Express"),
+    ])
+
+
+def test_prepare_offers_drops_fallback_and_near_matches():
+    now = datetime(2026, 3, 1)
+    df = Matrix.prepare_offers([_offers_frame()], now=now)
+    assert set(df["Provider"]) == {"Olka Express"}
+    assert (df["Via"] == "").all()
+    assert (df["SortDate"] > now).all()
+
+    df = Matrix.prepare_offers([_offers_frame()], now=now, fallback_for={"Fantravel.dk"})
+    assert sorted(df["Provider"].astype(str)) == ["Fantravel.dk", "Olka Express"]
+
+
+def test_group_matches_direct_price_beats_fallback():
+    df = Matrix.prepare_offers([_offers_frame()], now=datetime(2026, 3, 1),
+                               fallback_for={"Olka Express", "Fantravel.dk"})
+    providers, matches = Matrix.group_matches(df)
+    assert len(matches) == 1
+    data = matches[0]["data"]
+    # Den direkte Olka-pris vinder over den billigere fallback-pris
+    assert data["Olka Express"] == {"price": 5000.0, "nights": 2, "via": None}
+    assert data["Fantravel.dk"]["via"] == "Fodboldrejseguiden.dk"
+    assert matches[0]["min_price"] == 3000.0
+    assert set(providers) == {"Olka Express", "Fantravel.dk"}
+
+
+# --- FODBOLDREJSEGUIDEN ---
+
+@pytest.mark.parametrize("header, nights, expected", [
+    ("billet + hotel", 2, "hotel"),
+    ("fly + hotel + billet", 3, "flight+hotel"),
+    ("fly + billet", 0, "flight"),
+    ("kun billet", None, "ticket"),
+    ("", 2, "hotel"),
+    ("", None, "ticket"),
+])
+def test_package_type(header, nights, expected):
+    assert Fodboldrejseguiden.package_type(header, nights) == expected
+
+
+def test_extract_packages_fixture():
+    packages, unopened = Fodboldrejseguiden.extract_packages(read_fixture("frg_club.html"))
+    assert packages and not unopened
+    assert {p["type"] for p in packages} <= set(Fodboldrejseguiden.PACKAGE_TYPES)
+    assert all(p["price"] > 0 and p["link"] for p in packages)
+
+
+def test_select_offers_fallback():
+    packages, _ = Fodboldrejseguiden.extract_packages(read_fixture("frg_club.html"))
+    with_fallback = Fodboldrejseguiden.select_offers("Arsenal", packages)
+    direct_only = Fodboldrejseguiden.select_offers("Arsenal", packages, fallback=False)
+    direct_names = set(Fodboldrejseguiden.AGGREGATED.values())
+
+    fallback = [o for o in with_fallback if o.via]
+    assert fallback and all(o.provider in direct_names and o.via == Fodboldrejseguiden.PROVIDER_NAME
+                            for o in fallback)
+    assert not any(o.via or o.provider in direct_names for o in direct_only)
+    assert len(direct_only) == len(with_fallback) - len(fallback)
+    assert len(with_fallback) == len([p for p in packages if p["type"] == "hotel"])
+
+
+# --- COST MODEL ---
+
+def test_lpt_order_and_makespan():
+    durations = {"a": 3.0, "b": 10.0, "c": 4.0, "d": 5.0}
+    assert CostModel.lpt_order(durations) == ["b", "d", "c", "a"]
+    assert CostModel.makespan(durations, 1) == 22.0
+    # LPT: b -> slot 1, d -> slot 2, c -> slot 2 (9), a -> slot 2 (12)
+    assert CostModel.makespan(durations, 2) == 12.0
+    assert CostModel.makespan(durations, 8) == 10.0
+    assert CostModel.makespan({}, 2) == 0.0
+
+
+# --- PAGE CACHE ---
+
+@pytest.fixture
+def page_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(Settings, "PAGE_CACHE", True)
+    monkeypatch.setattr(Cassette, "_mode", "")
+    monkeypatch.setattr(PageCache, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(PageCache, "_db", None)
+    clock = {"now": 1_000_000.0}
+    monkeypatch.setattr(PageCache.time, "time", lambda: clock["now"])
+    yield clock
+    if PageCache._db is not None:
+        PageCache._db.close()
+
+
+def test_page_cache_ttl(page_cache):
+    PageCache.put("r", "https://example.dk/a", b"side", "Olka Express", "price")
+    assert PageCache.get("r", "https://example.dk/a", "Olka Express", "price")[0] == b"side"
+
+    page_cache["now"] += PageCache.ttl("Olka Express", "price") + 1
+    assert PageCache.get("r", "https://example.dk/a", "Olka Express", "price") is None
+    # FRG har en længere pris-TTL end standarden
+    assert PageCache.ttl("Fodboldrejseguiden.dk", "price") > PageCache.ttl("Olka Express", "price")
+
+
+def test_page_cache_evicts_least_recently_used(page_cache, monkeypatch):
+    pages = {name: os.urandom(4000) for name in "abc"}
+    monkeypatch.setattr(PageCache, "MAX_BYTES", 2 * 4100)
+
+    for name in "ab":
+        page_cache["now"] += 1
+        PageCache.put("r", name, pages[name], "p", "price")
+    page_cache["now"] += 1
+    assert PageCache.get("r", "a", "p", "price") is not None   # a er nu nyest brugt
+    page_cache["now"] += 1
+    PageCache.put("r", "c", pages["c"], "p", "price")
+
+    assert PageCache.get("r", "b", "p", "price") is None
+    assert PageCache.get("r", "a", "p", "price")[0] == pages["a"]
+    assert PageCache.get("r", "c", "p", "price")[0] == pages["c"]